@@ -0,0 +1,157 @@
+"""
+Offline throughput benchmark for JobScraperService.run_research.
+
+    python -m benchmarks.bench_scraper --runs 5 --latency-ms 80 --error-rate 0.05
+    python -m benchmarks.bench_scraper --runs 10 --jitter-ms 400 --hedge
+    python -m benchmarks.bench_scraper --replay fixtures/providers
+    python -m benchmarks.bench_scraper --record fixtures/providers   # needs network and real keys
+
+Every run uses its own scheduler, breakers, single-flight registry and temporary
+SQLite stores so results are not skewed by earlier runs in the same process.
+The one exception is the hedger: with --hedge its latency windows carry over
+between runs, as they do in the app, so early runs warm it up.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+from time import perf_counter
+
+from src.schema import ApiSettings, HedgePolicy, LocationData, PipelineSettings, SearchStep
+from src.services.hedging import Hedger
+from src.services.http_client import PooledHttpClient
+from src.services.job_scraper import JobScraperService
+from src.services.provider_standin import (
+    ProviderStandInTransport,
+    RecordingTransport,
+    ReplayTransport,
+    StandInBehaviour,
+)
+from src.services.query_allocator import YieldHistory
+from src.services.rate_scheduler import RateScheduler
+from src.services.resilience import CircuitBreakerRegistry
+from src.services.scraper_metrics import ScraperMetricsStore
+from src.services.single_flight import SingleFlight
+
+STEPS = [
+    SearchStep(title_stems=["Data Engineer", "Analytics Engineer"], must_have_skills=["Python"], reasoning="core"),
+    SearchStep(title_stems=["Platform Engineer"], must_have_skills=["Terraform"], reasoning="specialist"),
+    SearchStep(title_stems=["Machine Learning Engineer"], must_have_skills=["PyTorch"], reasoning="adjacent"),
+]
+LOCATION = LocationData(raw_input="London", city="London", country_full="United Kingdom", country_code="gb")
+
+
+def build_settings(args) -> PipelineSettings:
+    settings = PipelineSettings()
+    settings.api_settings = ApiSettings(
+        serpapi_key=os.getenv("SERPAPI_API_KEY", "bench"),
+        rapidapi_key=os.getenv("RAPIDAPI_KEY", "bench"),
+        reed_key=os.getenv("REED_API_KEY", "bench"),
+        indeed_key=os.getenv("INDEED_API_KEY", "bench"),
+        theirstack_key=os.getenv("THEIRSTACK_API_KEY", "bench"),
+        use_google=True,
+        use_linkedin=True,
+        use_reed=True,
+        use_indeed=True,
+        use_theirstack=True,
+        free_tier=False,
+    )
+    settings.scraper_settings.max_jobs = args.max_jobs
+    settings.scraper_settings.incremental_search = False
+    if args.hedge:
+        settings.scraper_settings.hedge_policies = {
+            provider: HedgePolicy(min_samples=10) for provider in ("google", "linkedin", "reed", "indeed")
+        }
+    return settings
+
+
+def build_transport(args):
+    behaviour = StandInBehaviour(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        rate_limit_rps=args.rate_limit_rps,
+        total_results=args.total_results,
+    )
+    standin = ProviderStandInTransport(default=behaviour, seed=args.seed)
+    if args.record:
+        return RecordingTransport(args.record), None
+    if args.replay:
+        return ReplayTransport(args.replay, latency_ms=args.latency_ms), standin
+    return standin, standin
+
+
+async def run_once(args, workdir: str, index: int, hedger: Hedger):
+    transport, standin = build_transport(args)
+    pool = PooledHttpClient(transport=transport)
+    settings = build_settings(args)
+    scraper = JobScraperService(
+        settings,
+        http_client=pool,
+        scheduler=RateScheduler(),
+        breakers=CircuitBreakerRegistry(),
+        single_flight=SingleFlight(),
+        yield_history=YieldHistory(os.path.join(workdir, f"yield-{index}.sqlite3")),
+        metrics_store=ScraperMetricsStore(os.path.join(workdir, "metrics.sqlite3")),
+        hedger=hedger,
+    )
+    started = perf_counter()
+    try:
+        jobs, metrics = await scraper.run_research_with_metrics(STEPS, LOCATION)
+    finally:
+        pool.close()
+    return perf_counter() - started, jobs, metrics, standin
+
+
+def report(durations, last_jobs, last_metrics, standin, hedger):
+    print(f"runs:            {len(durations)}")
+    print(f"wall time (s):   median {statistics.median(durations):.3f}  min {min(durations):.3f}  max {max(durations):.3f}")
+    print(f"jobs per run:    {len(last_jobs.jobs)}")
+    print(f"jobs / second:   {len(last_jobs.jobs) / statistics.median(durations):.1f}")
+    print()
+    print(f"{'provider':<12}{'calls':>7}{'mean s':>9}{'max s':>8}{'kB':>9}{'listed':>8}{'kept':>6}{'detail':>8}{'hedged':>8}{'won':>5}  errors")
+    for provider, stats in sorted(last_metrics.providers.items()):
+        print(
+            f"{provider:<12}{stats.calls:>7}{stats.latency_mean_s:>9.3f}{stats.latency_max_s:>8.3f}"
+            f"{stats.bytes_downloaded / 1024:>9.1f}{stats.listings_returned:>8}{stats.listings_after_dedupe:>6}"
+            f"{stats.detail_fetches:>8}{stats.hedges_fired:>8}{stats.hedges_won:>5}  {stats.errors or '-'}"
+        )
+    hedge_stats = {p: s for p, s in hedger.stats().items() if s["fired"]}
+    if hedge_stats:
+        print()
+        print("hedging:", hedge_stats)
+    if standin is not None and standin.stats:
+        print()
+        print("stand-in:", {p: vars(s) for p, s in standin.stats.items()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--max-jobs", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rps", type=float, default=None)
+    parser.add_argument("--total-results", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--hedge", action="store_true", help="Hedge GETs past each provider's observed p90")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", metavar="DIR", help="Call the real providers and save responses to DIR")
+    mode.add_argument("--replay", metavar="DIR", help="Serve responses from DIR, falling back to the stand-in")
+    args = parser.parse_args()
+
+    durations = []
+    hedger = Hedger()
+    with tempfile.TemporaryDirectory() as workdir:
+        for index in range(args.runs):
+            duration, jobs, metrics, standin = asyncio.run(run_once(args, workdir, index, hedger))
+            durations.append(duration)
+    report(durations, jobs, metrics, standin, hedger)
+
+
+if __name__ == "__main__":
+    main()
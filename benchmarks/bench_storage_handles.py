@@ -0,0 +1,126 @@
+"""
+Micro-benchmark for StorageService's cached store and index handles.
+
+Compares the old per-call path (a new PineconeVectorStore plus get_pinecone_index
+for every method call) with the cached _get_store/_get_index handles.
+
+    python -m benchmarks.bench_storage_handles --calls 200 --rtt-ms 40
+    PINECONE_API_KEY=... python -m benchmarks.bench_storage_handles --index my-index --live
+
+Without --live, the Pinecone control plane is a local stand-in server answering
+index lookups after --rtt-ms, so no key or network is needed. Only handle setup is
+timed; no data-plane requests are made in either mode.
+"""
+import argparse
+import json
+import os
+import statistics
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter, sleep
+
+from langchain_core.embeddings import FakeEmbeddings
+from langchain_pinecone import PineconeVectorStore
+from pinecone import Pinecone
+
+from src.services.storage_service import StorageService
+
+NAMESPACES = ["user_job_analyses", "global_raw_jobs"]
+
+
+def index_description(name: str, port: int) -> dict:
+    return {
+        "name": name,
+        "dimension": 3072,
+        "metric": "cosine",
+        "host": f"127.0.0.1:{port}",
+        "vector_type": "dense",
+        "deletion_protection": "disabled",
+        "spec": {"serverless": {"cloud": "aws", "region": "us-east-1"}},
+        "status": {"ready": True, "state": "Ready"},
+    }
+
+
+def start_control_plane(index_name: str, rtt_ms: float) -> ThreadingHTTPServer:
+    """Serves the two control-plane calls handle setup makes: list and describe index."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            sleep(rtt_ms / 1000)
+            port = self.server.server_address[1]
+            if self.path.rstrip("/") == "/indexes":
+                body = {"indexes": [index_description(index_name, port)]}
+            else:
+                body = index_description(self.path.rsplit("/", 1)[-1], port)
+            payload = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def time_calls(calls: int, step) -> list:
+    durations = []
+    for i in range(calls):
+        started = perf_counter()
+        step(NAMESPACES[i % len(NAMESPACES)])
+        durations.append(perf_counter() - started)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--rtt-ms", type=float, default=40.0, help="Stand-in control-plane latency")
+    parser.add_argument("--index", default=os.getenv("PINECONE_INDEX_NAME", "bench-index"))
+    parser.add_argument("--live", action="store_true", help="Use the real Pinecone control plane")
+    args = parser.parse_args()
+
+    server = None
+    if not args.live:
+        server = start_control_plane(args.index, args.rtt_ms)
+        os.environ["PINECONE_CONTROLLER_HOST"] = f"http://127.0.0.1:{server.server_address[1]}"
+        os.environ.setdefault("PINECONE_API_KEY", "bench")
+
+    embeddings = FakeEmbeddings(size=3072)
+    try:
+        def per_call(namespace):
+            store = PineconeVectorStore(index_name=args.index, embedding=embeddings, namespace=namespace)
+            store.get_pinecone_index(args.index)
+
+        service = StorageService(
+            args.index, embeddings, client=Pinecone(api_key=os.environ["PINECONE_API_KEY"])
+        )
+
+        def cached(namespace):
+            service._get_store(namespace)
+            service._get_index(namespace)
+
+        uncached_s = time_calls(args.calls, per_call)
+        cached_s = time_calls(args.calls, cached)
+        service.close()
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    print(f"calls per path:      {args.calls}")
+    for label, durations in (("per-call handles", uncached_s), ("cached handles", cached_s)):
+        print(
+            f"{label:<20} mean {statistics.mean(durations) * 1000:8.3f} ms"
+            f"   median {statistics.median(durations) * 1000:8.3f} ms"
+            f"   total {sum(durations):7.3f} s"
+        )
+    saving = statistics.mean(uncached_s) - statistics.mean(cached_s)
+    print(f"saving per call:     {saving * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,13 +7,21 @@ from src.graph import create_workflow
 from src.agents.cv_parser import create_cv_parser_agent
 from src.agents.researcher import create_researcher_agent
 from src.agents.writer import create_writer_agent
+from src.services.deadline import RunDeadline
 from src.utils.func import log_message
 
+NODE_OUTPUTS = {"cv_parser": "cv_data", "researcher": "research_data", "writer": "writer_data"}
+
 
 async def run_job_matcher(raw_context: str, config: dict, models: dict) -> dict:
     """
     Controller function called by streamlit_utils.process_new_cv.
+    With pipeline_settings.run_budget_seconds set, the run carries a deadline: each
+    stage cancels whatever is still pending when it passes, and the final state holds
+    the best partial result plus a `deadline_report` of the dropped work.
     """
+    settings = config["configurable"].get("pipeline_settings")
+    deadline = RunDeadline(getattr(settings, "run_budget_seconds", None))
     storage = config["configurable"].get("storage_service")
     agents = {
         "cv_parser_agent": create_cv_parser_agent(models["reader"]),
@@ -21,7 +29,7 @@ async def run_job_matcher(raw_context: str, config: dict, models: dict) -> dict:
         "writer_agent": create_writer_agent(models["writer"]),
     }
 
-    config["configurable"].update({"storage_service": storage, **agents})
+    config["configurable"].update({"storage_service": storage, "deadline": deadline, **agents})
 
     app = create_workflow()
 
@@ -32,7 +40,21 @@ async def run_job_matcher(raw_context: str, config: dict, models: dict) -> dict:
 
     log_message("Launching Agentic Workflow...")
 
-    final_state = await app.ainvoke(initial_state, config=config)
+    final_state = dict(initial_state)
+    hard_limit = deadline.remaining()
+    if hard_limit is not None:
+        hard_limit += getattr(settings, "deadline_reserve_seconds", 0.0)
+    try:
+        async with asyncio.timeout(hard_limit):
+            async for state in app.astream(initial_state, config=config, stream_mode="values"):
+                final_state = state
+    except TimeoutError:
+        unfinished = [node for node, key in NODE_OUTPUTS.items() if final_state.get(key) is None]
+        deadline.drop("graph", unfinished)
+
+    final_state["deadline_report"] = deadline.report()
+    if deadline.dropped:
+        log_message(f"Run hit its deadline; dropped {len(deadline.dropped)} pending items.")
 
     log_message("Workflow execution finished.")
     return final_state
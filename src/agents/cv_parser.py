@@ -60,7 +60,7 @@ async def cv_parser_node(state: AgentState, config: RunnableConfig) -> Dict[str,
 
     if active_id:
         log_message(f"CACHE HIT: Using existing profile")
-        profile = storage.fetch_candidate_profile(active_id)
+        profile = await storage.fetch_candidate_profile_async(active_id)
         return {"cv_data": profile, "active_profile_id": active_id}
 
     log_message("Starting CV Extraction...")
@@ -69,6 +69,6 @@ async def cv_parser_node(state: AgentState, config: RunnableConfig) -> Dict[str,
     cv_data: CandidateProfile = result["structured_response"]
 
     log_message("Parsing complete. Persisting profile...")
-    new_id = storage.save_candidate_profile(user_id, cv_data)
+    new_id = await storage.save_candidate_profile_async(user_id, cv_data)
 
     return {"cv_data": cv_data, "active_profile_id": new_id}
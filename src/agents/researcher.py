@@ -1,14 +1,18 @@
 """Researched for jobs using SerpAPI"""
 
-from typing import Dict, Any
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Tuple
 
 from langchain.agents import create_agent
 from langchain.messages import HumanMessage
 from langchain_core.runnables import RunnableConfig
 
 from src.state import AgentState
-from src.schema import SearchQueryPlan, RawJobMatchList, SearchStep, LocationData
+from src.schema import SearchQueryPlan, RawJobMatchList, SearchStep, LocationData, SavedSearch, PipelineSettings
+from src.services.deadline import RunDeadline
 from src.services.job_scraper import JobScraperService
+from src.services.saved_searches import SavedSearchStore, get_saved_search_store
 from src.services.storage_service import StorageService
 from src.utils.text_processing import filter_redundant_queries
 from src.utils.func import log_message
@@ -62,21 +66,27 @@ async def researcher_node(state: AgentState, config: RunnableConfig) -> Dict[str
     Orchestrates the discovery phase:
     1. Fetches candidate profile from StorageService.
     2. Generates search strategy via LLM.
-    3. Executes scraper via JobScraperService.
-    4. Syncs results to Global Library.
+    3. Streams scraper batches via JobScraperService, only asking for postings
+       newer than the saved search's last successful run.
+    4. Syncs each batch to the Global Library while slower providers are still running,
+       then rewrites any synced job that a later provider's duplicate added links to.
+    5. Advances the saved search's watermark once every provider has answered.
+    Providers and library syncs still running at the run's deadline are dropped;
+    unsynced batches are passed on as scraped.
     """
     cfg = config.get("configurable", {})
     settings = cfg.get("pipeline_settings")
     agent = cfg.get("researcher_agent")
     storage: StorageService = cfg.get("storage_service")
-    scraper = cfg.get("job_scraper") or JobScraperService(settings)
+    scraper = cfg.get("job_scraper") or JobScraperService(settings, library=storage)
+    deadline: RunDeadline = cfg.get("deadline") or RunDeadline()
     
     profile_id = state.get("active_profile_id") or cfg.get("profile_id")
     if not profile_id:
         raise ValueError("active_profile_id is missing. Cannot research.")
 
     log_message("Retrieving profile for strategy planning...")
-    profile = storage.fetch_candidate_profile(profile_id)
+    profile = await storage.fetch_candidate_profile_async(profile_id)
 
     search_location: LocationData = cfg.get("location")
     target_roles = cfg.get(
@@ -89,7 +99,12 @@ async def researcher_node(state: AgentState, config: RunnableConfig) -> Dict[str
     new_message = HumanMessage(content=prompt_content)
 
     log_message(f"Planning search strategy in {search_location.city}...")
-    response = await agent.ainvoke({**state, "messages": [new_message]})
+    response = await deadline.within(
+        agent.ainvoke({**state, "messages": [new_message]}), "researcher", "search strategy"
+    )
+    if response is None:
+        log_message("Deadline reached before a search strategy was ready.")
+        return {"messages": [new_message], "research_data": RawJobMatchList(jobs=[])}
 
     query_plan: SearchQueryPlan = response["structured_response"]
     
@@ -97,9 +112,53 @@ async def researcher_node(state: AgentState, config: RunnableConfig) -> Dict[str
 
     log_message(f"Created {len(final_queries)} job queries")
 
-    raw_results = await scraper.run_research(final_queries, search_location)
-
-    synced_jobs = storage.sync_global_library(raw_results, ttl_days=7)
+    saved_searches, saved_search = _load_saved_search(
+        cfg, settings, profile_id, target_roles, search_location
+    )
+    since = saved_search.last_run_at if saved_search else None
+    if since:
+        log_message(f"Only fetching roles posted since {since:%d %b %H:%M}")
+    run_started = datetime.now(timezone.utc)
+
+    ttl_days = settings.scraper_settings.library_ttl_days
+    sync_tasks = {}
+    async for batch in scraper.run_research_stream(final_queries, search_location, since=since, deadline=deadline):
+        log_message(f"Found {len(batch.jobs)} new roles, syncing to the library...")
+        task = asyncio.create_task(
+            storage.sync_global_library_async(
+                batch, ttl_days=ttl_days, settings=settings.scraper_settings.library_sync
+            )
+        )
+        sync_tasks[task] = batch
+
+    synced = await deadline.gather(
+        {task: [job.job_url for job in batch.jobs] for task, batch in sync_tasks.items()}, "library_sync"
+    )
+    synced_jobs = [
+        job
+        for task, batch in sync_tasks.items()
+        for job in (synced[task] if task in synced else batch.jobs)
+    ]
+
+    if scraper.revised_jobs:
+        # Only once every batch write has landed, so none can overwrite the merged record.
+        log_message(f"Adding links found later in the run to {len(scraper.revised_jobs)} synced roles...")
+        revision = asyncio.create_task(
+            storage.sync_global_library_async(
+                RawJobMatchList(jobs=scraper.revised_jobs),
+                ttl_days=ttl_days,
+                settings=settings.scraper_settings.library_sync,
+                rewrite=True,
+            )
+        )
+        rewritten = await deadline.gather(
+            {revision: [job.job_url for job in scraper.revised_jobs]}, "library_sync"
+        )
+        revised = {job.job_url: job for job in rewritten.get(revision, scraper.revised_jobs)}
+        synced_jobs = [revised.get(job.job_url, job) for job in synced_jobs]
+
+    if saved_search and scraper.covered_all_sources():
+        saved_searches.mark_run(saved_search, run_started)
 
     log_message(f"Research complete! {len(synced_jobs)} unique roles identified.")
 
@@ -109,10 +168,26 @@ async def researcher_node(state: AgentState, config: RunnableConfig) -> Dict[str
         print(f"ERROR RETURNING RESEARCH DATA: {e}")
     return {
         "messages": [new_message], 
-        "research_data": RawJobMatchList(jobs=research_data)
+        "research_data": RawJobMatchList(jobs=research_data),
+        "scraper_metrics": scraper.last_run_metrics,
     }
 
 
+def _load_saved_search(
+    cfg: dict, settings: PipelineSettings, profile_id: str, role: str, location: LocationData
+) -> Tuple[Optional[SavedSearchStore], Optional[SavedSearch]]:
+    """Looks up the watermark for this search; any failure falls back to a full-window search."""
+    scraper_cfg = settings.scraper_settings
+    if not scraper_cfg.incremental_search:
+        return None, None
+    try:
+        store = cfg.get("saved_search_store") or get_saved_search_store(scraper_cfg.saved_search_path)
+        return store, store.get_or_create(profile_id, role, location)
+    except Exception as e:
+        log_message(f"Saved search lookup failed, searching the full window: {e}")
+        return None, None
+
+
 def _build_strategy_prompt(profile, roles, location, settings) -> str:
     """Helper to keep the node logic clean and focus on the check-list."""
     w = settings.weights
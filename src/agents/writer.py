@@ -16,6 +16,7 @@ from src.schema import (
     AnalysedJobMatchWithMeta,
 )
 from src.state import AgentState
+from src.services.deadline import RunDeadline
 from src.services.storage_service import StorageService
 from src.utils.func import log_message
 
@@ -66,11 +67,14 @@ async def writer_node(state: AgentState, config: RunnableConfig) -> Dict[str, An
     2. Chunks remaining jobs for LLM processing.
     3. Executes parallel analysis with concurrency control.
     4. Persists new analyses.
+    Chunks still running when the run's deadline (less the reserve kept back for
+    persistence) arrives are cancelled; their jobs are reported as dropped.
     """
     cfg = config.get("configurable", {})
     settings = cfg.get("pipeline_settings")
     storage: StorageService = cfg.get("storage_service")
     agent = cfg.get("writer_agent")
+    deadline: RunDeadline = cfg.get("deadline") or RunDeadline()
 
     profile_id = state.get("active_profile_id") or cfg.get("active_profile_id")
     research_data = state.get("research_data", [])
@@ -82,7 +86,7 @@ async def writer_node(state: AgentState, config: RunnableConfig) -> Dict[str, An
 
     log_message(f"Auditing {len(research_jobs.jobs)} jobs against profile...")
 
-    final_analyses, jobs_to_process = storage.check_analysis_cache(
+    final_analyses, jobs_to_process = await storage.check_analysis_cache_async(
         research_jobs, profile_id
     )
 
@@ -103,12 +107,15 @@ async def writer_node(state: AgentState, config: RunnableConfig) -> Dict[str, An
         f"Cache Miss: Analyzing {len(jobs_to_process)} jobs in {len(chunks)} batches..."
     )
 
-    tasks = [
-        _analyze_chunk(chunk, agent, state, semaphore, settings) for chunk in chunks
-    ]
-    batch_results = await asyncio.gather(*tasks)
+    tasks = {
+        asyncio.create_task(_analyze_chunk(chunk, agent, state, semaphore, settings)): [j.job_url for j in chunk]
+        for chunk in chunks
+    }
+    batch_results = await deadline.gather(tasks, "writer", reserve=settings.deadline_reserve_seconds)
+    if len(batch_results) < len(tasks):
+        log_message(f"Deadline reached; {len(tasks) - len(batch_results)} batches left unanalysed.")
 
-    new_llm_results = [job for sublist in batch_results for job in sublist]
+    new_llm_results = [job for sublist in batch_results.values() for job in sublist]
     
     loc_obj = cfg.get("location")
     target_loc_str = loc_obj.city if hasattr(loc_obj, "city") else str(loc_obj or "")
@@ -121,7 +128,7 @@ async def writer_node(state: AgentState, config: RunnableConfig) -> Dict[str, An
         for job in new_llm_results
     ]
 
-    storage.save_job_analyses(enriched_results, cfg.get("user_id"), profile_id)
+    await storage.save_job_analyses_async(enriched_results, cfg.get("user_id"), profile_id)
     final_analyses.extend(enriched_results)
 
     final_analyses_meta = [
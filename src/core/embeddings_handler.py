@@ -8,7 +8,10 @@ from src.schema import ApiSettings
 @st.cache_resource
 def get_embeddings():
     return get_gemini_embedding_model(
-        st.secrets.EMBEDDING_MODEL, st.secrets.GEMINI_API_KEY
+        st.secrets.EMBEDDING_MODEL,
+        st.secrets.GEMINI_API_KEY,
+        cache_path=st.secrets.get("EMBEDDING_CACHE_PATH", ".cache/embeddings.sqlite3"),
+        cache_max_mb=int(st.secrets.get("EMBEDDING_CACHE_MAX_MB", 256)),
     )
 
 
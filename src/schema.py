@@ -1,8 +1,9 @@
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Dict
 from pydantic import BaseModel, Field, field_validator, ConfigDict, computed_field, model_validator
 import hashlib
+from functools import lru_cache
 
 class WorkSetting(str, Enum):
     REMOTE = "Remote"
@@ -56,9 +57,7 @@ class JobBase(BaseModel):
     @computed_field(return_type=str)
     def id(self) -> str:
         """Deterministic ID based on URL."""
-        if not self.job_url:
-            return "unknown_id"
-        return hashlib.md5(str(self.job_url).encode("utf-8")).hexdigest()
+        return generate_safe_id(str(self.job_url or ""))
     
     @model_validator(mode='before')
     @classmethod
@@ -75,12 +74,58 @@ class JobBase(BaseModel):
 class RawJobMatch(JobBase):
     salary_string: str = Field("Not specified", description="If the employer offers a non-numerical salary, e.g., 'competitive' or 'up to 80k a year'")
     posted_at: str = ""
+    alternate_urls: List[str] = Field(
+        default_factory=list, description="Apply links of near-duplicate postings collapsed into this one"
+    )
 
 
 class RawJobMatchList(BaseModel):
     jobs: List[RawJobMatch] = Field("A list of raw job match objects")
 
 
+class ProviderMetrics(BaseModel):
+    """What one provider cost and delivered during a single research run."""
+    calls: int = 0
+    bytes_downloaded: int = 0
+    latency_histogram: Dict[str, int] = Field(
+        default_factory=dict, description="Call counts per latency bucket, keyed by the bucket's upper bound in ms"
+    )
+    latency_total_s: float = 0.0
+    latency_max_s: float = 0.0
+    listings_returned: int = 0
+    listings_after_dedupe: int = 0
+    detail_fetches: int = 0
+    cache_hits: int = 0
+    hedges_fired: int = 0
+    hedges_won: int = 0
+    errors: Dict[str, int] = Field(default_factory=dict, description="Failure counts by exception class or HTTP status")
+
+    @computed_field(return_type=float)
+    def latency_mean_s(self) -> float:
+        return self.latency_total_s / self.calls if self.calls else 0.0
+
+
+class ScraperRunMetrics(BaseModel):
+    run_id: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    providers: Dict[str, ProviderMetrics] = Field(default_factory=dict)
+
+
+class DroppedWork(BaseModel):
+    """One piece of a run that was cancelled or skipped because the run's deadline passed."""
+    stage: str
+    item: str
+    reason: str = "deadline"
+
+
+class DeadlineReport(BaseModel):
+    budget_seconds: Optional[float] = None
+    elapsed_seconds: float = 0.0
+    expired: bool = False
+    dropped: List[DroppedWork] = Field(default_factory=list)
+
+
 class AnalysedJobMatch(JobBase):
     job_summary: str = Field(
         description="A concise 2-3 sentence overview of the role, focus on value proposition."
@@ -204,10 +249,155 @@ class AgentWeights(BaseModel):
     retention_risk: bool = Field(default=True)
 
 
+class ProviderRateLimit(BaseModel):
+    """Declarative throttle for a single job provider."""
+    requests_per_second: float = Field(default=5.0, gt=0)
+    burst: int = Field(default=5, ge=1)
+    max_in_flight: int = Field(default=5, ge=1)
+    daily_budget: Optional[int] = Field(
+        default=None, description="Maximum calls per UTC day. None means unlimited."
+    )
+
+
+class HedgePolicy(BaseModel):
+    """Tail-latency hedging for one provider's GET requests."""
+    enabled: bool = True
+    quantile: float = Field(
+        default=0.9, gt=0, lt=1, description="Observed latency quantile after which a duplicate request is sent"
+    )
+    min_samples: int = Field(default=20, ge=1, description="Observed calls needed before hedging starts")
+    min_delay_seconds: float = Field(default=0.25, ge=0)
+
+
+def default_rate_limits() -> Dict[str, ProviderRateLimit]:
+    return {
+        "google": ProviderRateLimit(requests_per_second=2.0, burst=3, max_in_flight=3),
+        "linkedin": ProviderRateLimit(requests_per_second=1.0, burst=3, max_in_flight=3),
+        "reed": ProviderRateLimit(requests_per_second=10.0, burst=20, max_in_flight=10),
+        "indeed": ProviderRateLimit(requests_per_second=2.0, burst=2, max_in_flight=2),
+        "theirstack": ProviderRateLimit(requests_per_second=2.0, burst=4, max_in_flight=2),
+    }
+
+
+def default_free_tier_rate_limits() -> Dict[str, ProviderRateLimit]:
+    return {
+        "linkedin": ProviderRateLimit(requests_per_second=0.66, burst=1, max_in_flight=1),
+    }
+
+
+class ProviderCost(BaseModel):
+    """Credits one provider charges, in whatever unit the run budget is expressed in."""
+    per_call: float = Field(default=0.0, ge=0, description="Credits per listing request")
+    per_job: float = Field(default=0.0, ge=0, description="Credits per job returned or hydrated")
+
+
+def default_provider_costs() -> Dict[str, ProviderCost]:
+    return {
+        "google": ProviderCost(per_call=1.0),
+        "linkedin": ProviderCost(per_call=1.0),
+        "reed": ProviderCost(),
+        "indeed": ProviderCost(per_call=1.0, per_job=1.0),
+        "theirstack": ProviderCost(per_job=1.0),
+    }
+
+
+def default_response_cache_ttls() -> Dict[str, int]:
+    return {
+        "google": 3600,
+        "linkedin": 3600,
+        "reed": 1800,
+        "indeed": 3600,
+        "theirstack": 3600,
+    }
+
+
+class LibrarySyncSettings(BaseModel):
+    """Batch sizing and adaptive concurrency for writes to the global job library."""
+    max_batch_items: int = Field(default=96, ge=1, description="Texts per upsert; Gemini embeds at most 100 per request")
+    max_batch_bytes: int = Field(
+        default=1_500_000, ge=1, description="Estimated request size, kept under Pinecone's 2 MB upsert limit"
+    )
+    max_batch_tokens: int = Field(default=20_000, ge=1, description="Estimated embedding tokens per batch")
+    vector_bytes: int = Field(
+        default=40_000, ge=0, description="Approximate serialised size of one 3072-dimension vector"
+    )
+    refresh_batch_items: int = Field(
+        default=20, ge=1, description="Unchanged jobs whose timestamps are refreshed per metadata-update batch"
+    )
+    initial_concurrency: int = Field(default=2, ge=1)
+    max_concurrency: int = Field(default=8, ge=1, description="Ceiling for the AIMD window of batches in flight")
+    max_retries: int = Field(default=5, ge=0, description="Throttled attempts per batch before the sync fails")
+    retry_base_delay: float = Field(default=1.0, ge=0)
+    retry_max_delay: float = Field(default=30.0, ge=0)
+
+
 class ScraperSettings(BaseModel):
     distance_param: int = Field(default=40)
     region: str = Field(default="uk")
     max_jobs: int = 10
+    max_pages: int = Field(default=3, ge=1, description="Upper bound on pages per paginated query")
+    min_page_yield: float = Field(
+        default=0.3, ge=0, le=1,
+        description="Stop paging once less than this share of a page is new and uncached",
+    )
+    near_duplicate_threshold: float = Field(
+        default=0.6, ge=0, le=1, description="Estimated Jaccard similarity at which postings are collapsed"
+    )
+    library_ttl_days: int = Field(
+        default=7, description="Days a global library job stays fresh before details are re-fetched"
+    )
+    library_sync: LibrarySyncSettings = Field(default_factory=LibrarySyncSettings)
+    rate_limits: Dict[str, ProviderRateLimit] = Field(default_factory=default_rate_limits)
+    free_tier_rate_limits: Dict[str, ProviderRateLimit] = Field(
+        default_factory=default_free_tier_rate_limits,
+        description="Overrides applied on top of rate_limits when ApiSettings.free_tier is set",
+    )
+
+    response_cache_enabled: bool = Field(
+        default=False, description="Share listing responses between searches via an on-disk cache"
+    )
+    response_cache_path: str = ".cache/scraper_responses.sqlite3"
+    response_cache_max_mb: int = 64
+    response_cache_ttl_seconds: Dict[str, int] = Field(default_factory=default_response_cache_ttls)
+
+    max_retries: int = Field(default=2, ge=0)
+    retry_base_delay: float = Field(default=0.5, ge=0)
+    retry_max_delay: float = Field(default=8.0, ge=0)
+    breaker_failure_threshold: int = Field(default=5, ge=1)
+    breaker_cooldown_seconds: float = Field(default=120.0, ge=0)
+
+    incremental_search: bool = Field(
+        default=True, description="Repeat searches only ask providers for postings since the last run"
+    )
+    saved_search_path: str = ".cache/saved_searches.sqlite3"
+    full_window_days: int = Field(
+        default=14, ge=1, description="Recency window used when a search has no watermark"
+    )
+
+    credit_budget: Optional[float] = Field(
+        default=None, ge=0, description="Credits one research run may spend. None runs every provider/step pair."
+    )
+    provider_costs: Dict[str, ProviderCost] = Field(default_factory=default_provider_costs)
+    yield_history_path: str = ".cache/provider_yield.sqlite3"
+    yield_half_life_days: float = Field(
+        default=14.0, gt=0, description="Age at which a past run's yield counts half as much"
+    )
+
+    hedge_policies: Dict[str, HedgePolicy] = Field(
+        default_factory=dict,
+        description="Providers whose slow GETs are duplicated once past their observed p90, within the rate limits",
+    )
+
+    mapping_offload_threshold: int = Field(
+        default=50, ge=1, description="Pages with at least this many listings are validated off the event loop"
+    )
+    metrics_path: str = ".cache/scraper_metrics.sqlite3"
+    metrics_retention_days: int = Field(default=90, ge=1)
+
+    def resolve_rate_limits(self, free_tier: bool) -> Dict[str, ProviderRateLimit]:
+        if free_tier:
+            return {**self.rate_limits, **self.free_tier_rate_limits}
+        return dict(self.rate_limits)
 
 
 class ApiSettings(BaseModel):
@@ -254,6 +444,12 @@ class PipelineSettings(BaseModel):
     weights: AgentWeights = Field(default_factory=AgentWeights)
     scraper_settings: ScraperSettings = Field(default_factory=ScraperSettings)
     api_settings: ApiSettings = Field(default_factory=ApiSettings)
+    run_budget_seconds: Optional[float] = Field(
+        default=None, gt=0, description="Wall-clock budget for one pipeline run. None lets every stage finish."
+    )
+    deadline_reserve_seconds: float = Field(
+        default=5.0, ge=0, description="Time held back from the LLM stages to persist whatever finished"
+    )
 
 
 class LocationData(BaseModel):
@@ -285,10 +481,29 @@ class LocationData(BaseModel):
     def indeed_string(self) -> str:
         """Sends the city to indeed"""
         return self.city
+
+
+class SavedSearch(BaseModel):
+    """A profile/role/location search whose last successful run is the watermark for the next one."""
+    profile_id: str
+    role: str = ""
+    location: LocationData
+    last_run_at: Optional[datetime] = Field(
+        default=None, description="Start of the last run that completed for every provider"
+    )
+
+    @computed_field(return_type=str)
+    def search_id(self) -> str:
+        loc = self.location
+        key = "|".join(
+            [self.profile_id, " ".join(self.role.lower().split()), loc.city.lower(), loc.country_code.lower(), (loc.postcode or "").lower()]
+        )
+        return generate_safe_id(key)
     
 
+@lru_cache(maxsize=65536)
 def generate_safe_id(input_string: str) -> str:
-    """SOP: Helper to keep hashing logic consistent."""
+    """SOP: Helper to keep hashing logic consistent. Memoised: ids are recomputed on every dump."""
     if not input_string:
         return "unknown_id"
     return hashlib.md5(input_string.encode("utf-8")).hexdigest()
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""Run Deadline: One wall-clock budget per pipeline run, shared by every stage that can be cut short."""
+import asyncio
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import httpx
+
+from src.schema import DeadlineReport, DroppedWork
+
+
+class RunDeadline:
+    """
+    Carried through the graph config so the scraper, library sync and writer all
+    stop at the same moment. A budget of None never expires, so stages can call it
+    unconditionally. Work cut short is recorded rather than raised: the run returns
+    whatever finished plus a report of what was dropped.
+    Only ever touched from the run's own event loop.
+    """
+
+    def __init__(self, budget_seconds: Optional[float] = None, clock: Callable[[], float] = monotonic):
+        self.budget_seconds = budget_seconds
+        self._clock = clock
+        self.started_at = clock()
+        self.dropped: List[DroppedWork] = []
+
+    def remaining(self, reserve: float = 0.0) -> Optional[float]:
+        """Seconds left before the deadline, less `reserve`. None when the run is unbounded."""
+        if self.budget_seconds is None:
+            return None
+        return max(0.0, self.budget_seconds - (self._clock() - self.started_at) - reserve)
+
+    def expired(self, reserve: float = 0.0) -> bool:
+        remaining = self.remaining(reserve)
+        return remaining is not None and remaining <= 0
+
+    def http_timeout(self, default: httpx.Timeout) -> httpx.Timeout:
+        """Shrinks a request's timeouts so no single call outlives the run."""
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+
+        def cap(value: Optional[float]) -> float:
+            return remaining if value is None else min(value, remaining)
+
+        return httpx.Timeout(
+            connect=cap(default.connect), read=cap(default.read), write=cap(default.write), pool=cap(default.pool)
+        )
+
+    def drop(self, stage: str, items: Iterable[str], reason: str = "deadline"):
+        self.dropped.extend(DroppedWork(stage=stage, item=item, reason=reason) for item in items)
+
+    async def within(
+        self, awaitable: Awaitable[Any], stage: str, item: str, reserve: float = 0.0, default: Any = None
+    ) -> Any:
+        """Awaits one call, cancelling it and returning `default` if the deadline arrives first."""
+        try:
+            return await asyncio.wait_for(awaitable, timeout=self.remaining(reserve))
+        except asyncio.TimeoutError:
+            self.drop(stage, [item])
+            return default
+
+    async def gather(
+        self, tasks: Dict[asyncio.Future, List[str]], stage: str, reserve: float = 0.0
+    ) -> Dict[asyncio.Future, Any]:
+        """
+        Waits for `tasks` until the deadline, then cancels the rest and records each of
+        their items as dropped. Returns the finished tasks' results keyed by task; as
+        with asyncio.gather, a failed task re-raises its exception.
+        Tasks wrapping asyncio.to_thread stop being awaited, but their thread runs on.
+        """
+        if not tasks:
+            return {}
+        done, pending = await asyncio.wait(tasks, timeout=self.remaining(reserve))
+        for task in pending:
+            task.cancel()
+            self.drop(stage, tasks[task])
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        return {task: task.result() for task in tasks if task in done}
+
+    def report(self) -> DeadlineReport:
+        return DeadlineReport(
+            budget_seconds=self.budget_seconds,
+            elapsed_seconds=round(self._clock() - self.started_at, 3),
+            expired=self.expired(),
+            dropped=list(self.dropped),
+        )
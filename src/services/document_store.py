@@ -0,0 +1,113 @@
+"""Document Store: Compressed sidecar for payloads too large to keep in vector metadata."""
+import json
+import os
+import sqlite3
+import threading
+from time import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import zstandard
+
+_CHUNK = 500
+
+
+class DocumentStore:
+    """
+    SQLite store of zstd-compressed fields keyed by (namespace, id, field). Each field
+    is its own row, so a view that needs one column never decompresses the others.
+    Values round-trip through JSON unchanged, so callers store exactly what they
+    would otherwise have put in vector metadata.
+    """
+
+    def __init__(self, path: str, level: int = 3):
+        self.path = path
+        self.level = level
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS documents (
+                namespace TEXT NOT NULL,
+                id TEXT NOT NULL,
+                field TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (namespace, id, field)
+            )"""
+        )
+
+    def put_many(self, namespace: str, documents: Dict[str, Dict[str, Any]]):
+        """Replaces each document's stored fields with the given ones."""
+        compressor = zstandard.ZstdCompressor(level=self.level)
+        now = time()
+        rows = [
+            (namespace, uid, name, compressor.compress(json.dumps(value).encode("utf-8")), now)
+            for uid, fields in documents.items()
+            for name, value in fields.items()
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "DELETE FROM documents WHERE namespace = ? AND id = ?", [(namespace, uid) for uid in documents]
+                )
+                self._conn.executemany("INSERT INTO documents VALUES (?, ?, ?, ?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get_many(
+        self, namespace: str, ids: Iterable[str], fields: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Stored fields per id, optionally only `fields`. Ids without a document are omitted."""
+        unique = list(dict.fromkeys(ids))
+        field_clause = f" AND field IN ({','.join('?' * len(fields))})" if fields else ""
+        rows = []
+        with self._lock:
+            for start in range(0, len(unique), _CHUNK):
+                chunk = unique[start : start + _CHUNK]
+                rows.extend(self._conn.execute(
+                    f"SELECT id, field, payload FROM documents WHERE namespace = ?"
+                    f" AND id IN ({','.join('?' * len(chunk))}){field_clause}",
+                    (namespace, *chunk, *(fields or [])),
+                ))
+        decompressor = zstandard.ZstdDecompressor()
+        documents: Dict[str, Dict[str, Any]] = {}
+        for uid, name, payload in rows:
+            documents.setdefault(uid, {})[name] = json.loads(decompressor.decompress(payload))
+        return documents
+
+    def delete(self, namespace: str, ids: Iterable[str]):
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM documents WHERE namespace = ? AND id = ?", [(namespace, uid) for uid in ids]
+            )
+
+    def retain(self, namespace: str, keep_ids: Set[str]) -> int:
+        """Deletes every document in the namespace whose id is not in `keep_ids`. Returns the count."""
+        with self._lock:
+            stored = {row[0] for row in self._conn.execute(
+                "SELECT DISTINCT id FROM documents WHERE namespace = ?", (namespace,)
+            )}
+        orphans = stored - keep_ids
+        self.delete(namespace, orphans)
+        return len(orphans)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_stores: Dict[str, DocumentStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_document_store(path: str) -> DocumentStore:
+    """Returns the process-wide store for a path so all sessions share one connection."""
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = DocumentStore(path)
+        return store
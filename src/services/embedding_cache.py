@@ -0,0 +1,148 @@
+"""Embedding Cache: Content-addressed, size-bounded store of embedding vectors."""
+import hashlib
+import os
+import sqlite3
+import threading
+from time import time
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+DOCUMENT = "document"
+QUERY = "query"
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed vector cache shared by every session in the process.
+    Keys are model id + task + SHA-256 of the text, so a changed model or text
+    never returns a stale vector. Vectors are stored as float32 and evicted
+    least-recently-used once their total passes max_bytes.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_accessed ON embeddings (accessed_at)"
+        )
+
+    @staticmethod
+    def make_key(model_id: str, task: str, text: str) -> str:
+        return f"{model_id}:{task}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            for start in range(0, len(unique), 500):
+                chunk = unique[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                found.update(
+                    (key, np.frombuffer(blob, dtype=np.float32).tolist()) for key, blob in rows
+                )
+            if found:
+                now = time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET accessed_at = ? WHERE key = ?", [(now, key) for key in found]
+                )
+        return found
+
+    def put_many(self, model_id: str, vectors: Dict[str, List[float]]):
+        now = time()
+        rows = []
+        for key, vector in vectors.items():
+            blob = np.asarray(vector, dtype=np.float32).tobytes()
+            rows.append((key, model_id, blob, now, len(blob)))
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?)", rows)
+            self._evict()
+
+    def _evict(self):
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM embeddings"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM embeddings ORDER BY accessed_at ASC"
+        ):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM embeddings WHERE key = ?", victims)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps an embeddings engine so unchanged text is never sent twice. Documents and
+    queries are cached separately because Gemini embeds them with different task types.
+    Only the misses of a batch reach the wrapped engine, in one call.
+    """
+
+    def __init__(self, embeddings: Embeddings, model_id: str, cache: EmbeddingCache):
+        self.embeddings = embeddings
+        self.model_id = model_id
+        self.cache = cache
+
+    def _embed(self, texts: List[str], task: str, embed) -> List[List[float]]:
+        keys = [self.cache.make_key(self.model_id, task, text) for text in texts]
+        vectors = self.cache.get_many(keys)
+        misses = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if misses:
+            fresh = dict(zip(misses, embed(list(misses.values()))))
+            self.cache.put_many(self.model_id, fresh)
+            vectors.update(fresh)
+        return [vectors[key] for key in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts, DOCUMENT, self.embeddings.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text], QUERY, lambda batch: [self.embeddings.embed_query(batch[0])])[0]
+
+
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(path: str, max_bytes: Optional[int] = None) -> EmbeddingCache:
+    """Returns the process-wide cache for a path so all sessions share one connection."""
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = EmbeddingCache(path)
+        if max_bytes is not None:
+            cache.max_bytes = max_bytes
+        return cache
@@ -0,0 +1,162 @@
+"""Hedging: Duplicates provider calls that run past their observed tail latency."""
+import asyncio
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.schema import HedgePolicy
+
+_SUPPRESSED = object()
+
+
+class LatencyWindow:
+    """The most recent call latencies for one provider. Thread-safe so every run can share it."""
+
+    def __init__(self, size: int = 200):
+        self._samples: deque = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, math.ceil(q * len(samples)) - 1)]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+
+@dataclass
+class HedgeOutcome:
+    fired: bool = False
+    won: bool = False
+    suppressed: bool = False
+
+
+class Hedger:
+    """
+    Process-wide latency windows and hedge counters per provider.
+    A call still unanswered after the provider's configured latency quantile gets one
+    duplicate, provided the rate scheduler has spare capacity right now; whichever
+    answers first is used and the other is cancelled. A primary cancelled because its
+    hedge won is recorded at its elapsed time, so the window slightly under-reads the
+    true tail while hedging is active.
+    """
+
+    def __init__(self, window_size: int = 200):
+        self.window_size = window_size
+        self._windows: Dict[str, LatencyWindow] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def window(self, provider: str) -> LatencyWindow:
+        with self._lock:
+            window = self._windows.get(provider)
+            if window is None:
+                window = self._windows[provider] = LatencyWindow(self.window_size)
+            return window
+
+    def hedge_delay(self, provider: str, policy: Optional[HedgePolicy]) -> Optional[float]:
+        """Seconds to wait before hedging, or None when this provider should not be hedged yet."""
+        if policy is None or not policy.enabled:
+            return None
+        window = self.window(provider)
+        if len(window) < policy.min_samples:
+            return None
+        return max(policy.min_delay_seconds, window.quantile(policy.quantile))
+
+    async def race(
+        self,
+        provider: str,
+        policy: Optional[HedgePolicy],
+        call: Callable[[], Awaitable[Any]],
+        try_slot: Callable[[], AsyncContextManager[bool]],
+    ) -> Tuple[Any, HedgeOutcome]:
+        """
+        Runs `call`, hedging it once past the provider's delay. The hedge only goes out
+        if `try_slot` grants capacity. Raises only if every attempt that ran failed.
+        """
+        outcome = HedgeOutcome()
+        delay = self.hedge_delay(provider, policy)
+        started = monotonic()
+        primary = asyncio.ensure_future(call())
+        hedge = None
+
+        async def hedged_call():
+            async with try_slot() as granted:
+                if not granted:
+                    outcome.suppressed = True
+                    return _SUPPRESSED
+                outcome.fired = True
+                return await call()
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            pending = {primary}
+            if not done:
+                hedge = asyncio.ensure_future(hedged_call())
+                pending.add(hedge)
+
+            failure = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: t is hedge):
+                    if task.exception() is not None:
+                        failure = failure or task.exception()
+                        continue
+                    result = task.result()
+                    if result is _SUPPRESSED:
+                        continue
+                    outcome.won = task is hedge
+                    self.window(provider).observe(monotonic() - started)
+                    return result, outcome
+            raise failure
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+            self._count(provider, outcome)
+
+    def _count(self, provider: str, outcome: HedgeOutcome):
+        with self._lock:
+            counts = self._counts.setdefault(provider, {"fired": 0, "won": 0, "suppressed": 0})
+            counts["fired"] += outcome.fired
+            counts["won"] += outcome.won
+            counts["suppressed"] += outcome.suppressed
+
+    def stats(self) -> Dict[str, dict]:
+        """Cumulative hedge counts and current latency quantiles per provider since process start."""
+        with self._lock:
+            counts = {provider: dict(c) for provider, c in self._counts.items()}
+            windows = dict(self._windows)
+        return {
+            provider: {
+                **counts.get(provider, {"fired": 0, "won": 0, "suppressed": 0}),
+                "samples": len(window),
+                "p90_s": window.quantile(0.9),
+                "p99_s": window.quantile(0.99),
+            }
+            for provider, window in windows.items()
+        }
+
+
+_hedger: Optional[Hedger] = None
+_hedger_lock = threading.Lock()
+
+
+def get_hedger() -> Hedger:
+    """Returns the process-wide hedger so latency history carries across runs and sessions."""
+    global _hedger
+    with _hedger_lock:
+        if _hedger is None:
+            _hedger = Hedger()
+        return _hedger
@@ -0,0 +1,154 @@
+"""HTTP Client: Process-wide pooled transport shared by every scraper run."""
+import asyncio
+import atexit
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+DEFAULT_HOST_LIMITS = httpx.Limits(
+    max_connections=10, max_keepalive_connections=10, keepalive_expiry=120.0
+)
+
+HOST_LIMITS: Dict[str, httpx.Limits] = {
+    "www.reed.co.uk": httpx.Limits(
+        max_connections=20, max_keepalive_connections=20, keepalive_expiry=120.0
+    ),
+    "api.hasdata.com": httpx.Limits(
+        max_connections=10, max_keepalive_connections=10, keepalive_expiry=120.0
+    ),
+    "linkedin-job-search-api.p.rapidapi.com": httpx.Limits(
+        max_connections=5, max_keepalive_connections=5, keepalive_expiry=120.0
+    ),
+}
+
+
+class PooledHttpClient:
+    """
+    Long-lived keep-alive pool holding one AsyncClient per host.
+
+    Streamlit runs every pipeline inside its own `asyncio.run` loop, and httpx
+    connections cannot outlive the loop that opened them. The pool therefore
+    owns a dedicated event-loop thread; callers on any loop await requests
+    that are executed there, so TLS sessions are reused across runs and sessions.
+    """
+
+    def __init__(
+        self,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+        host_limits: Optional[Dict[str, httpx.Limits]] = None,
+        http2: bool = HTTP2_AVAILABLE,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.timeout = timeout
+        self.host_limits = host_limits if host_limits is not None else HOST_LIMITS
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.transport = transport
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Lazily starts the background loop that owns every connection."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="http-pool", daemon=True
+                )
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def _client_for(self, host: str) -> httpx.AsyncClient:
+        """Returns the keep-alive client for a host. Runs on the pool loop only."""
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.host_limits.get(host, DEFAULT_HOST_LIMITS),
+                http2=self.http2,
+                transport=self.transport,
+            )
+            self._clients[host] = client
+        return client
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        host = urlsplit(url).hostname or ""
+        return await self._client_for(host).request(method, url, **kwargs)
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Executes a request on the shared pool. Cancelling the caller cancels the request."""
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(
+            self._send(method, url, **kwargs), loop
+        )
+        return await asyncio.wrap_future(future)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def _aclose_clients(self):
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
+
+    def close(self, timeout: float = 5.0):
+        """Closes every pooled connection and stops the background loop."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+        if loop is None:
+            return
+
+        try:
+            asyncio.run_coroutine_threadsafe(self._aclose_clients(), loop).result(
+                timeout
+            )
+        except Exception as e:
+            print(f"Error closing HTTP pool: {e}")
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            if thread is not None:
+                thread.join(timeout)
+            loop.close()
+
+
+_pool: Optional[PooledHttpClient] = None
+_pool_lock = threading.Lock()
+
+
+def get_http_pool() -> PooledHttpClient:
+    """Returns the process-wide pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = PooledHttpClient()
+        return _pool
+
+
+def close_http_pool():
+    """Shuts down the process-wide pool. Safe to call more than once."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
+atexit.register(close_http_pool)
@@ -1,11 +1,70 @@
 import asyncio
 import httpx
-from typing import List, Dict, Any, Optional
-from logging import error
+from pydantic import TypeAdapter, ValidationError
+from typing import List, Dict, Any, Optional, Iterable, AsyncIterator, Awaitable, Tuple
+from logging import error, info
 from datetime import datetime
+from time import monotonic
 
-from src.schema import RawJobMatchList, RawJobMatch, PipelineSettings, WorkSetting, SeniorityLevel, SearchStep, LocationData
-from src.utils.query_compiler import JobQueryCompiler
+from src.schema import (
+    RawJobMatchList,
+    RawJobMatch,
+    PipelineSettings,
+    WorkSetting,
+    SeniorityLevel,
+    SearchStep,
+    LocationData,
+    ProviderCost,
+    ScraperRunMetrics,
+)
+from src.utils.query_compiler import PROVIDER_LIMIT_CAPS, JobQueryCompiler
+from src.utils.dedupe import NearDuplicateIndex, collapse_near_duplicates
+from src.services.deadline import RunDeadline
+from src.services.hedging import Hedger, get_hedger
+from src.services.http_client import DEFAULT_TIMEOUT, PooledHttpClient, get_http_pool
+from src.services.rate_scheduler import DEFAULT_TIER, FREE_TIER, RateScheduler, get_rate_scheduler
+from src.services.response_cache import ResponseCache, get_response_cache
+from src.services.single_flight import SingleFlight, get_single_flight
+from src.services.query_allocator import (
+    Allocation,
+    CreditLedger,
+    QueryAllocator,
+    YieldHistory,
+    get_yield_history,
+)
+from src.services.scraper_metrics import ScraperMetricsRecorder, ScraperMetricsStore, get_metrics_store
+from src.services.resilience import (
+    CircuitBreakerRegistry,
+    RetryPolicy,
+    get_circuit_breakers,
+    is_retryable_exception,
+    is_retryable_status,
+    retry_after_seconds,
+)
+from src.utils.func import ProviderUnavailableError, log_message
+
+CREDENTIAL_PARAMS = {"api_key"}
+RAW_JOB_LIST = TypeAdapter(List[RawJobMatch])
+
+
+def validate_job_rows(rows: List[dict]) -> List[RawJobMatch]:
+    """
+    Validates a whole page of mapped rows with one TypeAdapter call. If any row is
+    invalid the page is re-validated row by row so only the bad rows are dropped.
+    """
+    if not rows:
+        return []
+    try:
+        return RAW_JOB_LIST.validate_python(rows)
+    except ValidationError:
+        pass
+    jobs = []
+    for row in rows:
+        try:
+            jobs.append(RawJobMatch.model_validate(row))
+        except ValidationError as e:
+            log_message(f"Failed to parse job {row.get('job_url') or row.get('title')}: {e.error_count()} errors")
+    return jobs
 
 class JobScraperService:
     """
@@ -13,50 +72,471 @@ class JobScraperService:
     Abstracts API complexity and provides unified data normalization.
     """
 
-    def __init__(self, settings: PipelineSettings):
+    def __init__(
+        self,
+        settings: PipelineSettings,
+        http_client: Optional[PooledHttpClient] = None,
+        scheduler: Optional[RateScheduler] = None,
+        library: Optional[Any] = None,
+        response_cache: Optional[ResponseCache] = None,
+        breakers: Optional[CircuitBreakerRegistry] = None,
+        single_flight: Optional[SingleFlight] = None,
+        yield_history: Optional[YieldHistory] = None,
+        metrics_store: Optional[ScraperMetricsStore] = None,
+        hedger: Optional[Hedger] = None,
+    ):
         self.settings = settings
+        self.http = http_client or get_http_pool()
         self.api_cfg = settings.api_settings
         self.scrap_cfg = settings.scraper_settings
-        self._semaphore = (
-            asyncio.Semaphore(1) if self.api_cfg.free_tier else asyncio.Semaphore(3)
+        self.scheduler = scheduler or get_rate_scheduler()
+        self.library = library
+        self.response_cache = response_cache
+        if self.response_cache is None and self.scrap_cfg.response_cache_enabled:
+            self.response_cache = get_response_cache(
+                self.scrap_cfg.response_cache_path,
+                self.scrap_cfg.response_cache_max_mb * 1024 * 1024,
+            )
+        self.rate_tier = FREE_TIER if self.api_cfg.free_tier else DEFAULT_TIER
+        self.scheduler.configure(self.scrap_cfg.resolve_rate_limits(self.api_cfg.free_tier), self.rate_tier)
+        self.queue_waits: Dict[str, List[float]] = {}
+        self.breakers = breakers or get_circuit_breakers()
+        self.retry_policy = RetryPolicy(
+            max_retries=self.scrap_cfg.max_retries,
+            base_delay=self.scrap_cfg.retry_base_delay,
+            max_delay=self.scrap_cfg.retry_max_delay,
+        )
+        self.skipped_sources: set = set()
+        self.single_flight = single_flight or get_single_flight()
+        self.yield_history = yield_history or get_yield_history(self.scrap_cfg.yield_history_path)
+        self.metrics_store = metrics_store or get_metrics_store(
+            self.scrap_cfg.metrics_path, self.scrap_cfg.metrics_retention_days
         )
+        self.hedger = hedger or get_hedger()
+        self.last_run_metrics: Optional[ScraperRunMetrics] = None
+        self._reset_run_state()
 
-    async def run_research(self, queries: List[SearchStep], location: LocationData) -> RawJobMatchList:
-        """Primary entry point to gather jobs from all enabled sources."""
-        if not any([self.api_cfg.use_google, self.api_cfg.use_linkedin, self.api_cfg.use_reed, self.api_cfg.use_indeed, self.api_cfg.use_theirstack]):
+    async def run_research(
+        self,
+        queries: List[SearchStep],
+        location: LocationData,
+        since: Optional[datetime] = None,
+        deadline: Optional[RunDeadline] = None,
+    ) -> RawJobMatchList:
+        """
+        Primary entry point to gather jobs from all enabled sources.
+        With `since`, providers are only asked for postings newer than that watermark.
+        With `deadline`, providers still running when it passes are cancelled.
+        """
+        if not self._any_source_enabled():
             print("No scrapers enabled. Skipping search.")
             return RawJobMatchList(jobs=[])
 
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            tasks = []
-            for count, q in enumerate(queries):
-                if self.api_cfg.use_google:
-                    tasks.append(self._scrape_google(client, q, location))
-                if self.api_cfg.use_linkedin:
-                    tasks.append(self._scrape_linkedin(client, q, location))
-                if self.api_cfg.use_reed:
-                    tasks.append(self._scrape_reed(client, q, location))
-                if self.api_cfg.use_indeed:
-                    if count < 1:
-                        tasks.append(self._scrape_indeed(client, q, location))
-                if self.api_cfg.use_theirstack:
-                    tasks.append(self._scrape_theirstack(client, q, location))
-
-            results = await asyncio.gather(*tasks, return_exceptions=True)
         all_jobs = []
-        for res in results:
-            if isinstance(res, list):
-                all_jobs.extend(res)
-            elif isinstance(res, Exception):
-                error(f"Task failed during gather: {res}")
+        async for batch in self.run_research_stream(queries, location, since=since, deadline=deadline):
+            all_jobs.extend(batch.jobs)
+        revised = {job.job_url: job for job in self.revised_jobs}
+        all_jobs = [revised.get(job.job_url, job) for job in all_jobs]
 
         return self._process_and_deduplicate(all_jobs)
 
+    async def run_research_with_metrics(
+        self,
+        queries: List[SearchStep],
+        location: LocationData,
+        since: Optional[datetime] = None,
+        deadline: Optional[RunDeadline] = None,
+    ) -> Tuple[RawJobMatchList, Optional[ScraperRunMetrics]]:
+        """run_research plus the per-provider metrics recorded while it ran."""
+        self.last_run_metrics = None
+        jobs = await self.run_research(queries, location, since=since, deadline=deadline)
+        return jobs, self.last_run_metrics
+
+    async def run_research_stream(
+        self,
+        queries: List[SearchStep],
+        location: LocationData,
+        since: Optional[datetime] = None,
+        deadline: Optional[RunDeadline] = None,
+    ) -> AsyncIterator[RawJobMatchList]:
+        """
+        Streaming variant of run_research. Yields a deduplicated batch as soon as each
+        provider task finishes, so downstream work can start before the slowest source.
+        Jobs already yielded in an earlier batch are never repeated; those that absorbed a
+        later duplicate are left on `revised_jobs` once the stream ends. Tasks still
+        pending at the deadline are cancelled and recorded on it as dropped.
+        """
+        if not self._any_source_enabled():
+            return
+
+        self.queue_waits = {}
+        self.skipped_sources = set()
+        self._reset_run_state()
+        self.since = since
+        self.deadline = deadline or RunDeadline()
+        tasks = {
+            asyncio.create_task(coro): allocation
+            for allocation, coro in self._build_tasks(queries, location)
+        }
+        dedupe_index = NearDuplicateIndex(threshold=self.scrap_cfg.near_duplicate_threshold)
+        yields = []
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=self.deadline.remaining(), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    self._drop_pending(pending, tasks)
+                    break
+                for task in done:
+                    try:
+                        res = task.result()
+                    except Exception as e:
+                        error(f"Task failed during research: {e}")
+                        continue
+
+                    batch = self._dedupe_new_jobs(res, dedupe_index)
+                    dedupe_index.release()
+                    yields.append((tasks[task], batch))
+                    if tasks[task] is not None:
+                        returned = sum(1 for job in res or [] if isinstance(job, RawJobMatch))
+                        self.metrics.observe_listings(tasks[task].provider, returned, len(batch.jobs))
+                    if batch.jobs:
+                        yield batch
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.revised_jobs = [job.model_copy(deep=True) for job in dedupe_index.take_revised()]
+            self._record_yields(yields)
+            self._finish_metrics()
+            waits = self.queue_wait_report()
+            if waits:
+                info(f"Provider queue waits: {waits}")
+            if self.skipped_sources:
+                log_message(f"Skipped unavailable sources: {', '.join(sorted(self.skipped_sources))}")
+
+    def _reset_run_state(self):
+        """Per-run memo of listing URLs already paged past and library lookups already made."""
+        self.since: Optional[datetime] = None
+        self.deadline = RunDeadline()
+        self.timed_out_sources: set = set()
+        self.metrics = ScraperMetricsRecorder()
+        self.credits = CreditLedger(self.scrap_cfg.credit_budget)
+        self.dropped_allocations: List[Allocation] = []
+        self.revised_jobs: List[RawJobMatch] = []
+        self.failed_sources: set = set()
+        self._seen_listing_urls: set = set()
+        self._library_checked: set = set()
+        self._library_hits: Dict[str, RawJobMatch] = {}
+
+    def covered_all_sources(self) -> bool:
+        """
+        True when the last run heard back from every enabled provider and the credit
+        budget dropped no searches, so its watermark can advance.
+        """
+        return not (
+            self.skipped_sources or self.failed_sources or self.timed_out_sources or self.dropped_allocations
+        )
+
+    def _drop_pending(self, pending: set, tasks: Dict[asyncio.Task, Optional[Allocation]]):
+        """Records scrapes the deadline cut short; the caller's cleanup cancels them."""
+        for task in pending:
+            allocation = tasks[task]
+            if allocation is None:
+                self.deadline.drop("scraper", ["unlabelled scrape"])
+                continue
+            self.timed_out_sources.add(allocation.provider)
+            self.deadline.drop("scraper", [f"{allocation.provider}: {', '.join(allocation.step.title_stems)}"])
+        log_message(f"Deadline reached; cancelled {len(pending)} unfinished searches.")
+
+    def _any_source_enabled(self) -> bool:
+        return any([self.api_cfg.use_google, self.api_cfg.use_linkedin, self.api_cfg.use_reed, self.api_cfg.use_indeed, self.api_cfg.use_theirstack])
+
+    def _build_tasks(
+        self, queries: List[SearchStep], location: LocationData
+    ) -> List[Tuple[Optional[Allocation], Awaitable[List[RawJobMatch]]]]:
+        """Allocates the run's credit budget over provider/step pairs and builds one scrape per allocation."""
+        use_google = self._source_available("google", self.api_cfg.use_google)
+        use_linkedin = self._source_available("linkedin", self.api_cfg.use_linkedin)
+        use_reed = self._source_available("reed", self.api_cfg.use_reed)
+        use_indeed = self._source_available("indeed", self.api_cfg.use_indeed)
+        use_theirstack = self._source_available("theirstack", self.api_cfg.use_theirstack)
+
+        candidates = []
+        for count, q in enumerate(queries):
+            if use_google:
+                candidates.append(("google", q))
+            if use_linkedin:
+                candidates.append(("linkedin", q))
+            if use_reed:
+                candidates.append(("reed", q))
+            if use_indeed:
+                if count < 1:
+                    candidates.append(("indeed", q))
+            if use_theirstack:
+                candidates.append(("theirstack", q))
+
+        allocator = QueryAllocator(
+            self.scrap_cfg.provider_costs,
+            self.yield_history,
+            self.credits,
+            self.scrap_cfg.max_jobs,
+            half_life_days=self.scrap_cfg.yield_half_life_days,
+            limit_caps=PROVIDER_LIMIT_CAPS,
+        )
+        allocations, self.dropped_allocations = allocator.allocate(candidates)
+        if self.dropped_allocations:
+            log_message(
+                f"Credit budget of {self.scrap_cfg.credit_budget:g} covers {len(allocations)} of "
+                f"{len(candidates)} searches; skipping the lowest-yield ones."
+            )
+        return [(allocation, self._scrape(allocation, location)) for allocation in allocations]
+
+    def _scrape(self, allocation: Allocation, location: LocationData) -> Awaitable[List[RawJobMatch]]:
+        client = self.http
+        step = allocation.step
+        if allocation.provider == "google":
+            return self._scrape_google(client, step, location, limit=allocation.limit)
+        if allocation.provider == "linkedin":
+            return self._scrape_linkedin(client, step, location, limit=allocation.limit)
+        if allocation.provider == "reed":
+            return self._scrape_reed(client, step, location, limit=allocation.limit)
+        if allocation.provider == "indeed":
+            return self._scrape_indeed(client, step, location, limit=allocation.limit)
+        return self._scrape_theirstack(client, step, location, limit=allocation.limit)
+
+    def _finish_metrics(self):
+        self.last_run_metrics = self.metrics.finish()
+        if not self.last_run_metrics.providers:
+            return
+        info(
+            "Provider metrics: "
+            + ", ".join(
+                f"{provider} {stats.calls} calls/{stats.latency_mean_s:.2f}s avg/{stats.listings_after_dedupe} kept"
+                for provider, stats in self.last_run_metrics.providers.items()
+            )
+        )
+        if self.metrics_store is None:
+            return
+        try:
+            self.metrics_store.save(self.last_run_metrics)
+        except Exception as e:
+            error(f"Could not persist scraper metrics: {e}")
+
+    def _record_yields(self, yields: List[Tuple[Optional[Allocation], RawJobMatchList]]):
+        """Feeds each pair's new, not-already-in-library job count back into the allocator's history."""
+        if self.yield_history is None:
+            return
+        for allocation, batch in yields:
+            if allocation is None or allocation.provider in self.failed_sources:
+                continue
+            new_jobs = sum(1 for job in batch.jobs if job.job_url not in self._library_hits)
+            try:
+                self.yield_history.record(allocation.provider, allocation.shape, new_jobs)
+            except Exception as e:
+                error(f"Could not record provider yield: {e}")
+                return
+
+    def _breaker(self, provider: str):
+        return self.breakers.get(
+            provider,
+            failure_threshold=self.scrap_cfg.breaker_failure_threshold,
+            cooldown=self.scrap_cfg.breaker_cooldown_seconds,
+        )
+
+    def _source_available(self, provider: str, enabled: bool) -> bool:
+        """Enabled sources whose circuit is open are skipped for the whole run."""
+        if not enabled:
+            return False
+        if self._breaker(provider).is_open():
+            self.skipped_sources.add(provider)
+            return False
+        return True
+
+    def provider_health(self) -> Dict[str, dict]:
+        """Circuit state per provider, for the UI to show which sources are being skipped."""
+        return self.breakers.states()
+
+    async def _request(
+        self, provider: str, client: PooledHttpClient, method: str, url: str, **kwargs
+    ) -> httpx.Response:
+        """
+        Single choke point for provider calls. Each attempt waits on the provider's rate
+        lane; transient failures (timeouts, 429, 5xx) are retried with jittered backoff
+        that honours Retry-After, and feed the provider's circuit breaker.
+        """
+        breaker = self._breaker(provider)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                self.skipped_sources.add(provider)
+                unavailable = ProviderUnavailableError(f"'{provider}' is cooling down after repeated failures.")
+                self.metrics.observe_error(provider, unavailable)
+                raise unavailable
+
+            try:
+                async with self.scheduler.slot(provider, self.rate_tier) as waited:
+                    self.queue_waits.setdefault(provider, []).append(waited)
+                    started = monotonic()
+                    try:
+                        response = await self._send(provider, client, method, url, self._with_deadline(client, kwargs))
+                    except Exception:
+                        self.metrics.observe_call(provider, monotonic() - started)
+                        raise
+                    self.metrics.observe_call(provider, monotonic() - started, response)
+            except Exception as e:
+                self.metrics.observe_error(provider, e)
+                if not is_retryable_exception(e):
+                    raise
+                breaker.record_failure()
+                delay = self._backoff_within_deadline(attempt)
+                if delay is None:
+                    raise
+                info(f"{provider} request failed ({type(e).__name__}), retrying in {delay:.2f}s")
+            else:
+                if not is_retryable_status(response.status_code):
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                delay = self._backoff_within_deadline(attempt, retry_after_seconds(response))
+                if delay is None:
+                    return response
+                info(f"{provider} returned {response.status_code}, retrying in {delay:.2f}s")
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _send(
+        self, provider: str, client: PooledHttpClient, method: str, url: str, kwargs: dict
+    ) -> httpx.Response:
+        """
+        One attempt. GETs to providers with a hedge policy are duplicated once they run
+        past the provider's observed tail latency, if its rate lane has room. POSTs are
+        never hedged: TheirStack bills each search by the jobs returned.
+        """
+        policy = self.scrap_cfg.hedge_policies.get(provider) if method == "GET" else None
+        if policy is None:
+            return await client.request(method, url, **kwargs)
+        response, outcome = await self.hedger.race(
+            provider,
+            policy,
+            lambda: client.request(method, url, **kwargs),
+            lambda: self.scheduler.try_slot(provider, self.rate_tier),
+        )
+        if outcome.fired:
+            self.metrics.observe_hedge(provider, outcome.won)
+        return response
+
+    def _with_deadline(self, client: PooledHttpClient, kwargs: dict) -> dict:
+        """Caps each attempt's timeout at whatever is left of the run's deadline."""
+        if self.deadline.remaining() is None:
+            return kwargs
+        return {**kwargs, "timeout": self.deadline.http_timeout(getattr(client, "timeout", DEFAULT_TIMEOUT))}
+
+    def _backoff_within_deadline(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """Retry delay, or None when the retry could not start before the deadline."""
+        delay = self.retry_policy.backoff(attempt, retry_after)
+        remaining = self.deadline.remaining()
+        if delay is not None and remaining is not None and delay >= remaining:
+            return None
+        return delay
+
+    async def _fetch_listing(
+        self,
+        provider: str,
+        client: PooledHttpClient,
+        method: str,
+        url: str,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        auth: Optional[tuple] = None,
+    ) -> Any:
+        """
+        Fetches a listing page and returns its JSON body.
+        Identical searches already in flight from any session are joined rather than
+        repeated. With the response cache enabled they also share one paid call per TTL,
+        and stale entries are revalidated with ETag/Last-Modified.
+        The returned payload may be shared between callers and must not be mutated.
+        """
+        request_kwargs = {"params": params, "json": json, "headers": headers, "auth": auth}
+        request_kwargs = {k: v for k, v in request_kwargs.items() if v is not None}
+
+        public_params = {k: v for k, v in (params or {}).items() if k not in CREDENTIAL_PARAMS}
+        key = ResponseCache.make_key(provider, method, url, {"params": public_params, "json": json})
+        try:
+            return await self.single_flight.do(
+                key, lambda: self._load_listing(provider, client, method, url, key, request_kwargs)
+            )
+        except Exception:
+            self.failed_sources.add(provider)
+            raise
+
+    async def _load_listing(
+        self,
+        provider: str,
+        client: PooledHttpClient,
+        method: str,
+        url: str,
+        key: str,
+        request_kwargs: dict,
+    ) -> Any:
+        cache = self.response_cache
+        if cache is None:
+            response = await self._request(provider, client, method, url, **request_kwargs)
+            response.raise_for_status()
+            return response.json()
+
+        headers = request_kwargs.get("headers")
+        ttl = self.scrap_cfg.response_cache_ttl_seconds.get(provider, 0)
+
+        entry = await asyncio.to_thread(cache.get, key)
+        if entry is not None and entry.age < ttl:
+            self.metrics.observe_cache_hit(provider)
+            return entry.payload
+
+        if entry is not None:
+            conditional = dict(headers or {})
+            if entry.etag:
+                conditional["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                conditional["If-Modified-Since"] = entry.last_modified
+            request_kwargs["headers"] = conditional
+
+        response = await self._request(provider, client, method, url, **request_kwargs)
+        if entry is not None and response.status_code == 304:
+            await asyncio.to_thread(cache.touch, key)
+            return entry.payload
+
+        response.raise_for_status()
+        payload = response.json()
+        await asyncio.to_thread(
+            cache.put,
+            key,
+            provider,
+            payload,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+        return payload
+
+    def queue_wait_report(self) -> Dict[str, dict]:
+        """Summarises how long this service's requests spent queued, per provider."""
+        return {
+            provider: {
+                "requests": len(waits),
+                "total_wait_s": round(sum(waits), 3),
+                "max_wait_s": round(max(waits), 3),
+            }
+            for provider, waits in self.queue_waits.items()
+            if waits
+        }
+
     async def _scrape_google(
-        self, client: httpx.AsyncClient, query: SearchStep, location: LocationData
+        self, client: PooledHttpClient, query: SearchStep, location: LocationData, limit: Optional[int] = None
     ) -> List[RawJobMatch]:
-        """Internal handler for SerpAPI (Google Jobs)."""
+        """Internal handler for SerpAPI (Google Jobs). Stops paging once `limit` jobs are in hand."""
         optimised_query = JobQueryCompiler.to_google(query)
         params = {
             "engine": "google_jobs",
@@ -67,84 +547,188 @@ class JobScraperService:
             "gl": self.scrap_cfg.region,
             "api_key": self.api_cfg.serpapi_key,
         }
+        date_chip = JobQueryCompiler.google_date_chip(self.since)
+        if date_chip:
+            params["chips"] = date_chip
+        jobs = []
         try:
-            response = await client.get("https://serpapi.com/search", params=params)
-            response.raise_for_status()
-            data = response.json()
-            raw_results = data.get("jobs_results", [])
-            return [self._map_google_to_schema(job) for job in raw_results]
+            for _ in range(self.scrap_cfg.max_pages):
+                data = await self._fetch_listing("google", client, "GET", "https://serpapi.com/search", params=params)
+                page_jobs = await self._map_rows([self._google_row(job) for job in data.get("jobs_results", [])])
+                jobs.extend(page_jobs)
+                if limit is not None and len(jobs) >= limit:
+                    break
+
+                worth_paging = await self._page_worth_continuing([j.job_url for j in page_jobs])
+                next_token = (data.get("serpapi_pagination") or {}).get("next_page_token")
+                if not next_token or not worth_paging or not self._can_afford_page("google"):
+                    break
+                params = {**params, "next_page_token": next_token}
+            return jobs[:limit]
         except Exception as e:
             error(f"Google Scrape Error for query '{query}': {e}")
+            return jobs[:limit]
+
+    async def _scrape_linkedin(
+        self, client: PooledHttpClient, query_obj: SearchStep, location: LocationData, limit: Optional[int] = None
+    ):
+        """Internal handler for RapidAPI (LinkedIn). Throttled by the 'linkedin' rate lane."""
+        headers = {
+            "X-RapidAPI-Key": self.api_cfg.rapidapi_key,
+            "X-RapidAPI-Host": "linkedin-job-search-api.p.rapidapi.com",
+        }
+        compiled = JobQueryCompiler.to_linkedin(query_obj)
+    
+        params = {
+            "limit": limit or self.scrap_cfg.max_jobs,
+            "location_filter": location.linkedin_string,
+            "advanced_title_filter": compiled["title"], 
+            "description_filter": compiled["skills"],
+            "description_type": "text",
+        }
+        try:
+            data = await self._fetch_listing(
+                "linkedin",
+                client,
+                "GET",
+                f"https://linkedin-job-search-api.p.rapidapi.com/{JobQueryCompiler.linkedin_feed(self.since)}",
+                params=params,
+                headers=headers,
+            )
+            jobs = data if isinstance(data, list) else data.get("jobs", [])
+
+            return await self._map_rows([self._linkedin_row(job) for job in jobs])
+        except Exception as e:
+            error(f"LinkedIn Scrape Error for query '{query_obj}': {e}")
             return []
 
-    async def _scrape_linkedin(self, client: httpx.AsyncClient, query_obj: SearchStep, location: LocationData):
-        """Internal handler for RapidAPI (LinkedIn). Uses semaphore for rate limiting."""
-        async with self._semaphore:
-            headers = {
-                "X-RapidAPI-Key": self.api_cfg.rapidapi_key,
-                "X-RapidAPI-Host": "linkedin-job-search-api.p.rapidapi.com",
-            }
-            compiled = JobQueryCompiler.to_linkedin(query_obj)
-        
-            params = {
-                "limit": self.scrap_cfg.max_jobs,
-                "location_filter": location.linkedin_string,
-                "advanced_title_filter": compiled["title"], 
-                "description_filter": compiled["skills"],
-                "description_type": "text",
-            }
-            try:
-                response = await client.get(
-                    "https://linkedin-job-search-api.p.rapidapi.com/active-jb-7d",
-                    params=params,
-                    headers=headers,
-                )
-                response.raise_for_status()
-                data = response.json()
-                jobs = data if isinstance(data, list) else data.get("jobs", [])
+    async def _scrape_reed(
+        self, client: PooledHttpClient, step: SearchStep, location: LocationData, limit: Optional[int] = None
+    ):
+        """Searches every Reed query for the step, then hydrates at most `limit` listings not fresh in the library."""
+        query_strings = JobQueryCompiler.generate_reed_queries(step)
 
-                if self.api_cfg.free_tier:
-                    await asyncio.sleep(1.5)
+        search_tasks = [self._search_reed_pages(client, qs, location, limit) for qs in query_strings]
+        responses = await asyncio.gather(*search_tasks, return_exceptions=True)
+        all_job_metas = []
+        for metas in responses:
+            if isinstance(metas, list):
+                all_job_metas.extend(metas)
+            elif isinstance(metas, Exception):
+                error(f"Reed Search Error for {step.title_stems}: {metas}")
+        unique_metas = {m['jobId']: m for m in all_job_metas if self._reed_posted_since(m)}.values()
 
-                return [self._map_linkedin_to_schema(job) for job in jobs]
-            except Exception as e:
-                error(f"LinkedIn Scrape Error for query '{query_obj}': {e}")
-                return []
+        cached = await self._find_fresh_in_library([self._reed_job_url(m) for m in unique_metas])
+        to_fetch = [m for m in unique_metas if self._reed_job_url(m) not in cached][:limit]
 
-    async def _scrape_reed(self, client: httpx.AsyncClient, step: SearchStep, location: LocationData):
-        query_strings = JobQueryCompiler.generate_reed_queries(step)
+        detail_tasks = [self._get_full_reed_job(client, m) for m in to_fetch]
+        detail_rows = await asyncio.gather(*detail_tasks, return_exceptions=True)
+        final_jobs = await self._map_rows([row for row in detail_rows if isinstance(row, dict)])
+        return list(cached.values()) + final_jobs
 
-        search_tasks = []
-        for qs in query_strings:
-            params = {"keywords": qs, 
+    async def _search_reed_pages(
+        self, client: PooledHttpClient, keywords: str, location: LocationData, limit: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Pages through Reed results with resultsToSkip until a page stops paying for
+        itself or `limit` listings are in hand.
+        """
+        page_size = limit or self.scrap_cfg.max_jobs
+        metas = []
+        for page in range(self.scrap_cfg.max_pages):
+            params = {"keywords": keywords, 
                       "locationName": location.reed_string, 
-                      "resultsToTake": self.scrap_cfg.max_jobs
+                      "resultsToTake": page_size,
+                      "resultsToSkip": page * page_size,
                       }
+            try:
+                data = await self._fetch_listing("reed", client, "GET",
+                                                 "https://www.reed.co.uk/api/1.0/search", 
+                                                 params=params, 
+                                                 auth=(self.api_cfg.reed_key, ""))
+            except Exception:
+                if page == 0:
+                    raise
+                break
 
-            search_tasks.append(client.get("https://www.reed.co.uk/api/1.0/search", 
-                                        params=params, 
-                                        auth=(self.api_cfg.reed_key, "")))
-        responses = await asyncio.gather(*search_tasks, return_exceptions=True)
-        all_job_metas = []
-        for resp in responses:
-            if isinstance(resp, httpx.Response):
-                data = resp.json()
-                all_job_metas.extend(data.get("results", []))
-        unique_metas = {m['jobId']: m for m in all_job_metas}.values()
-        detail_tasks = [self._get_full_reed_job(client, m) for m in unique_metas]
-        final_jobs = await asyncio.gather(*detail_tasks, return_exceptions=True)
-        return [j for j in final_jobs if isinstance(j, RawJobMatch)]
+            results = data.get("results", [])
+            metas.extend(results)
+            worth_paging = await self._page_worth_continuing([self._reed_job_url(m) for m in results])
+            if len(results) < page_size or not worth_paging or (limit is not None and len(metas) >= limit):
+                break
+        return metas
+
+    def _can_afford_page(self, provider: str) -> bool:
+        """Extra pages are not part of the allocation, so each one is charged to what the run has left."""
+        return self.credits.try_spend(self.scrap_cfg.provider_costs.get(provider, ProviderCost()).per_call)
+
+    async def _page_worth_continuing(self, page_urls: List[str]) -> bool:
+        """
+        Yield-driven stopping rule shared by every paginated provider: keep paging only
+        while at least `min_page_yield` of a page is unseen this run and not already fresh
+        in the global library.
+        """
+        if not page_urls:
+            return False
+        new_urls = [url for url in page_urls if url and url not in self._seen_listing_urls]
+        self._seen_listing_urls.update(new_urls)
+        cached = await self._find_fresh_in_library(new_urls)
+        fresh_count = len(new_urls) - len(cached)
+        return fresh_count / len(page_urls) >= self.scrap_cfg.min_page_yield
+
+    def _reed_posted_since(self, job: dict) -> bool:
+        """Reed has no recency filter, so the watermark is applied to listings before detail calls."""
+        if self.since is None:
+            return True
+        try:
+            posted = datetime.strptime(job.get("date") or "", "%d/%m/%Y").date()
+        except ValueError:
+            return True
+        return posted >= self.since.date()
+
+    @staticmethod
+    def _reed_job_url(job: dict) -> str:
+        return job.get("externalUrl") or job.get("jobUrl") or ""
+
+    async def _find_fresh_in_library(self, job_urls: List[str]) -> Dict[str, RawJobMatch]:
+        """
+        Checks listing URLs against the global library so detail calls are only
+        spent on new or expired jobs. Any lookup failure falls back to fetching everything.
+        """
+        urls = [url for url in job_urls if url]
+        if self.library is None or not urls:
+            return {}
+
+        unchecked = [url for url in urls if url not in self._library_checked]
+        if unchecked:
+            try:
+                found = await self.library.find_fresh_global_jobs_async(
+                    unchecked, self.scrap_cfg.library_ttl_days
+                )
+            except Exception as e:
+                error(f"Global library lookup failed, fetching all details: {e}")
+                return {url: self._library_hits[url] for url in urls if url in self._library_hits}
+            self._library_checked.update(unchecked)
+            self._library_hits.update(found)
+
+        cached = {url: self._library_hits[url] for url in urls if url in self._library_hits}
+        if cached:
+            info(f"{len(cached)} listings already fresh in the global library")
+        return cached
     
-    async def _get_full_reed_job(self, client: httpx.AsyncClient, job: dict) -> dict:
+    async def _get_full_reed_job(self, client: PooledHttpClient, job: dict) -> Optional[dict]:
+        """Fetches one Reed detail page and returns its RawJobMatch fields, mapped later as a batch."""
         try:
-            job_url = job.get("externalUrl") or job.get("jobUrl") or ""
+            job_url = self._reed_job_url(job)
             job_id = job.get("jobId")
             if not job_id:
                 return None
-            response = await client.get(f"https://www.reed.co.uk/api/1.0/jobs/{job_id}",
-                                        auth=(self.api_cfg.reed_key, ""))
+            self.metrics.observe_detail_fetch("reed")
+            response = await self._request("reed", client, "GET",
+                                           f"https://www.reed.co.uk/api/1.0/jobs/{job_id}",
+                                           auth=(self.api_cfg.reed_key, ""))
             response.raise_for_status()
-            return self._map_reed_to_schema(response.json(), job_url)
+            return self._reed_row(response.json(), job_url)
         except Exception as e:
             print(f"Reed Scrape Error for job '{job_id}': {e}")
             return None
@@ -156,7 +740,9 @@ class JobScraperService:
             if isinstance(highlight, dict) and "title" in highlight
         }
     
-    async def _scrape_indeed(self, client: httpx.AsyncClient, step: SearchStep, location: LocationData):
+    async def _scrape_indeed(
+        self, client: PooledHttpClient, step: SearchStep, location: LocationData, limit: Optional[int] = None
+    ):
         qs = JobQueryCompiler.generate_indeed_queries(step)
         
         headers = {
@@ -166,32 +752,54 @@ class JobScraperService:
 
         params = JobQueryCompiler.generate_indeed_params(qs, location)
         try:
-            resp = await client.get("https://api.hasdata.com/scrape/indeed/listing", 
-                                    params=params, headers=headers)
-            resp.raise_for_status()
-            data = resp.json().get("jobs", [])
-            
+            listing = await self._fetch_listing("indeed", client, "GET",
+                                                "https://api.hasdata.com/scrape/indeed/listing", 
+                                                params=params, headers=headers)
+            data = listing.get("jobs", [])
         except Exception as e:
             print(f"Listing error: {e}")
+            return []
 
-        unique_metas = {m['url']: m for m in data}.values()
-        
-        final_jobs = []
-        for m in unique_metas:
-            job_obj = await self._get_full_indeed_job(client, m, headers)
-            if isinstance(job_obj, RawJobMatch):
-                final_jobs.append(job_obj)
-            await asyncio.sleep(0.5) 
+        unique_metas = {m['url']: m for m in data if m.get('url')}.values()
+
+        cached = await self._find_fresh_in_library([m['url'] for m in unique_metas])
+        to_fetch = [m for m in unique_metas if m['url'] not in cached][:limit]
+
+        final_jobs = list(cached.values())
+        async for job_obj in self._hydrate_indeed_jobs(client, to_fetch, headers):
+            final_jobs.append(job_obj)
 
         return final_jobs
 
-    async def _get_full_indeed_job(self, client: httpx.AsyncClient, job: dict, headers: dict) -> Optional[RawJobMatch]:
+    async def _hydrate_indeed_jobs(
+        self, client: PooledHttpClient, metas: Iterable[dict], headers: dict
+    ) -> AsyncIterator[RawJobMatch]:
+        """
+        Fetches Indeed detail pages concurrently and yields each job as soon as it lands.
+        Concurrency and pacing come from the 'indeed' rate lane, not from this loop.
+        """
+        tasks = [
+            asyncio.create_task(self._get_full_indeed_job(client, m, headers))
+            for m in metas
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                job_obj = await next_done
+                if isinstance(job_obj, RawJobMatch):
+                    yield job_obj
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _get_full_indeed_job(self, client: PooledHttpClient, job: dict, headers: dict) -> Optional[RawJobMatch]:
         url = job.get("url")
         if not url: return None
         
         try:
-            response = await client.get("https://api.hasdata.com/scrape/indeed/job", 
-                                        params={"url": url}, headers=headers)
+            self.metrics.observe_detail_fetch("indeed")
+            response = await self._request("indeed", client, "GET",
+                                           "https://api.hasdata.com/scrape/indeed/job", 
+                                           params={"url": url}, headers=headers)
             response.raise_for_status()
             return self._map_indeed_to_schema(job, response.json())
         except Exception as e:
@@ -240,7 +848,9 @@ class JobScraperService:
             posted_at=job.get("isoDate") or datetime.now().isoformat()
         )
 
-    async def _scrape_theirstack(self, client: httpx.AsyncClient, step: SearchStep, location: LocationData):
+    async def _scrape_theirstack(
+        self, client: PooledHttpClient, step: SearchStep, location: LocationData, limit: Optional[int] = None
+    ):
         """
         Internal handler for TheirStack API. 
         Consumes 1 credit per job. Aggregates from LinkedIn, Indeed, and 300k+ sites.
@@ -253,27 +863,30 @@ class JobScraperService:
             "Authorization": f"Bearer {self.api_cfg.theirstack_key}",
             "Content-Type": "application/json"
         }
-        payload = JobQueryCompiler.generate_theirstack_query(step, location, self.scrap_cfg.max_jobs)
+        payload = JobQueryCompiler.generate_theirstack_query(
+            step, location, limit or self.scrap_cfg.max_jobs, self.since, self.scrap_cfg.full_window_days
+        )
         try:
-            response = await client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._fetch_listing("theirstack", client, "POST", url, json=payload, headers=headers)
             raw_results = data.get("data", [])
             if isinstance(raw_results, list):
-                return [self._map_theirstack_to_schema(job) for job in raw_results]
+                return await self._map_rows([self._theirstack_row(job) for job in raw_results])
             return []
         except Exception as e:
             error(f"TheirStack Scrape Error for {step.title_stems}: {e}")
             return []
 
     def _map_theirstack_to_schema(self, item: Dict[str, Any]) -> RawJobMatch:
+        return RawJobMatch(**self._theirstack_row(item))
+
+    def _theirstack_row(self, item: Dict[str, Any]) -> dict:
         """Standardizes TheirStack results. No second 'Detail' call needed."""
         work_setting = WorkSetting.UNKNOWN
         if item.get("remote"):
             work_setting = WorkSetting.REMOTE
         if item.get("hybrid"):
             work_setting = WorkSetting.HYBRID
-        return RawJobMatch(
+        return dict(
             title=item.get("job_title") or "Unknown Title",
             company_name=item.get("company") or "Unknown Company",
             location=item.get("location") or "United Kingdom",
@@ -312,13 +925,16 @@ class JobScraperService:
         return apply_options[0].get("link", "")
 
     def _map_google_to_schema(self, item: Dict[str, Any]) -> RawJobMatch:
-        """Standardizes Google Jobs results into our RawJobMatch schema."""
+        return RawJobMatch(**self._google_row(item))
+
+    def _google_row(self, item: Dict[str, Any]) -> dict:
+        """Standardizes Google Jobs results into RawJobMatch fields."""
         ext = item.get("detected_extensions", {})
 
         apply_opts = item.get("apply_options", [])
         url = self._get_best_apply_link(apply_opts)
         highlights = self._get_highlights(item.get("highlights", {}))
-        return RawJobMatch(
+        return dict(
             title=item.get("title") or "Unknown Title",
             company_name=item.get("company_name") or "Unknown Company",
             location=item.get("location") or "Unknown Location",
@@ -332,6 +948,9 @@ class JobScraperService:
         )
 
     def _map_linkedin_to_schema(self, item: Dict[str, Any]) -> RawJobMatch:
+        return RawJobMatch(**self._linkedin_row(item))
+
+    def _linkedin_row(self, item: Dict[str, Any]) -> dict:
         """Standardizes LinkedIn API results with robust None-handling."""
         sal_raw = item.get("salary_raw") or {}
         val = sal_raw.get("value") or {}
@@ -374,7 +993,7 @@ class JobScraperService:
         locations = item.get("locations_derived") or ["Unknown"]
         primary_location = locations[0] if locations else "Unknown"
 
-        return RawJobMatch(
+        return dict(
             title=item.get("title") or "Unknown",
             company_name=item.get("organization") or "Unknown",
             location=primary_location,
@@ -390,30 +1009,57 @@ class JobScraperService:
             schedule_type=schedule,
         )
     
-    def _map_reed_to_schema(self, job: Dict, job_url: str) -> RawJobMatch:
-        try:
-            return RawJobMatch(
-                title=job.get("jobTitle"),
-                company_name=job.get("employerName"),
-                location=job.get("locationName"),
-                job_url=job_url,
-                salary_min=job.get("yearlyMinimumSalary", job.get("minimumSalary")),
-                salary_max=job.get("yearlyMaximumSalary", job.get("maximumSalary")),
-                salary_string=job.get("salary") or "",
-                description=job.get("jobDescription"),
-                schedule_type="Full Time" if job.get('fullTime') else "Part Time" if job.get('partTime') else "Unknown",
-                is_contract=job.get('contractType') != "Permanent",
-                posted_at=job.get('datePosted', ""),
-                qualifications=[], 
-                responsibilities=[],
-                benefits=[]
-            )
-        except:
-            print(f"FAILED TO PARSE JOB: {job}")
+    def _map_reed_to_schema(self, job: Dict, job_url: str) -> Optional[RawJobMatch]:
+        jobs = validate_job_rows([self._reed_row(job, job_url)])
+        return jobs[0] if jobs else None
+
+    def _reed_row(self, job: Dict, job_url: str) -> dict:
+        return dict(
+            title=job.get("jobTitle"),
+            company_name=job.get("employerName"),
+            location=job.get("locationName"),
+            job_url=job_url,
+            salary_min=job.get("yearlyMinimumSalary", job.get("minimumSalary")),
+            salary_max=job.get("yearlyMaximumSalary", job.get("maximumSalary")),
+            salary_string=job.get("salary") or "",
+            description=job.get("jobDescription"),
+            schedule_type="Full Time" if job.get('fullTime') else "Part Time" if job.get('partTime') else "Unknown",
+            is_contract=job.get('contractType') != "Permanent",
+            posted_at=job.get('datePosted', ""),
+            qualifications=[], 
+            responsibilities=[],
+            benefits=[]
+        )
 
 
     def _process_and_deduplicate(self, flat_list: List[RawJobMatch]) -> RawJobMatchList:
+        """Drops exact URL repeats, then collapses the same posting seen through several providers."""
         unique_jobs = {j.job_url: j for j in flat_list if j.job_url}
-        return RawJobMatchList(jobs=list(unique_jobs.values()))
+        collapsed = collapse_near_duplicates(
+            list(unique_jobs.values()), threshold=self.scrap_cfg.near_duplicate_threshold
+        )
+        return RawJobMatchList(jobs=collapsed)
+
+    async def _map_rows(self, rows: List[dict]) -> List[RawJobMatch]:
+        """
+        Validates a provider page in one pass. Large pages are validated in a worker
+        thread so a big TheirStack or Reed batch does not stall other providers' I/O.
+        """
+        if len(rows) >= self.scrap_cfg.mapping_offload_threshold:
+            return await asyncio.to_thread(validate_job_rows, rows)
+        return validate_job_rows(rows)
+
+    def _dedupe_new_jobs(self, jobs: List[RawJobMatch], dedupe_index: NearDuplicateIndex) -> RawJobMatchList:
+        """
+        Incremental dedupe for streaming. Jobs matching an earlier posting (exactly or
+        near-exactly) are folded into it, so each batch only carries new canonical jobs.
+        Batches carry copies: later merges change the index's canonicals, never a job a
+        consumer may still be syncing.
+        """
+        fresh = [
+            job for job in jobs or []
+            if isinstance(job, RawJobMatch) and job.job_url and dedupe_index.add(job)
+        ]
+        return RawJobMatchList(jobs=[job.model_copy(deep=True) for job in fresh])
     
 
@@ -0,0 +1,390 @@
+"""Provider Stand-in: Offline fakes of every job provider, plus record/replay of real responses."""
+import asyncio
+import hashlib
+import json
+import os
+import random
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+PROVIDER_HOSTS = {
+    "serpapi.com": "google",
+    "linkedin-job-search-api.p.rapidapi.com": "linkedin",
+    "www.reed.co.uk": "reed",
+    "api.hasdata.com": "indeed",
+    "api.theirstack.com": "theirstack",
+}
+
+CREDENTIAL_QUERY_PARAMS = {"api_key"}
+RECORDED_HEADERS = ("content-type", "etag", "last-modified", "retry-after")
+
+_WORDS = (
+    "build maintain scalable data platform pipelines cloud team stakeholders deliver "
+    "analytics models production services reliable modern stack collaborate engineers "
+    "design secure performance ownership roadmap mentoring automation testing quality"
+).split()
+_COMPANIES = ("Northwind", "Contoso", "Initech", "Globex", "Umbrella", "Hooli", "Stark", "Wayne")
+_SITES = ("LinkedIn", "Indeed", "Reed", "Glassdoor", "Company Site")
+
+
+@dataclass
+class StandInBehaviour:
+    """Latency, fault and rate-limit knobs for one fake provider."""
+    latency_ms: float = 50.0
+    jitter_ms: float = 20.0
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    rate_limit_rps: Optional[float] = None
+    retry_after_s: float = 1.0
+    total_results: int = 60
+    overlap: float = 0.3
+
+
+@dataclass
+class StandInStats:
+    requests: int = 0
+    rate_limited: int = 0
+    errors: int = 0
+    timeouts: int = 0
+
+
+@dataclass
+class _Posting:
+    key: str
+    title: str
+    company: str
+    location: str
+    description: str
+    posted: datetime
+    salary_min: int
+    salary_max: int
+    url: str
+    job_id: int
+
+
+class ProviderStandInTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport answering the exact endpoints JobScraperService calls, with
+    deterministic postings per query. A share of postings (`overlap`) is listed by
+    several providers under different URLs so near-duplicate collapsing is exercised.
+    Plug it into PooledHttpClient(transport=...) to run the real scraper offline.
+    """
+
+    def __init__(
+        self,
+        behaviours: Optional[Dict[str, StandInBehaviour]] = None,
+        default: Optional[StandInBehaviour] = None,
+        seed: int = 7,
+    ):
+        self.behaviours = behaviours or {}
+        self.default = default or StandInBehaviour()
+        self.stats: Dict[str, StandInStats] = {}
+        self._rng = random.Random(seed)
+        self._windows: Dict[str, deque] = {}
+        self._reed_jobs: Dict[int, _Posting] = {}
+        self._routes: Dict[str, Callable[[httpx.Request, StandInBehaviour], Any]] = {
+            "google": self._google,
+            "linkedin": self._linkedin,
+            "reed": self._reed,
+            "indeed": self._indeed,
+            "theirstack": self._theirstack,
+        }
+
+    def behaviour(self, provider: str) -> StandInBehaviour:
+        return self.behaviours.get(provider, self.default)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        provider = PROVIDER_HOSTS.get(request.url.host)
+        if provider is None:
+            return httpx.Response(404, json={"error": f"No stand-in for {request.url.host}"})
+
+        behaviour = self.behaviour(provider)
+        stats = self.stats.setdefault(provider, StandInStats())
+        stats.requests += 1
+
+        if self._over_rate_limit(provider, behaviour):
+            stats.rate_limited += 1
+            return httpx.Response(
+                429, json={"error": "rate limited"}, headers={"Retry-After": f"{behaviour.retry_after_s:g}"}
+            )
+
+        delay = max(0.0, self._rng.gauss(behaviour.latency_ms, behaviour.jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+
+        roll = self._rng.random()
+        if roll < behaviour.timeout_rate:
+            stats.timeouts += 1
+            raise httpx.ReadTimeout("Stand-in timeout", request=request)
+        if roll < behaviour.timeout_rate + behaviour.error_rate:
+            stats.errors += 1
+            return httpx.Response(503, json={"error": "unavailable"})
+
+        payload = self._routes[provider](request, behaviour)
+        if payload is None:
+            return httpx.Response(404, json={"error": "not found"})
+        return httpx.Response(200, json=payload)
+
+    def _over_rate_limit(self, provider: str, behaviour: StandInBehaviour) -> bool:
+        if not behaviour.rate_limit_rps:
+            return False
+        window = self._windows.setdefault(provider, deque())
+        now = monotonic()
+        while window and now - window[0] >= 1.0:
+            window.popleft()
+        if len(window) >= behaviour.rate_limit_rps:
+            return True
+        window.append(now)
+        return False
+
+    # --- Synthetic postings -------------------------------------------------
+
+    def _postings(self, provider: str, query: str, behaviour: StandInBehaviour, offset: int, count: int) -> List[_Posting]:
+        query = " ".join(query.lower().split()) or "general"
+        end = min(behaviour.total_results, offset + count)
+        return [self._posting(provider, query, i, behaviour.overlap) for i in range(offset, end)]
+
+    @staticmethod
+    def _topic(query: str) -> List[str]:
+        """Leading title words. Providers phrase the same step differently, so overlap keys on these."""
+        words = [w for w in query.replace("(", " ").replace(")", " ").split() if w.isalpha() and w != "or"]
+        return words[:2]
+
+    def _posting(self, provider: str, query: str, index: int, overlap: float) -> _Posting:
+        topic = " ".join(self._topic(query))
+        digest = hashlib.sha256(f"{topic}|{index}".encode()).digest()
+        shared = digest[0] / 255 < overlap
+        key = f"{topic}|{index}" if shared else f"{provider}|{query}|{index}"
+        rng = random.Random(hashlib.sha256(key.encode()).digest())
+        title_words = [w.title() for w in self._topic(query)]
+        job_id = int.from_bytes(hashlib.sha256(f"{provider}|{key}".encode()).digest()[:4], "big")
+        salary = rng.randrange(35, 120) * 1000
+        return _Posting(
+            key=key,
+            title=" ".join(title_words or ["Engineer"]) + f" {rng.choice(['I', 'II', 'Lead', 'Senior'])}",
+            company=f"{rng.choice(_COMPANIES)} {rng.randrange(1, 50)}",
+            location="London",
+            description=" ".join(rng.choice(_WORDS) for _ in range(120)),
+            posted=datetime.now(timezone.utc) - timedelta(hours=rng.randrange(1, 24 * 14)),
+            salary_min=salary,
+            salary_max=salary + 15000,
+            url=f"https://jobs.example/{provider}/{job_id}",
+            job_id=job_id,
+        )
+
+    # --- Provider routes ----------------------------------------------------
+
+    def _google(self, request: httpx.Request, behaviour: StandInBehaviour):
+        params = dict(request.url.params)
+        offset = int(params.get("next_page_token") or 0)
+        postings = self._postings("google", params.get("q", ""), behaviour, offset, 10)
+        payload = {
+            "jobs_results": [
+                {
+                    "title": p.title,
+                    "company_name": p.company,
+                    "location": p.location,
+                    "description": p.description,
+                    "detected_extensions": {"posted_at": f"{p.posted:%d %b}", "salary": f"£{p.salary_min:,}"},
+                    "apply_options": [{"title": _SITES[p.job_id % len(_SITES)], "link": p.url}],
+                }
+                for p in postings
+            ]
+        }
+        if offset + len(postings) < behaviour.total_results:
+            payload["serpapi_pagination"] = {"next_page_token": str(offset + len(postings))}
+        return payload
+
+    def _linkedin(self, request: httpx.Request, behaviour: StandInBehaviour):
+        params = dict(request.url.params)
+        query = f"{params.get('advanced_title_filter', '')} {params.get('description_filter', '')}"
+        postings = self._postings("linkedin", query, behaviour, 0, int(params.get("limit") or 10))
+        return [
+            {
+                "title": p.title,
+                "organization": p.company,
+                "url": p.url,
+                "locations_derived": [p.location],
+                "description_text": p.description,
+                "date_posted": p.posted.isoformat(),
+                "employment_type": ["FULL_TIME"],
+                "salary_raw": {"value": {"minValue": p.salary_min, "maxValue": p.salary_max}},
+            }
+            for p in postings
+        ]
+
+    def _reed(self, request: httpx.Request, behaviour: StandInBehaviour):
+        path = request.url.path
+        if path.startswith("/api/1.0/jobs/"):
+            posting = self._reed_jobs.get(int(path.rsplit("/", 1)[-1]))
+            if posting is None:
+                return None
+            return {
+                "jobId": posting.job_id,
+                "jobTitle": posting.title,
+                "employerName": posting.company,
+                "locationName": posting.location,
+                "jobDescription": posting.description,
+                "yearlyMinimumSalary": posting.salary_min,
+                "yearlyMaximumSalary": posting.salary_max,
+                "contractType": "Permanent",
+                "fullTime": True,
+                "datePosted": f"{posting.posted:%d/%m/%Y}",
+            }
+
+        params = dict(request.url.params)
+        take = int(params.get("resultsToTake") or 25)
+        skip = int(params.get("resultsToSkip") or 0)
+        postings = self._postings("reed", params.get("keywords", ""), behaviour, skip, take)
+        for posting in postings:
+            self._reed_jobs[posting.job_id] = posting
+        return {
+            "results": [
+                {
+                    "jobId": p.job_id,
+                    "jobTitle": p.title,
+                    "employerName": p.company,
+                    "locationName": p.location,
+                    "jobUrl": p.url,
+                    "date": f"{p.posted:%d/%m/%Y}",
+                }
+                for p in postings
+            ],
+            "totalResults": behaviour.total_results,
+        }
+
+    def _indeed(self, request: httpx.Request, behaviour: StandInBehaviour):
+        params = dict(request.url.params)
+        if request.url.path.endswith("/job"):
+            return {"description": f"Full description for {params.get('url')}. " + " ".join(_WORDS)}
+        postings = self._postings("indeed", params.get("keyword", ""), behaviour, 0, 15)
+        return {
+            "jobs": [
+                {
+                    "title": p.title,
+                    "company": p.company,
+                    "location": p.location,
+                    "url": p.url,
+                    "details": ["Full time", "Hybrid"],
+                    "salary": {"min": p.salary_min, "max": p.salary_max},
+                    "isoDate": p.posted.isoformat(),
+                    "description": p.description[:200],
+                }
+                for p in postings
+            ]
+        }
+
+    def _theirstack(self, request: httpx.Request, behaviour: StandInBehaviour):
+        body = json.loads(request.content or b"{}")
+        query = " ".join(body.get("job_title_or") or [])
+        postings = self._postings("theirstack", query, behaviour, 0, int(body.get("limit") or 10))
+        return {
+            "data": [
+                {
+                    "job_title": p.title,
+                    "company": p.company,
+                    "location": p.location,
+                    "final_url": p.url,
+                    "description": p.description,
+                    "min_annual_salary": p.salary_min,
+                    "max_annual_salary": p.salary_max,
+                    "date_posted": p.posted.date().isoformat(),
+                    "hybrid": True,
+                }
+                for p in postings
+            ]
+        }
+
+
+# --- Record / replay ------------------------------------------------------------
+
+
+def scrub_url(url: httpx.URL) -> str:
+    """Drops credential query params so fixtures never hold API keys."""
+    parts = urlsplit(str(url))
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in CREDENTIAL_QUERY_PARAMS)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+def fixture_key(request: httpx.Request) -> str:
+    body_hash = hashlib.sha256(request.content or b"").hexdigest()
+    canonical = f"{request.method}|{scrub_url(request.url)}|{body_hash}"
+    host = request.url.host.replace(".", "_")
+    return f"{host}-{hashlib.sha256(canonical.encode()).hexdigest()[:24]}"
+
+
+def _fixture_path(fixture_dir: str, request: httpx.Request) -> str:
+    return os.path.join(fixture_dir, f"{fixture_key(request)}.json")
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Passes requests to a real (or any inner) transport and saves each response as a fixture."""
+
+    def __init__(self, fixture_dir: str, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.fixture_dir = fixture_dir
+        self.inner = inner or httpx.AsyncHTTPTransport()
+        os.makedirs(fixture_dir, exist_ok=True)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.inner.handle_async_request(request)
+        content = await response.aread()
+        headers = {k: v for k, v in response.headers.items() if k.lower() in RECORDED_HEADERS}
+        fixture = {
+            "request": {"method": request.method, "url": scrub_url(request.url)},
+            "status": response.status_code,
+            "headers": headers,
+            "body": content.decode("utf-8", errors="replace"),
+        }
+        with open(_fixture_path(self.fixture_dir, request), "w", encoding="utf-8") as f:
+            json.dump(fixture, f, indent=2)
+        return httpx.Response(response.status_code, headers=headers, content=content)
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serves responses captured by RecordingTransport. Requests without a fixture go to
+    `fallback` when given (e.g. a ProviderStandInTransport), otherwise get a 404.
+    """
+
+    def __init__(
+        self,
+        fixture_dir: str,
+        latency_ms: float = 0.0,
+        fallback: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.fixture_dir = fixture_dir
+        self.latency_ms = latency_ms
+        self.fallback = fallback
+        self.misses: List[str] = []
+        self._cache: Dict[str, Tuple[int, dict, bytes]] = {}
+
+    def _load(self, request: httpx.Request) -> Optional[Tuple[int, dict, bytes]]:
+        key = fixture_key(request)
+        if key not in self._cache:
+            path = _fixture_path(self.fixture_dir, request)
+            if not os.path.exists(path):
+                return None
+            with open(path, encoding="utf-8") as f:
+                fixture = json.load(f)
+            self._cache[key] = (fixture["status"], fixture["headers"], fixture["body"].encode("utf-8"))
+        return self._cache[key]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        recorded = self._load(request)
+        if recorded is None:
+            self.misses.append(scrub_url(request.url))
+            if self.fallback is not None:
+                return await self.fallback.handle_async_request(request)
+            return httpx.Response(404, json={"error": f"No fixture for {request.method} {scrub_url(request.url)}"})
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        status, headers, content = recorded
+        return httpx.Response(status, headers=headers, content=content)
@@ -0,0 +1,227 @@
+"""Query Allocator: Spends a per-run credit budget on the provider/step pairs most likely to pay off."""
+import math
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from time import time
+from typing import Dict, List, Optional, Tuple
+
+from src.schema import ProviderCost, SearchStep
+from src.utils.dedupe import normalize_for_matching
+
+
+def query_shape(step: SearchStep) -> str:
+    """Order-insensitive token set of a step's titles and skills, used to match similar queries."""
+    text = " ".join([*step.title_stems, *step.must_have_skills])
+    return " ".join(sorted(set(normalize_for_matching(text).split())))
+
+
+def shape_similarity(a: str, b: str) -> float:
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+
+class YieldHistory:
+    """
+    SQLite record of how many new unique jobs each provider returned per query shape.
+    Each pair keeps an exponentially weighted average so recent runs count most.
+    """
+
+    def __init__(self, path: str, smoothing: float = 0.3):
+        self.path = path
+        self.smoothing = smoothing
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS provider_yield (
+                provider TEXT NOT NULL,
+                shape TEXT NOT NULL,
+                avg_new_jobs REAL NOT NULL,
+                runs INTEGER NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (provider, shape)
+            )"""
+        )
+
+    def record(self, provider: str, shape: str, new_jobs: int):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT avg_new_jobs, runs FROM provider_yield WHERE provider = ? AND shape = ?",
+                (provider, shape),
+            ).fetchone()
+            if row is None:
+                avg, runs = float(new_jobs), 1
+            else:
+                avg = self.smoothing * new_jobs + (1 - self.smoothing) * row[0]
+                runs = row[1] + 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO provider_yield VALUES (?, ?, ?, ?, ?)",
+                (provider, shape, avg, runs, time()),
+            )
+
+    def expected_new_jobs(
+        self, provider: str, shape: str, half_life_days: float = 14.0, min_similarity: float = 0.3
+    ) -> Optional[float]:
+        """
+        Similarity- and recency-weighted average over this provider's history for
+        queries sharing tokens with `shape`. None when nothing similar has been run.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT shape, avg_new_jobs, updated_at FROM provider_yield WHERE provider = ?",
+                (provider,),
+            ).fetchall()
+        now = time()
+        total_weight = weighted = 0.0
+        for seen_shape, avg_new_jobs, updated_at in rows:
+            similarity = shape_similarity(shape, seen_shape)
+            if similarity < min_similarity:
+                continue
+            age_days = max(0.0, now - updated_at) / 86400
+            weight = similarity * 0.5 ** (age_days / half_life_days)
+            total_weight += weight
+            weighted += weight * avg_new_jobs
+        if total_weight < 0.05:
+            return None
+        return weighted / total_weight
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CreditLedger:
+    """Per-run credit counter. A budget of None never refuses."""
+
+    def __init__(self, budget: Optional[float]):
+        self.budget = budget
+        self.spent = 0.0
+
+    @property
+    def remaining(self) -> float:
+        if self.budget is None:
+            return math.inf
+        return max(0.0, self.budget - self.spent)
+
+    def try_spend(self, credits: float) -> bool:
+        if credits > self.remaining:
+            return False
+        self.spent += credits
+        return True
+
+
+@dataclass
+class Allocation:
+    provider: str
+    step: SearchStep
+    limit: int
+    expected_new_jobs: Optional[float] = None
+    credits: float = 0.0
+
+    @property
+    def shape(self) -> str:
+        return query_shape(self.step)
+
+
+class QueryAllocator:
+    """
+    Greedy knapsack over provider/step pairs: pairs are taken in order of expected new
+    unique jobs per credit until the run's budget is spent. Per-job priced providers get
+    their limit trimmed to whatever budget is left. Pairs with no history are assumed
+    to yield `exploration_prior` of max_jobs, so new query shapes still get tried.
+    """
+
+    def __init__(
+        self,
+        costs: Dict[str, ProviderCost],
+        history: Optional[YieldHistory],
+        ledger: CreditLedger,
+        max_jobs: int,
+        half_life_days: float = 14.0,
+        exploration_prior: float = 0.5,
+        limit_caps: Optional[Dict[str, int]] = None,
+    ):
+        self.costs = costs
+        self.limit_caps = limit_caps or {}
+        self.history = history
+        self.ledger = ledger
+        self.max_jobs = max_jobs
+        self.half_life_days = half_life_days
+        self.exploration_prior = exploration_prior
+
+    def request_limit(self, provider: str) -> int:
+        """Jobs one request can actually return: max_jobs, unless the provider's query caps it lower."""
+        return min(self.max_jobs, self.limit_caps.get(provider, self.max_jobs))
+
+    def cost(self, provider: str, limit: int) -> float:
+        price = self.costs.get(provider, ProviderCost())
+        return price.per_call + price.per_job * limit
+
+    def expected_new_jobs(self, provider: str, step: SearchStep) -> float:
+        expected = None
+        if self.history is not None:
+            expected = self.history.expected_new_jobs(provider, query_shape(step), self.half_life_days)
+        if expected is None:
+            expected = self.request_limit(provider) * self.exploration_prior
+        return expected
+
+    def allocate(self, candidates: List[Tuple[str, SearchStep]]) -> Tuple[List[Allocation], List[Allocation]]:
+        """Returns (planned, dropped) allocations, planned ones in candidate order."""
+        if self.ledger.budget is None:
+            return [Allocation(provider, step, self.request_limit(provider)) for provider, step in candidates], []
+
+        proposals = []
+        for order, (provider, step) in enumerate(candidates):
+            expected = self.expected_new_jobs(provider, step)
+            limit = self.request_limit(provider)
+            proposals.append((order, Allocation(provider, step, limit, expected, self.cost(provider, limit))))
+
+        def value(proposal) -> float:
+            allocation = proposal[1]
+            if allocation.credits <= 0:
+                return math.inf
+            return allocation.expected_new_jobs / allocation.credits
+
+        planned, dropped = [], []
+        for order, allocation in sorted(proposals, key=value, reverse=True):
+            if not self.ledger.try_spend(allocation.credits):
+                allocation = self._trim_to_budget(allocation)
+                if allocation is None or not self.ledger.try_spend(allocation.credits):
+                    dropped.append(proposals[order][1])
+                    continue
+            planned.append((order, allocation))
+
+        return [allocation for _, allocation in sorted(planned, key=lambda p: p[0])], dropped
+
+    def _trim_to_budget(self, allocation: Allocation) -> Optional[Allocation]:
+        price = self.costs.get(allocation.provider, ProviderCost())
+        if price.per_job <= 0:
+            return None
+        affordable = int((self.ledger.remaining - price.per_call) // price.per_job)
+        if affordable < 1:
+            return None
+        return Allocation(
+            allocation.provider,
+            allocation.step,
+            affordable,
+            allocation.expected_new_jobs * affordable / allocation.limit,
+            self.cost(allocation.provider, affordable),
+        )
+
+
+_histories: Dict[str, YieldHistory] = {}
+_histories_lock = threading.Lock()
+
+
+def get_yield_history(path: str) -> YieldHistory:
+    """Returns the process-wide yield history for a path so all sessions share one connection."""
+    with _histories_lock:
+        history = _histories.get(path)
+        if history is None:
+            history = _histories[path] = YieldHistory(path)
+        return history
@@ -0,0 +1,270 @@
+"""Rate Scheduler: Per-provider token buckets, concurrency caps and daily budgets."""
+import asyncio
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from time import monotonic
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from src.schema import ProviderRateLimit
+from src.utils.func import BudgetExhaustedError
+
+DEFAULT_TIER = "standard"
+FREE_TIER = "free"
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Callers reserve a token and are told how long
+    to sleep, so the bucket works from any event loop without owning one.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Takes a token, possibly on credit, and returns the seconds to wait for it."""
+        with self._lock:
+            self._refill(monotonic())
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def try_take(self) -> bool:
+        """Takes a token only if one is available now; never borrows."""
+        with self._lock:
+            self._refill(monotonic())
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def reconfigure(self, rate: float, burst: int):
+        with self._lock:
+            self._refill(monotonic())
+            self.rate, self.burst = rate, burst
+            self._tokens = min(self._tokens, float(burst))
+
+
+class InFlightLimiter:
+    """Cross-loop counting semaphore. Waiters are woken on their own loop."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._active = 0
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+
+    async def acquire(self):
+        with self._lock:
+            if self._active < self.limit and not self._waiters:
+                self._active += 1
+                return
+            loop = asyncio.get_running_loop()
+            entry = (loop, loop.create_future())
+            self._waiters.append(entry)
+
+        fut = entry[1]
+        try:
+            await fut
+        except asyncio.CancelledError:
+            with self._lock:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    raise
+            if fut.done() and not fut.cancelled():
+                self.release()
+            raise
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._active < self.limit and not self._waiters:
+                self._active += 1
+                return True
+            return False
+
+    def release(self):
+        with self._lock:
+            while self._waiters and self._active <= self.limit:
+                loop, fut = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(self._grant, fut)
+                    return
+                except RuntimeError:
+                    continue  # the waiter's loop has already shut down
+            self._active -= 1
+
+    def resize(self, limit: int):
+        """Changes the cap; a raised cap admits queued waiters straight away."""
+        with self._lock:
+            self.limit = limit
+            while self._waiters and self._active < self.limit:
+                loop, fut = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(self._grant, fut)
+                except RuntimeError:
+                    continue  # the waiter's loop has already shut down
+                self._active += 1
+
+    def _grant(self, fut: asyncio.Future):
+        if fut.done():
+            self.release()
+        else:
+            fut.set_result(None)
+
+
+class DailyBudget:
+    """Counts calls per UTC day and refuses once the budget is spent."""
+
+    def __init__(self, limit: Optional[int]):
+        self.limit = limit
+        self._day = datetime.now(timezone.utc).date()
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def consume(self) -> bool:
+        with self._lock:
+            today = datetime.now(timezone.utc).date()
+            if today != self._day:
+                self._day, self._used = today, 0
+            if self.limit is not None and self._used >= self.limit:
+                return False
+            self._used += 1
+            return True
+
+    @property
+    def remaining(self) -> Optional[int]:
+        if self.limit is None:
+            return None
+        return max(0, self.limit - self._used)
+
+
+class ProviderLane:
+    """All throttling state for one provider."""
+
+    def __init__(self, limits: ProviderRateLimit):
+        self.limits = limits
+        self.bucket = TokenBucket(limits.requests_per_second, limits.burst)
+        self.in_flight = InFlightLimiter(limits.max_in_flight)
+        self.budget = DailyBudget(limits.daily_budget)
+        self.requests = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def reconfigure(self, limits: ProviderRateLimit):
+        """Applies changed limits in place; queued waiters, counters and today's usage carry over."""
+        if limits == self.limits:
+            return
+        self.limits = limits
+        self.bucket.reconfigure(limits.requests_per_second, limits.burst)
+        self.in_flight.resize(limits.max_in_flight)
+        self.budget.limit = limits.daily_budget
+
+    def record_wait(self, waited: float):
+        self.requests += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+
+class RateScheduler:
+    """
+    Process-wide scheduler shared by every JobScraperService.
+    Each provider gets its own lane per tier, so one slow API never throttles another
+    and sessions on different tiers never share, or overwrite, each other's limits.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, ProviderRateLimit]] = None, tier: str = DEFAULT_TIER):
+        self._lanes: Dict[Tuple[str, str], ProviderLane] = {}
+        self._lock = threading.Lock()
+        self.configure(limits or {}, tier)
+
+    def configure(self, limits: Dict[str, ProviderRateLimit], tier: str = DEFAULT_TIER):
+        """Creates the tier's lane for each provider on first use and updates it when its limits change."""
+        with self._lock:
+            for provider, provider_limits in limits.items():
+                lane = self._lanes.get((provider, tier))
+                if lane is None:
+                    self._lanes[(provider, tier)] = ProviderLane(provider_limits)
+                else:
+                    lane.reconfigure(provider_limits)
+
+    def _lane(self, provider: str, tier: str) -> ProviderLane:
+        with self._lock:
+            lane = self._lanes.get((provider, tier))
+            if lane is None:
+                lane = self._lanes[(provider, tier)] = ProviderLane(ProviderRateLimit())
+            return lane
+
+    @asynccontextmanager
+    async def slot(self, provider: str, tier: str = DEFAULT_TIER) -> AsyncIterator[float]:
+        """
+        Waits for a concurrency slot and a token, then yields the seconds spent queued.
+        Raises BudgetExhaustedError when the provider's daily budget is spent.
+        """
+        lane = self._lane(provider, tier)
+        started = monotonic()
+        await lane.in_flight.acquire()
+        try:
+            if not lane.budget.consume():
+                raise BudgetExhaustedError(f"Daily budget for '{provider}' is exhausted.")
+            delay = lane.bucket.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            waited = monotonic() - started
+            lane.record_wait(waited)
+            yield waited
+        finally:
+            lane.in_flight.release()
+
+    @asynccontextmanager
+    async def try_slot(self, provider: str, tier: str = DEFAULT_TIER) -> AsyncIterator[bool]:
+        """
+        Non-queuing variant of slot for optional calls such as hedged requests.
+        Yields False, without waiting or borrowing tokens, when the lane has no spare
+        concurrency, token or daily budget right now.
+        """
+        lane = self._lane(provider, tier)
+        if not lane.in_flight.try_acquire():
+            yield False
+            return
+        try:
+            yield lane.bucket.try_take() and lane.budget.consume()
+        finally:
+            lane.in_flight.release()
+
+    def wait_stats(self) -> Dict[str, dict]:
+        """Cumulative queue-wait figures per lane since process start, keyed "provider/tier" off the default tier."""
+        with self._lock:
+            lanes = dict(self._lanes)
+        return {
+            (provider if tier == DEFAULT_TIER else f"{provider}/{tier}"): {
+                "requests": lane.requests,
+                "avg_wait_s": lane.total_wait / lane.requests if lane.requests else 0.0,
+                "max_wait_s": lane.max_wait,
+                "budget_remaining": lane.budget.remaining,
+            }
+            for (provider, tier), lane in lanes.items()
+        }
+
+
+_scheduler: Optional[RateScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_rate_scheduler() -> RateScheduler:
+    """Returns the process-wide scheduler, creating it on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RateScheduler()
+        return _scheduler
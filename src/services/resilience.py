@@ -0,0 +1,166 @@
+"""Resilience: Classified retries with jittered backoff and per-provider circuit breakers."""
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from time import monotonic
+from typing import Dict, Optional
+
+import httpx
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def is_retryable_status(status_code: int) -> bool:
+    return status_code in RETRYABLE_STATUS
+
+
+def is_retryable_exception(exc: BaseException) -> bool:
+    """Timeouts and transport failures are transient; everything else is a bug or a hard refusal."""
+    return isinstance(exc, (httpx.TimeoutException, httpx.TransportError))
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Parses a Retry-After header given either as seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, capped, and bounded by Retry-After."""
+
+    def __init__(
+        self,
+        max_retries: int = 2,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        max_retry_after: float = 30.0,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None to give up."""
+        if attempt >= self.max_retries:
+            return None
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            return retry_after
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls for
+    `cooldown` seconds. Afterwards a single probe is let through (half-open);
+    its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 120.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = monotonic()
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if now - self._opened_at < self.cooldown:
+                    return False
+                self._state = HALF_OPEN
+                self._probe_started = now
+                return True
+            # Half-open: one probe at a time, but never wait forever on a lost probe.
+            if now - self._probe_started >= self.cooldown:
+                self._probe_started = now
+                return True
+            return False
+
+    def is_open(self) -> bool:
+        """Non-consuming check used to skip a provider before any task is built."""
+        with self._lock:
+            return self._state == OPEN and monotonic() - self._opened_at < self.cooldown
+
+    def record_success(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = monotonic()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            retry_in = 0.0
+            if self._state == OPEN:
+                retry_in = max(0.0, self.cooldown - (monotonic() - self._opened_at))
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "retry_in_s": round(retry_in, 1),
+            }
+
+
+class CircuitBreakerRegistry:
+    """Process-wide breakers, one per provider, so every session sees the same health."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str, failure_threshold: int = 5, cooldown: float = 120.0) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(provider)
+            if breaker is None:
+                breaker = self._breakers[provider] = CircuitBreaker(failure_threshold, cooldown)
+            else:
+                breaker.failure_threshold, breaker.cooldown = failure_threshold, cooldown
+            return breaker
+
+    def states(self) -> Dict[str, dict]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {provider: breaker.snapshot() for provider, breaker in breakers.items()}
+
+
+_registry: Optional[CircuitBreakerRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """Returns the process-wide breaker registry, creating it on first use."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = CircuitBreakerRegistry()
+        return _registry
@@ -0,0 +1,165 @@
+"""Response Cache: On-disk LRU cache of provider listing payloads."""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from time import time
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class CachedResponse:
+    payload: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+    @property
+    def age(self) -> float:
+        return time() - self.stored_at
+
+
+# Free-text query and location params; everything else (page tokens, URLs, ids) is opaque.
+TEXT_FIELDS = frozenset({
+    "q", "hl", "gl", "location", "keyword", "keywords", "locationName", "domain",
+    "location_filter", "advanced_title_filter", "description_filter",
+    "job_title_or", "job_country_code_or", "job_location_pattern_or",
+})
+
+
+def normalize_request(value: Any, text: bool = False) -> Any:
+    """
+    Canonicalises compiled query params so equivalent searches share one key. Only
+    TEXT_FIELDS are case- and whitespace-folded; opaque values are kept verbatim.
+    """
+    if isinstance(value, dict):
+        return {str(k): normalize_request(v, str(k) in TEXT_FIELDS) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [normalize_request(v, text) for v in value]
+    if isinstance(value, str) and text:
+        return " ".join(value.lower().split())
+    return value
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache shared by every session in the process (and across processes).
+    Entries are evicted least-recently-used once the payload total passes max_bytes.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)"
+        )
+
+    @staticmethod
+    def make_key(provider: str, method: str, url: str, request: Dict[str, Any]) -> str:
+        """Builds the cache key. Credentials must be stripped from `request` by the caller."""
+        canonical = json.dumps(
+            [provider, method.upper(), url, normalize_request(request)],
+            sort_keys=True,
+            default=str,
+        )
+        return f"{provider}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, etag, last_modified, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (time(), key)
+            )
+        payload, etag, last_modified, stored_at = row
+        return CachedResponse(json.loads(payload), etag, last_modified, stored_at)
+
+    def put(
+        self,
+        key: str,
+        provider: str,
+        payload: Any,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        blob = json.dumps(payload).encode("utf-8")
+        if len(blob) > self.max_bytes:
+            return
+        now = time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, blob, etag, last_modified, now, now, len(blob)),
+            )
+            self._evict()
+
+    def touch(self, key: str):
+        """Marks a stale entry fresh again after a 304 revalidation."""
+        now = time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, key),
+            )
+
+    def _evict(self):
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(path: str, max_bytes: int) -> ResponseCache:
+    """Returns the process-wide cache for a path so all sessions share one connection."""
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = ResponseCache(path, max_bytes)
+        cache.max_bytes = max_bytes
+        return cache
@@ -0,0 +1,87 @@
+"""Saved Searches: Per profile/role/location watermarks for incremental scraping."""
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List
+
+from src.schema import SavedSearch, LocationData
+
+
+class SavedSearchStore:
+    """
+    SQLite-backed record of each saved search and the start time of its last
+    successful run. The record is stored as the SavedSearch JSON so new fields
+    need no migration.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS saved_searches (
+                search_id TEXT PRIMARY KEY,
+                profile_id TEXT NOT NULL,
+                record TEXT NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_saved_searches_profile ON saved_searches (profile_id)"
+        )
+
+    def get_or_create(self, profile_id: str, role: str, location: LocationData) -> SavedSearch:
+        """Returns the stored search for this profile/role/location, or a new one with no watermark."""
+        search = SavedSearch(profile_id=profile_id, role=role or "", location=location)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM saved_searches WHERE search_id = ?", (search.search_id,)
+            ).fetchone()
+        if row is None:
+            return search
+        return SavedSearch.model_validate_json(row[0])
+
+    def mark_run(self, search: SavedSearch, started_at: datetime) -> SavedSearch:
+        """Advances the watermark to the start of a run that completed for every provider."""
+        updated = search.model_copy(update={"last_run_at": started_at})
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO saved_searches VALUES (?, ?, ?)",
+                (
+                    updated.search_id,
+                    updated.profile_id,
+                    updated.model_dump_json(exclude={"search_id"}),
+                ),
+            )
+        return updated
+
+    def list_for_profile(self, profile_id: str) -> List[SavedSearch]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record FROM saved_searches WHERE profile_id = ?", (profile_id,)
+            ).fetchall()
+        return [SavedSearch.model_validate_json(record) for (record,) in rows]
+
+    def delete_for_profile(self, profile_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM saved_searches WHERE profile_id = ?", (profile_id,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_stores: Dict[str, SavedSearchStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_saved_search_store(path: str) -> SavedSearchStore:
+    """Returns the process-wide store for a path so all sessions share one connection."""
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = SavedSearchStore(path)
+        return store
+
@@ -0,0 +1,157 @@
+"""Scraper Metrics: Per-run, per-provider counters and their on-disk history."""
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import httpx
+
+from src.schema import ProviderMetrics, ScraperRunMetrics
+
+LATENCY_BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def latency_bucket(seconds: float) -> str:
+    ms = seconds * 1000
+    for bound in LATENCY_BUCKETS_MS:
+        if ms <= bound:
+            return str(bound)
+    return "+Inf"
+
+
+def error_class(failure) -> str:
+    """Groups failures by exception class, or by status for HTTP error responses."""
+    if isinstance(failure, httpx.Response):
+        return f"HTTP {failure.status_code}"
+    if isinstance(failure, httpx.HTTPStatusError):
+        return f"HTTP {failure.response.status_code}"
+    return type(failure).__name__
+
+
+class ScraperMetricsRecorder:
+    """Accumulates one run's metrics. Only ever touched from the run's own event loop."""
+
+    def __init__(self):
+        self.metrics = ScraperRunMetrics(
+            run_id=uuid.uuid4().hex, started_at=datetime.now(timezone.utc)
+        )
+
+    def provider(self, provider: str) -> ProviderMetrics:
+        return self.metrics.providers.setdefault(provider, ProviderMetrics())
+
+    def observe_call(self, provider: str, seconds: float, response: Optional[httpx.Response] = None):
+        stats = self.provider(provider)
+        stats.calls += 1
+        stats.latency_total_s += seconds
+        stats.latency_max_s = max(stats.latency_max_s, seconds)
+        bucket = latency_bucket(seconds)
+        stats.latency_histogram[bucket] = stats.latency_histogram.get(bucket, 0) + 1
+        if response is not None:
+            stats.bytes_downloaded += len(response.content)
+            if response.status_code >= 400:
+                self.observe_error(provider, response)
+
+    def observe_error(self, provider: str, failure):
+        errors = self.provider(provider).errors
+        name = error_class(failure)
+        errors[name] = errors.get(name, 0) + 1
+
+    def observe_listings(self, provider: str, returned: int, after_dedupe: int):
+        stats = self.provider(provider)
+        stats.listings_returned += returned
+        stats.listings_after_dedupe += after_dedupe
+
+    def observe_detail_fetch(self, provider: str):
+        self.provider(provider).detail_fetches += 1
+
+    def observe_hedge(self, provider: str, won: bool):
+        stats = self.provider(provider)
+        stats.hedges_fired += 1
+        stats.hedges_won += won
+
+    def observe_cache_hit(self, provider: str):
+        self.provider(provider).cache_hits += 1
+
+    def finish(self) -> ScraperRunMetrics:
+        self.metrics.finished_at = datetime.now(timezone.utc)
+        return self.metrics
+
+
+class ScraperMetricsStore:
+    """SQLite history of run metrics, one row per run and provider, for trend analysis."""
+
+    def __init__(self, path: str, retention_days: int = 90):
+        self.path = path
+        self.retention_days = retention_days
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS provider_runs (
+                run_id TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                started_at TEXT NOT NULL,
+                finished_at TEXT,
+                metrics TEXT NOT NULL,
+                PRIMARY KEY (run_id, provider)
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_provider_runs_started ON provider_runs (provider, started_at)"
+        )
+
+    def save(self, run: ScraperRunMetrics):
+        rows = [
+            (
+                run.run_id,
+                provider,
+                run.started_at.isoformat(),
+                run.finished_at.isoformat() if run.finished_at else None,
+                stats.model_dump_json(exclude={"latency_mean_s"}),
+            )
+            for provider, stats in run.providers.items()
+        ]
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=self.retention_days)).isoformat()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO provider_runs VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self._conn.execute("DELETE FROM provider_runs WHERE started_at < ?", (cutoff,))
+
+    def history(self, provider: str, limit: int = 50) -> List[Dict]:
+        """Most recent runs for one provider, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT run_id, started_at, metrics FROM provider_runs "
+                "WHERE provider = ? ORDER BY started_at DESC LIMIT ?",
+                (provider, limit),
+            ).fetchall()
+        return [
+            {
+                "run_id": run_id,
+                "started_at": datetime.fromisoformat(started_at),
+                "metrics": ProviderMetrics.model_validate_json(metrics),
+            }
+            for run_id, started_at, metrics in rows
+        ]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_stores: Dict[str, ScraperMetricsStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_metrics_store(path: str, retention_days: int = 90) -> ScraperMetricsStore:
+    """Returns the process-wide metrics store for a path so all sessions share one connection."""
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = ScraperMetricsStore(path, retention_days)
+        store.retention_days = retention_days
+        return store
@@ -0,0 +1,82 @@
+"""Single Flight: Coalesces identical concurrent provider calls into one in-flight request."""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class SingleFlight:
+    """
+    Process-wide registry of in-flight calls keyed on the compiled provider query.
+    The first caller for a key runs the call; everyone arriving while it is in flight
+    awaits the same result. Futures are thread-safe so sessions on separate event
+    loops (one per Streamlit run) can share them.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            with self._lock:
+                shared = self._inflight.get(key)
+                if shared is None:
+                    shared = self._inflight[key] = Future()
+                    self.leaders += 1
+                    leader = True
+                else:
+                    self.coalesced += 1
+                    leader = False
+
+            if leader:
+                return await self._lead(key, shared, call)
+
+            try:
+                return await asyncio.shield(asyncio.wrap_future(shared))
+            except asyncio.CancelledError:
+                if not shared.cancelled():
+                    raise
+                # The leader was cancelled rather than failing; take over the call.
+
+    async def _lead(self, key: str, shared: Future, call: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            self._finish(key)
+            shared.cancel()
+            raise
+        except BaseException as exc:
+            self._finish(key)
+            shared.set_exception(exc)
+            raise
+        self._finish(key)
+        shared.set_result(result)
+        return result
+
+    def _finish(self, key: str):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._inflight),
+            }
+
+
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Returns the process-wide single-flight registry, creating it on first use."""
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight()
+        return _single_flight
@@ -1,8 +1,12 @@
 """Storage Service: Handles all vector database persistence and retrieval."""
-from time import sleep
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from datetime import datetime, timezone, timedelta
 from json import loads, dumps, JSONDecodeError
-from typing import List, Optional, Any
+from itertools import islice
+from typing import List, Optional, Any, Dict, Iterable, Iterator
 import streamlit as st
 
 from langchain_pinecone import PineconeVectorStore
@@ -11,35 +15,207 @@ from pinecone import Pinecone
 from src.schema import (
     CandidateProfile,
     AnalysedJobMatchWithMeta,
+    LibrarySyncSettings,
     RawJobMatch,
     generate_safe_id
 )
-from src.utils.text_processing import clean_text_for_embedding
+from src.services.document_store import DocumentStore
+from src.services.resilience import RetryPolicy
+from src.services.upsert_pipeline import AdaptiveWindow, UpsertItem, plan_batches, run_upserts
+from src.services.vector_backends import PineconeBackend, ScanPage, VectorBackend, VectorRecord
+from src.utils.text_processing import clean_text_for_embedding, description_hash
 from src.utils.func import log_message
 
 
+def _offloaded(method):
+    """Async counterpart of a blocking StorageService method, run on the service's executor."""
+
+    async def run(self, *args, **kwargs):
+        return await self._offload(method, self, *args, **kwargs)
+
+    run.__name__ = f"{method.__name__}_async"
+    run.__qualname__ = f"StorageService.{run.__name__}"
+    run.__doc__ = f"Async {method.__name__}, run on the storage executor."
+    return run
+
+
 class StorageService:
-    def __init__(self, index_name: str, embeddings: Any):
+    JOB_PAYLOAD_FIELDS = (
+        "description", "responsibilities", "benefits", "qualifications", "alternate_urls", "salary_string"
+    )
+    ANALYSIS_PAYLOAD_FIELDS = ("analysis_json",)
+
+    def __init__(
+        self,
+        index_name: str,
+        embeddings: Any,
+        client: Optional[Pinecone] = None,
+        backend: Optional[VectorBackend] = None,
+        documents: Optional[DocumentStore] = None,
+        max_concurrency: int = 8,
+    ):
         """
-        Initializes the service.
+        Initializes the service. Without a backend it connects to Pinecone; store and
+        index handles are created on first use and reused for the life of the service,
+        which Streamlit shares across sessions. With a document store, job and analysis
+        payloads live there and vector metadata keeps only the filterable fields.
+        The *_async methods run on one executor of `max_concurrency` threads, shared by
+        every session, so storage I/O overlaps with scraping and LLM calls.
         """
         self.index_name = index_name
         self.embeddings = embeddings
+        self.documents = documents
+        self.max_concurrency = max_concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
         self.NS_USER_DATA = "user_job_analyses"
         self.NS_GLOBAL_JOBS = "global_raw_jobs"
         self.NS_ANALYSES = "user_job_analyses"
-        self.pc = Pinecone(api_key=st.secrets["PINECONE_API_KEY"])
-        try: 
-            self.pc.list_indexes()
-        except Exception as e:
-            raise ConnectionError(f"Pinecone authentication error: {str(e)}")
+        self._handles_lock = threading.RLock()
+        self._index = None
+        self._stores: Dict[str, PineconeVectorStore] = {}
+        self._indexes: Dict[str, Any] = {}
+        sync_defaults = LibrarySyncSettings()
+        self._upsert_window = AdaptiveWindow(sync_defaults.initial_concurrency, sync_defaults.max_concurrency)
+        self.pc = None
+        if backend is None:
+            self.pc = client or Pinecone(api_key=st.secrets["PINECONE_API_KEY"])
+            try: 
+                self.pc.list_indexes()
+            except Exception as e:
+                raise ConnectionError(f"Pinecone authentication error: {str(e)}")
+            backend = PineconeBackend(
+                get_store=lambda namespace: self._get_store(namespace),
+                get_index=lambda namespace: self._get_index(namespace),
+                index_handle=lambda: self._index_handle(),
+                close=self._close_handles,
+            )
+        self.backend = backend
+
+    def _index_handle(self):
+        """The one Pinecone Index handle every namespace's store shares."""
+        with self._handles_lock:
+            if self._index is None:
+                self._index = self.pc.Index(self.index_name)
+            return self._index
 
     def _get_store(self, namespace: str) -> PineconeVectorStore:
-        """Internal helper to create a LangChain Pinecone store instance."""
-        return PineconeVectorStore(
-            index_name=self.index_name, embedding=self.embeddings, namespace=namespace
+        """Internal helper returning the namespace's LangChain Pinecone store, built once."""
+        with self._handles_lock:
+            store = self._stores.get(namespace)
+            if store is None:
+                store = self._stores[namespace] = PineconeVectorStore(
+                    index=self._index_handle(), embedding=self.embeddings, namespace=namespace
+                )
+            return store
+
+    def _get_index(self, namespace: str):
+        """Raw index handle for a namespace's fetch/query/list calls, resolved once per namespace."""
+        with self._handles_lock:
+            index = self._indexes.get(namespace)
+            if index is None:
+                index = self._indexes[namespace] = self._get_store(namespace).get_pinecone_index(self.index_name)
+            return index
+
+    def close(self):
+        with self._handles_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.backend.close()
+
+    async def _offload(self, fn, *args, **kwargs):
+        """Runs a blocking storage call on the bounded executor without stalling the event loop."""
+        with self._handles_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_concurrency, thread_name_prefix="storage")
+            executor = self._executor
+        return await asyncio.get_running_loop().run_in_executor(executor, partial(fn, *args, **kwargs))
+
+    def _close_handles(self):
+        """Drops every cached Pinecone handle and closes the Index connection pools."""
+        with self._handles_lock:
+            handles = {id(index): index for index in [self._index, *self._indexes.values()] if index is not None}
+            self._index = None
+            self._stores.clear()
+            self._indexes.clear()
+        for index in handles.values():
+            close = getattr(index, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    print(f"Error closing Pinecone index: {e}")
+
+    def iter_records(
+        self, namespace: str, filter: Optional[dict] = None, page_size: int = 100, prefix: Optional[str] = None
+    ) -> Iterator[VectorRecord]:
+        """
+        Streams every record in a namespace matching `filter`, with no top_k cap.
+        Only ids starting with `prefix` are fetched, so pass one for per-user listings.
+        """
+        return self.backend.iter_records(namespace, filter=filter, page_size=page_size, prefix=prefix)
+
+    def page_records(
+        self,
+        namespace: str,
+        filter: Optional[dict] = None,
+        cursor: Optional[str] = None,
+        page_size: int = 100,
+        prefix: Optional[str] = None,
+    ) -> ScanPage:
+        """One page of iter_records; pass the returned cursor back to continue."""
+        return self.backend.scan(namespace, filter=filter, limit=page_size, cursor=cursor, prefix=prefix)
+
+    @staticmethod
+    def _profile_prefix(user_id: str) -> str:
+        return f"profile_{user_id}_"
+
+    @staticmethod
+    def _analysis_id(profile_id: str, job_url: str) -> str:
+        """Analysis ids start with their profile id, which starts with the user id, so they list by prefix."""
+        return f"analysis_{profile_id}_{generate_safe_id(f'{profile_id}_{job_url}')}"
+
+    def _write_records(
+        self, namespace: str, texts: List[str], metadatas: List[dict], ids: List[str], payload_fields: tuple
+    ):
+        """
+        Upserts records. With a document store, `payload_fields` are written there
+        first, so a vector never exists without its payload, and left out of metadata.
+        """
+        if self.documents is None:
+            self.backend.upsert_texts(namespace, texts=texts, metadatas=metadatas, ids=ids)
+            return
+        self.documents.put_many(
+            namespace,
+            {uid: {f: meta[f] for f in payload_fields if f in meta} for uid, meta in zip(ids, metadatas)},
+        )
+        self.backend.upsert_texts(
+            namespace,
+            texts=texts,
+            metadatas=[{k: v for k, v in meta.items() if k not in payload_fields} for meta in metadatas],
+            ids=ids,
+            store_text=False,
         )
 
+    def _hydrate(
+        self, namespace: str, records: Iterable[VectorRecord], fields: Optional[List[str]] = None, chunk_size: int = 100
+    ) -> Iterator[VectorRecord]:
+        """Merges each record's stored payload, or only `fields` of it, back into its metadata."""
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                return
+            if self.documents is not None:
+                payloads = self.documents.get_many(namespace, [record.id for record in chunk], fields)
+                for record in chunk:
+                    record.metadata.update(payloads.get(record.id, {}))
+            yield from chunk
+
+    def _fetch(self, ids: List[str], namespace: str, fields: Optional[List[str]] = None) -> Dict[str, VectorRecord]:
+        records = self.backend.fetch(ids, namespace)
+        return {record.id: record for record in self._hydrate(namespace, records.values(), fields)}
+
     def save_candidate_profile(self, user_id: str, profile: CandidateProfile) -> str:
         """Saves a new CV profile with the required document_type tag."""
         profile_id = (
@@ -55,8 +231,8 @@ class StorageService:
             if key in metadata and isinstance(metadata[key], list):
                 metadata[key] = dumps(metadata[key])
 
-        store = self._get_store(self.NS_USER_DATA)
-        store.add_texts(
+        self.backend.upsert_texts(
+            self.NS_USER_DATA,
             texts=[f"Profile: {profile.full_name}. Summary: {profile.summary}"],
             metadatas=[metadata],
             ids=[profile_id],
@@ -65,14 +241,12 @@ class StorageService:
 
     def fetch_candidate_profile(self, profile_id: str) -> CandidateProfile:
         """Retrieves a specific profile by its ID."""
-        store = self._get_store(self.NS_USER_DATA)
-        index = store.get_pinecone_index(self.index_name)
-        response = index.fetch(ids=[profile_id], namespace=self.NS_USER_DATA)
+        records = self.backend.fetch([profile_id], self.NS_USER_DATA)
 
-        if not response or profile_id not in response.vectors:
+        if profile_id not in records:
             raise ValueError(f"Profile {profile_id} not found.")
 
-        meta = response.vectors[profile_id].metadata
+        meta = records[profile_id].metadata
 
         for field in ["job_titles", "key_skills", "industries"]:
             if isinstance(meta.get(field), str):
@@ -85,24 +259,19 @@ class StorageService:
     def find_all_candidate_profiles(self, user_id: str) -> list[dict]:
         """Queries for all profiles belonging to a user using the SOP tag."""
         try:
-            store = self._get_store(self.NS_USER_DATA)
-            index = store.get_pinecone_index(self.index_name)
-
-            results = index.query(
-                vector=[0.0] * 3072,
+            results = self.iter_records(
+                self.NS_USER_DATA,
                 filter={
                     "user_id": {"$eq": user_id},
                     "document_type": {"$eq": "candidate_profile"},
                 },
-                namespace=self.NS_USER_DATA,
-                top_k=100,
-                include_metadata=True,
+                prefix=self._profile_prefix(user_id),
             )
 
             profiles = []
-            for match in results.get("matches", []):
-                meta = match.get("metadata", {})
-                meta["profile_id"] = match.get("id")
+            for match in results:
+                meta = match.metadata
+                meta["profile_id"] = match.id
 
                 for field in ["job_titles", "key_skills", "industries"]:
                     if isinstance(meta.get(field), str):
@@ -119,19 +288,16 @@ class StorageService:
 
     def delete_profile(self, profile_id: str):
         """Deletes a profile from the vector store."""
-        store = self._get_store(self.NS_USER_DATA)
-        index = store.get_pinecone_index(self.index_name)
-        index.delete(ids=[profile_id], namespace=self.NS_USER_DATA)
+        self.backend.delete(self.NS_USER_DATA, ids=[profile_id])
 
     def save_job_analyses(
         self, jobs: List[AnalysedJobMatchWithMeta], user_id: str, profile_id: str
     ):
         """Saves processed AI job analyses with appropriate tagging."""
-        store = self._get_store(self.NS_USER_DATA)
         texts, metadatas, ids = [], [], []
 
         for a in jobs:
-            ids.append(generate_safe_id(f"{profile_id}_{a.job_url}"))
+            ids.append(self._analysis_id(profile_id, a.job_url))
             texts.append(clean_text_for_embedding(a.top_applicant_reasoning))
             metadatas.append(
                 {
@@ -144,7 +310,7 @@ class StorageService:
                 }
             )
 
-        store.add_texts(texts=texts, metadatas=metadatas, ids=ids)
+        self._write_records(self.NS_USER_DATA, texts, metadatas, ids, self.ANALYSIS_PAYLOAD_FIELDS)
 
     def check_analysis_cache(self, jobs: Any, profile_id: str):
         """Checks if a job has already been analyzed for a specific profile."""
@@ -155,99 +321,174 @@ class StorageService:
         else:
             job_list = list(jobs) if isinstance(jobs, (tuple, set)) else []
 
-        store = self._get_store(self.NS_USER_DATA)
-        index = store.get_pinecone_index(self.index_name)
         hits, misses = [], []
 
         cache_map = {
-            generate_safe_id(f"{profile_id}_{j.job_url}"): j 
+            self._analysis_id(profile_id, j.job_url): j 
             for j in job_list if hasattr(j, 'job_url')
         }
         
         if not cache_map:
             return [], job_list
 
-        response = index.fetch(ids=list(cache_map.keys()), namespace=self.NS_USER_DATA)
-        vectors = response.vectors if response else {}
+        vectors = self._fetch(list(cache_map.keys()), self.NS_USER_DATA)
         
         for cid, job in cache_map.items():
-            if cid in vectors:
-                meta = vectors[cid].metadata
-                hits.append(AnalysedJobMatchWithMeta(**loads(meta["analysis_json"])))
+            record = vectors.get(cid)
+            analysis_json = record.metadata.get("analysis_json") if record else None
+            if analysis_json:
+                hits.append(AnalysedJobMatchWithMeta(**loads(analysis_json)))
             else:
                 misses.append(job)
                 
         return hits, misses
 
     def sync_global_library(
-    self, raw_results: Any, ttl_days: int = 7) -> List[Any]:
-        """Syncs scraped jobs to a global library to avoid redundant processing."""
+        self,
+        raw_results: Any,
+        ttl_days: int = 7,
+        settings: Optional[LibrarySyncSettings] = None,
+        rewrite: bool = False,
+    ) -> List[Any]:
+        """
+        Blocking counterpart of sync_global_library_async, callable from any thread,
+        including one already running an event loop: the sync gets a loop of its own
+        on a dedicated worker thread.
+        """
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="storage-sync") as bridge:
+            return bridge.submit(
+                asyncio.run,
+                self.sync_global_library_async(raw_results, ttl_days=ttl_days, settings=settings, rewrite=rewrite),
+            ).result()
+
+    async def sync_global_library_async(
+        self,
+        raw_results: Any,
+        ttl_days: int = 7,
+        settings: Optional[LibrarySyncSettings] = None,
+        rewrite: bool = False,
+    ) -> List[Any]:
+        """
+        Syncs scraped jobs to a global library to avoid redundant processing.
+        New and changed jobs are packed into byte- and token-sized batches and written
+        concurrently under the service's AIMD window. Expired jobs whose description
+        is unchanged only get their timestamps refreshed. With `rewrite`, every job is
+        written in full, e.g. after a merge added links to one already synced.
+        Nothing blocks the event loop.
+        """
         if not raw_results or not hasattr(raw_results, "jobs") or not raw_results.jobs:
             return []
+        settings = settings or LibrarySyncSettings()
 
-        store = self._get_store(self.NS_GLOBAL_JOBS)
-        index = store.get_pinecone_index(self.index_name)
-        final_jobs, to_upsert = [], []
+        final_jobs, to_upsert, to_refresh = await self._offload(
+            self._plan_library_sync, raw_results.jobs, ttl_days, rewrite
+        )
 
-        job_map = {generate_safe_id(j.job_url): j for j in raw_results.jobs if getattr(j, "job_url", None)}
+        if to_upsert or to_refresh:
+            batches = plan_batches(to_upsert, settings)
+            refresh_batches = [
+                to_refresh[i : i + settings.refresh_batch_items]
+                for i in range(0, len(to_refresh), settings.refresh_batch_items)
+            ]
+            self._upsert_window.configure(settings.max_concurrency)
+            throttles = self._upsert_window.throttles
+            policy = RetryPolicy(
+                max_retries=settings.max_retries,
+                base_delay=settings.retry_base_delay,
+                max_delay=settings.retry_max_delay,
+            )
+            log_message(
+                f"Upserting {len(to_upsert)} jobs in {len(batches)} batches and refreshing "
+                f"{len(to_refresh)} unchanged, {self._upsert_window.size} at a time"
+            )
+            await asyncio.gather(
+                run_upserts(batches, self._upsert_library_batch, self._upsert_window, policy),
+                run_upserts(refresh_batches, self._refresh_library_batch, self._upsert_window, policy),
+            )
+            log_message(
+                f"Library sync done: {self._upsert_window.throttles - throttles} throttled attempts, "
+                f"window now {self._upsert_window.size}"
+            )
+        return [
+            RawJobMatch(**j) if isinstance(j, dict) else j 
+            for j in final_jobs
+        ]
+
+    def _plan_library_sync(self, jobs: List[Any], ttl_days: int, rewrite: bool = False):
+        """
+        Splits jobs into those the library holds fresh, those to (re)embed, and expired
+        ones whose stored description hash still matches, which only need new timestamps.
+        A record whose payload is missing, e.g. from another node's document store, is
+        always rewritten in full.
+        """
+        final_jobs, to_upsert, to_refresh = [], [], []
+
+        job_map = {generate_safe_id(j.job_url): j for j in jobs if getattr(j, "job_url", None)}
         if not job_map:
-            return []
-        
-        ids_to_fetch = list(job_map.keys())
-        response = index.fetch(ids=ids_to_fetch, namespace=self.NS_GLOBAL_JOBS)
-        vectors = response.vectors if response else {}
+            return final_jobs, to_upsert, to_refresh
+
+        vectors = self._fetch(list(job_map.keys()), self.NS_GLOBAL_JOBS)
 
         for uid, job in job_map.items():
             existing = vectors.get(uid)
-            if not existing or self._is_expired(existing.metadata, ttl_days):
-                meta = self._prepare_job_meta(job)
-                to_upsert.append(
-                    {
-                        "id": uid,
-                        "text": clean_text_for_embedding(job.description),
-                        "metadata": meta,
-                    }
-                )
+            complete = existing is not None and self._has_job_payload(existing.metadata)
+            if rewrite or not complete or self._is_expired(existing.metadata, ttl_days):
+                text = clean_text_for_embedding(job.description)
+                if complete and not rewrite and existing.metadata.get("description_hash") == description_hash(text):
+                    to_refresh.append(UpsertItem(id=uid, text=text, metadata=self._sync_timestamps()))
+                else:
+                    to_upsert.append(UpsertItem(id=uid, text=text, metadata=self._prepare_job_meta(job, text)))
                 final_jobs.append(job)
             else:
                 try:
                     final_jobs.append(self._parse_cached_job(existing.metadata))
                 except:
                     final_jobs.append(job)
+        return final_jobs, to_upsert, to_refresh
+
+    def _upsert_library_batch(self, batch: List[UpsertItem]):
+        self._write_records(
+            self.NS_GLOBAL_JOBS,
+            texts=[item.text for item in batch],
+            metadatas=[{**item.metadata, "job_url": item.metadata.get("job_url")} for item in batch],
+            ids=[item.id for item in batch],
+            payload_fields=self.JOB_PAYLOAD_FIELDS,
+        )
 
-        if to_upsert:
-            batch_size = 10
-            log_message(f"Batching {len(to_upsert)} in {(len(to_upsert)//batch_size)} chunks")
-            
-            for i in range(0, len(to_upsert), batch_size):
-                batch = to_upsert[i : i + batch_size]
-                
-                texts = [x["text"] for x in batch]
-                ids = [x["id"] for x in batch]
-                metadatas = [{**x["metadata"], "job_url": x["metadata"].get("job_url")} for x in batch]
+    def _refresh_library_batch(self, batch: List[UpsertItem]):
+        self.backend.update_metadata(self.NS_GLOBAL_JOBS, {item.id: item.metadata for item in batch})
 
-                try:
-                    store.add_texts(
-                        texts=texts,
-                        ids=ids,
-                        metadatas=metadatas,
-                    )
-                    if i + batch_size < len(to_upsert):
-                        sleep(1)
-                    log_message(f"Batch {i+1} success!")
-                        
-                except Exception as e:
-                    if "429" in str(e):
-                        log_message("Burst limit hit. Waiting 10s to retry...")
-                        sleep(10)
-                        store.add_texts(texts=texts, ids=ids, metadatas=metadatas)
-                    else:
-                        log_message(f"Batch {i +1} failed: {e}")
-                        raise e
-        return [
-            RawJobMatch(**j) if isinstance(j, dict) else j 
-            for j in final_jobs
-        ]
+    def find_fresh_global_jobs(
+        self, job_urls: List[str], ttl_days: int = 7
+    ) -> Dict[str, RawJobMatch]:
+        """
+        Looks listing URLs up in the global library before any detail fetch.
+        Returns the cached, unexpired jobs keyed by their URL; misses are omitted.
+        """
+        id_map = {generate_safe_id(url): url for url in job_urls if url}
+        if not id_map:
+            return {}
+
+        vectors = self._fetch(list(id_map.keys()), self.NS_GLOBAL_JOBS)
+
+        fresh = {}
+        for uid, vector in vectors.items():
+            if (
+                uid not in id_map
+                or self._is_expired(vector.metadata, ttl_days)
+                or not self._has_job_payload(vector.metadata)
+            ):
+                continue
+            try:
+                fresh[id_map[uid]] = self._parse_cached_job(dict(vector.metadata))
+            except Exception as e:
+                log_message(f"Ignoring unreadable cached job {uid}: {e}")
+        return fresh
+
+    @staticmethod
+    def _has_job_payload(meta: dict) -> bool:
+        """False when the description was moved to a document store that does not hold it."""
+        return "description" in meta
 
     def _is_expired(self, meta: dict, ttl: int) -> bool:
         last = meta.get("last_synced_at")
@@ -257,11 +498,10 @@ class StorageService:
             datetime.fromisoformat(last) + timedelta(days=ttl)
         )
 
-    def _prepare_job_meta(self, job: RawJobMatch) -> dict:
+    def _prepare_job_meta(self, job: RawJobMatch, text: Optional[str] = None) -> dict:
         d = job.model_dump(mode='json') 
         
         d["id"] = job.id
-        d["analysed_at"] = int(datetime.now(timezone.utc).timestamp())
         d["job_url"] = str(job.job_url)
         
         for k, v in d.items():
@@ -270,11 +510,19 @@ class StorageService:
             if isinstance(v, (list, dict)):
                 d[k] = dumps(v)
         
-        d["last_synced_at"] = datetime.now(timezone.utc).isoformat()
+        d["description_hash"] = description_hash(
+            text if text is not None else clean_text_for_embedding(job.description)
+        )
+        d.update(self._sync_timestamps())
         return d
 
+    @staticmethod
+    def _sync_timestamps() -> dict:
+        now = datetime.now(timezone.utc)
+        return {"analysed_at": int(now.timestamp()), "last_synced_at": now.isoformat()}
+
     def _parse_cached_job(self, metadata: dict) -> RawJobMatch:
-        list_fields = ["qualifications", "key_skills", "attributes", "responsibilities", "benefits"]
+        list_fields = ["qualifications", "key_skills", "attributes", "responsibilities", "benefits", "alternate_urls"]
         for field in list_fields:
             value = metadata.get(field)
             if isinstance(value, str):
@@ -290,29 +538,29 @@ class StorageService:
     ) -> List[AnalysedJobMatchWithMeta]:
         """
         SOP: Fetches all analysed job results for a specific profile ID.
-        Uses the 3072-dimension dummy vector and filters by document_type.
+        Ranks them by similarity to the profile summary and filters by document_type.
         """
         try:
             summary = profile.get("summary")
             profile_id = profile.get("profile_id")
             search_vector = self.embeddings.embed_query(summary)
 
-            store = self._get_store(self.NS_USER_DATA)
-            index = store.get_pinecone_index(self.index_name)
-
-            results = index.query(
-                vector=search_vector,
-                filter={
-                    "profile_id": {"$eq": profile_id},
-                    "document_type": {"$eq": "job_analysis"}
-                },
-                namespace=self.NS_USER_DATA,
-                top_k=50,
-                include_metadata=True,
+            results = self._hydrate(
+                self.NS_USER_DATA,
+                self.backend.query(
+                    self.NS_USER_DATA,
+                    vector=search_vector,
+                    filter={
+                        "profile_id": {"$eq": profile_id},
+                        "document_type": {"$eq": "job_analysis"}
+                    },
+                    top_k=50,
+                ),
+                list(self.ANALYSIS_PAYLOAD_FIELDS),
             )
             matches = []
-            for m in results.get("matches", []):
-                meta = m.get("metadata", {})
+            for m in results:
+                meta = m.metadata
                 analysis_json = meta.get("analysis_json")
 
                 if analysis_json:
@@ -333,9 +581,7 @@ class StorageService:
         SOP: Deletes a specific profile vector from the user data namespace.
         """
         try:
-            store = self._get_store(self.NS_USER_DATA)
-            index = store.get_pinecone_index(self.index_name)
-            index.delete(ids=[profile_id], namespace=self.NS_USER_DATA)
+            self.backend.delete(self.NS_USER_DATA, ids=[profile_id])
             return True
         except Exception as e:
             print(f"Error deleting profile {profile_id}: {e}")
@@ -345,25 +591,23 @@ class StorageService:
         """
         SOP: Fetches every job analysis vector belonging to a user ID.
         Ignores profile_id to give a 'Global' view of the user's market matches.
+        Analyses are listed by the user's id prefix; ones saved under the older,
+        unprefixed ids only appear once migrate_legacy_analysis_ids has re-keyed them.
         """
         try:
-            store = self._get_store(self.NS_USER_DATA)
-            index = store.get_pinecone_index(self.index_name)
-            results = index.query(
-                vector=[0.0] * 3072,
-                filter={
-                    "user_id": {"$eq": user_id},
-                    "document_type": {"$eq": "job_analysis"},
-                },
-                namespace=self.NS_USER_DATA,
-                top_k=100,
-                include_metadata=True,
+            user_filter = {
+                "user_id": {"$eq": user_id},
+                "document_type": {"$eq": "job_analysis"},
+            }
+            records = self.iter_records(
+                self.NS_USER_DATA, filter=user_filter, prefix=f"analysis_{self._profile_prefix(user_id)}"
             )
+            results = self._hydrate(self.NS_USER_DATA, records, list(self.ANALYSIS_PAYLOAD_FIELDS))
 
             matches = []
             seen_urls = set()
-            for m in results.get("matches", []):
-                meta = m.get("metadata", {})
+            for m in results:
+                meta = m.metadata
                 analysis_json = meta.get("analysis_json")
                 if analysis_json:
                     try:
@@ -387,24 +631,18 @@ class StorageService:
         try:
             job_id = generate_safe_id(job_url)
             
-            store = self._get_store(self.NS_GLOBAL_JOBS)
-            index = store.get_pinecone_index(self.index_name)
+            records = self._fetch([job_id], self.NS_GLOBAL_JOBS)
             
-            response = index.fetch(ids=[job_id], namespace=self.NS_GLOBAL_JOBS)
-            
-            if response and job_id in response.vectors:
-                return self._parse_cached_job(response.vectors[job_id].metadata)
-
-            results = index.query(
-                vector=[0.0] * 3072,
-                filter={"job_url": {"$eq": job_url}},
-                namespace=self.NS_GLOBAL_JOBS,
-                top_k=1,
-                include_metadata=True,
-            )
+            if job_id in records:
+                return self._parse_cached_job(records[job_id].metadata)
 
-            if getattr(results, "matches"):
-                return self._parse_cached_job(results["matches"][0]["metadata"])
+            results = list(self._hydrate(
+                self.NS_GLOBAL_JOBS,
+                self.backend.query(self.NS_GLOBAL_JOBS, filter={"job_url": {"$eq": job_url}}, top_k=1),
+            ))
+
+            if results:
+                return self._parse_cached_job(results[0].metadata)
             
             return None
 
@@ -412,23 +650,16 @@ class StorageService:
             st.error(f"Error fetching raw job: {e}")
             return None
 
-    def get_all_global_jobs(self, limit: int = 100) -> List[RawJobMatch]:
-        """Retrieves raw job data using the hashed ID (O(1) lookup)."""
+    def get_all_global_jobs(self, limit: Optional[int] = 100) -> List[RawJobMatch]:
+        """Enumerates the global library in id order; `limit=None` returns every job."""
         try:
-            store = self._get_store(self.NS_GLOBAL_JOBS)
-            index = store.get_pinecone_index(self.index_name)
-            results = index.query(
-                vector=[0.0] * 3072,
-                top_k=limit,
-                namespace=self.NS_GLOBAL_JOBS,
-                include_metadata=True,
-            )
+            results = islice(self._hydrate(self.NS_GLOBAL_JOBS, self.iter_records(self.NS_GLOBAL_JOBS)), limit)
 
             jobs = []
-            for match in results.get("matches", []):
-                meta = match.get("metadata", {})
+            for match in results:
+                meta = match.metadata
                 
-                list_fields = ["benefits", "responsibilities", "qualifications", "key_skills", "attributes"]
+                list_fields = ["benefits", "responsibilities", "qualifications", "key_skills", "attributes", "alternate_urls"]
                 
                 for field in list_fields:
                     val = meta.get(field)
@@ -448,20 +679,19 @@ class StorageService:
             return []
 
     def get_market_data(self) -> tuple[list[dict], list[dict]]:
-        """Fetches all candidate profiles and global jobs for visualization."""
-        store = self._get_store(self.NS_USER_DATA)
-        index = store.get_pinecone_index(self.index_name)
-        profile_results = index.query(
-            vector=[0.0] * 3072,
-            top_k=100,
+        """
+        Fetches all candidate profiles and global jobs for visualization.
+        Of the jobs' stored payloads only qualifications, the one the charts use, is read.
+        """
+        profile_results = self.iter_records(
+            self.NS_USER_DATA,
             filter={"document_type": {"$eq": "candidate_profile"}},
-            namespace=self.NS_USER_DATA,
-            include_metadata=True,
+            prefix="profile_",
         )
 
         profiles = []
-        for m in profile_results.get("matches", []):
-            meta = m["metadata"]
+        for m in profile_results:
+            meta = m.metadata
             for field in ["job_titles", "key_skills", "industries"]:
                 if isinstance(meta.get(field), str):
                     try:
@@ -470,13 +700,10 @@ class StorageService:
                         meta[field] = []
             profiles.append(meta)
 
-        job_results = index.query(
-            vector=[0.0] * 3072,
-            top_k=1000,
-            namespace=self.NS_GLOBAL_JOBS,
-            include_metadata=True,
-        )
-        jobs = [m["metadata"] for m in job_results.get("matches", [])]
+        jobs = [
+            m.metadata
+            for m in self._hydrate(self.NS_GLOBAL_JOBS, self.iter_records(self.NS_GLOBAL_JOBS), ["qualifications"])
+        ]
 
         return profiles, jobs
     
@@ -489,12 +716,13 @@ class StorageService:
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=months_old * 30)
             cutoff_ts = int(cutoff_date.timestamp())
 
-            index = self._get_store(self.NS_GLOBAL_JOBS).get_pinecone_index(self.index_name)
-
-            delete_response = index.delete(
+            delete_response = self.backend.delete(
+                self.NS_GLOBAL_JOBS,
                 filter={"analysed_at": {"$lt": cutoff_ts}},
-                namespace=self.NS_GLOBAL_JOBS
             )
+            if self.documents is not None:
+                live_ids = {uid for batch in self.backend.list_ids(self.NS_GLOBAL_JOBS) for uid in batch}
+                self.documents.retain(self.NS_GLOBAL_JOBS, live_ids)
             
             st.success(f"Cleanup complete! Removed jobs older than {cutoff_date.date()}.")
             return delete_response
@@ -505,17 +733,15 @@ class StorageService:
     def scrub_id_contaminated_urls(self, namespace: str):
         """Deletes records where the 'job_url' was erroneously populated with an ID."""
         try:
-            index = self.pc.Index(self.index_name)
             ids_to_delete = []
 
-            for ids_batch in index.list(namespace=namespace):
+            for ids_batch in self.backend.list_ids(namespace):
                 
                 sub_batch_size = 50
                 for i in range(0, len(ids_batch), sub_batch_size):
                     sub_group = ids_batch[i : i + sub_batch_size]
                     
-                    fetch_results = index.fetch(ids=sub_group, namespace=namespace)
-                    vectors = fetch_results.vectors if hasattr(fetch_results, 'vectors') else {}
+                    vectors = self.backend.fetch(sub_group, namespace)
                     
                     for record_id, vector_obj in vectors.items():
                         metadata = vector_obj.metadata if hasattr(vector_obj, 'metadata') else None
@@ -530,7 +756,9 @@ class StorageService:
             if ids_to_delete:
                 for i in range(0, len(ids_to_delete), 1000):
                     batch = ids_to_delete[i : i + 1000]
-                    index.delete(ids=batch, namespace=namespace)
+                    self.backend.delete(namespace, ids=batch)
+                    if self.documents is not None:
+                        self.documents.delete(namespace, batch)
                 return f"Cleaned {len(ids_to_delete)} records."
             
             return "Index is already clean."
@@ -538,11 +766,50 @@ class StorageService:
         except Exception as e:
             return f"Scrub failed: {str(e)}"
 
+    def migrate_legacy_analysis_ids(self, batch_size: int = 100) -> str:
+        """
+        One-off re-key of job analyses saved before analysis ids carried their profile
+        prefix, so every analysis can be listed by prefix. Each record is rewritten
+        under its new id, keeping its metadata, before the old id is deleted.
+        """
+        try:
+            legacy = [
+                record
+                for record in self.iter_records(self.NS_USER_DATA, filter={"document_type": {"$eq": "job_analysis"}})
+                if not record.id.startswith("analysis_")
+            ]
+            migrated = 0
+            for start in range(0, len(legacy), batch_size):
+                chunk = list(self._hydrate(self.NS_USER_DATA, legacy[start : start + batch_size]))
+                texts, metadatas, ids, old_ids = [], [], [], []
+                for record in chunk:
+                    meta = {k: v for k, v in record.metadata.items() if k != "text"}
+                    if not (meta.get("analysis_json") and meta.get("profile_id") and meta.get("job_url")):
+                        continue
+                    analysis = AnalysedJobMatchWithMeta(**loads(meta["analysis_json"]))
+                    ids.append(self._analysis_id(meta["profile_id"], meta["job_url"]))
+                    texts.append(clean_text_for_embedding(analysis.top_applicant_reasoning))
+                    metadatas.append(meta)
+                    old_ids.append(record.id)
+                if not ids:
+                    continue
+                self._write_records(self.NS_USER_DATA, texts, metadatas, ids, self.ANALYSIS_PAYLOAD_FIELDS)
+                self.backend.delete(self.NS_USER_DATA, ids=old_ids)
+                if self.documents is not None:
+                    self.documents.delete(self.NS_USER_DATA, old_ids)
+                migrated += len(ids)
+
+            if migrated:
+                return f"Re-keyed {migrated} analyses."
+            return "No legacy analyses found."
+
+        except Exception as e:
+            return f"Migration failed: {str(e)}"
+
     def get_index_metrics(self) -> dict:
-        """Fetches real-time vector counts from Pinecone namespaces."""
+        """Fetches real-time vector counts per namespace from the backend."""
         try:
-            index = self.pc.Index(self.index_name)
-            stats = index.describe_index_stats()
+            stats = self.backend.stats()
             
             namespaces = stats.get("namespaces", {})
             
@@ -555,3 +822,21 @@ class StorageService:
         except Exception as e:
             print(f"Error fetching index stats: {e}")
             return {"global_count": 0, "analysis_count": 0}
+
+    save_candidate_profile_async = _offloaded(save_candidate_profile)
+    fetch_candidate_profile_async = _offloaded(fetch_candidate_profile)
+    find_all_candidate_profiles_async = _offloaded(find_all_candidate_profiles)
+    delete_profile_async = _offloaded(delete_profile)
+    save_job_analyses_async = _offloaded(save_job_analyses)
+    check_analysis_cache_async = _offloaded(check_analysis_cache)
+    find_fresh_global_jobs_async = _offloaded(find_fresh_global_jobs)
+    find_job_matches_for_profile_async = _offloaded(find_job_matches_for_profile)
+    delete_current_profile_async = _offloaded(delete_current_profile)
+    find_all_jobs_for_user_async = _offloaded(find_all_jobs_for_user)
+    find_raw_job_by_url_async = _offloaded(find_raw_job_by_url)
+    get_all_global_jobs_async = _offloaded(get_all_global_jobs)
+    get_market_data_async = _offloaded(get_market_data)
+    cleanup_stale_jobs_async = _offloaded(cleanup_stale_jobs)
+    scrub_id_contaminated_urls_async = _offloaded(scrub_id_contaminated_urls)
+    migrate_legacy_analysis_ids_async = _offloaded(migrate_legacy_analysis_ids)
+    get_index_metrics_async = _offloaded(get_index_metrics)
@@ -0,0 +1,149 @@
+"""Upsert Pipeline: Packs library writes into quota-sized batches and runs them under an AIMD window."""
+import asyncio
+import threading
+from dataclasses import dataclass
+from json import dumps
+from typing import Any, Callable, Dict, List
+
+from src.schema import LibrarySyncSettings
+from src.services.rate_scheduler import InFlightLimiter
+from src.services.resilience import RetryPolicy
+
+THROTTLE_MARKERS = ("429", "RESOURCE_EXHAUSTED", "Too Many Requests")
+
+
+@dataclass
+class UpsertItem:
+    id: str
+    text: str
+    metadata: Dict[str, Any]
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly four characters per embedding token; only used to size batches."""
+    return max(1, len(text) // 4)
+
+
+def estimate_bytes(item: UpsertItem, vector_bytes: int) -> int:
+    """Approximate serialised size of one record in an upsert request."""
+    return len(item.text.encode()) + len(dumps(item.metadata, default=str).encode()) + vector_bytes
+
+
+def plan_batches(items: List[UpsertItem], settings: LibrarySyncSettings) -> List[List[UpsertItem]]:
+    """
+    Greedily packs items, in order, into batches under the item, byte and token caps.
+    An item too large for any batch on its own still gets a batch of one.
+    """
+    batches, current, size, tokens = [], [], 0, 0
+    for item in items:
+        item_size = estimate_bytes(item, settings.vector_bytes)
+        item_tokens = estimate_tokens(item.text)
+        if current and (
+            len(current) >= settings.max_batch_items
+            or size + item_size > settings.max_batch_bytes
+            or tokens + item_tokens > settings.max_batch_tokens
+        ):
+            batches.append(current)
+            current, size, tokens = [], 0, 0
+        current.append(item)
+        size += item_size
+        tokens += item_tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def is_throttled(exc: BaseException) -> bool:
+    """Pinecone and Gemini surface rate limiting differently; both carry a 429 somewhere."""
+    for attr in ("status", "status_code", "code"):
+        if getattr(exc, attr, None) == 429:
+            return True
+    message = str(exc)
+    return any(marker in message for marker in THROTTLE_MARKERS)
+
+
+class AdaptiveWindow:
+    """
+    AIMD concurrency window over a cross-loop limiter: grows by one after a full
+    window of successful batches, halves on every throttle. Shared by every sync a
+    StorageService runs, so concurrent researcher batches back off together.
+    """
+
+    def __init__(self, initial: int = 2, maximum: int = 8):
+        self.maximum = maximum
+        self.limiter = InFlightLimiter(max(1, min(initial, maximum)))
+        self.throttles = 0
+        self._streak = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self.limiter.limit
+
+    def configure(self, maximum: int):
+        with self._lock:
+            self.maximum = maximum
+            self.limiter.limit = max(1, min(self.limiter.limit, maximum))
+
+    def on_success(self):
+        with self._lock:
+            self._streak += 1
+            if self._streak >= self.limiter.limit and self.limiter.limit < self.maximum:
+                self.limiter.limit += 1
+                self._streak = 0
+
+    def on_throttle(self):
+        with self._lock:
+            self.throttles += 1
+            self._streak = 0
+            self.limiter.limit = max(1, self.limiter.limit // 2)
+
+
+async def run_upserts(
+    batches: List[List[UpsertItem]],
+    upsert: Callable[[List[UpsertItem]], Any],
+    window: AdaptiveWindow,
+    policy: RetryPolicy,
+) -> int:
+    """
+    Runs `upsert` for every batch on worker threads, at most `window.size` at a time.
+    Throttled batches give up their slot, back off and retry; any other failure, or
+    a batch still throttled after the policy's retries, cancels the rest and raises.
+    Returns the number of items written.
+    """
+
+    failed = asyncio.Event()
+
+    async def write(batch: List[UpsertItem]) -> int:
+        attempt = 0
+        while True:
+            await window.limiter.acquire()
+            try:
+                if failed.is_set():
+                    return 0
+                await asyncio.to_thread(upsert, batch)
+            except Exception as exc:
+                if not is_throttled(exc):
+                    failed.set()
+                    raise
+                window.on_throttle()
+                delay = policy.backoff(attempt)
+                if delay is None:
+                    failed.set()
+                    raise
+            else:
+                window.on_success()
+                return len(batch)
+            finally:
+                window.limiter.release()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    tasks = [asyncio.ensure_future(write(batch)) for batch in batches]
+    try:
+        return sum(await asyncio.gather(*tasks))
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,397 @@
+"""Vector Backends: The storage operations StorageService needs, over Pinecone or a local file."""
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+@dataclass
+class VectorRecord:
+    id: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    score: float = 0.0
+
+
+@dataclass
+class ScanPage:
+    """One page of an enumeration. `cursor` resumes after it and is None on the last page."""
+    records: List[VectorRecord]
+    cursor: Optional[str] = None
+
+
+class VectorBackend(ABC):
+    """
+    Every vector-store call StorageService makes. Metadata filters use Pinecone's
+    syntax ($eq, $ne, $gt, $gte, $lt, $lte, $in, $nin, $exists, $and, $or) so both
+    backends accept the same filters.
+    """
+
+    @abstractmethod
+    def fetch(self, ids: List[str], namespace: str) -> Dict[str, VectorRecord]:
+        """Records for the ids that exist; missing ids are omitted."""
+
+    @abstractmethod
+    def query(
+        self,
+        namespace: str,
+        vector: Optional[List[float]] = None,
+        filter: Optional[dict] = None,
+        top_k: int = 10,
+    ) -> List[VectorRecord]:
+        """Cosine top-k among records matching `filter`. Without a vector, any `top_k` matches."""
+
+    @abstractmethod
+    def upsert_texts(
+        self, namespace: str, texts: List[str], metadatas: List[dict], ids: List[str], store_text: bool = True
+    ):
+        """
+        Embeds `texts` and writes them with their metadata, replacing existing ids.
+        With store_text the text is also kept in metadata under "text", as LangChain does.
+        """
+
+    @abstractmethod
+    def update_metadata(self, namespace: str, updates: Dict[str, dict]):
+        """Merges each id's fields into its stored metadata, leaving the vector untouched."""
+
+    @abstractmethod
+    def delete(self, namespace: str, ids: Optional[List[str]] = None, filter: Optional[dict] = None):
+        ...
+
+    @abstractmethod
+    def list_ids(self, namespace: str) -> Iterator[List[str]]:
+        """Every id in the namespace, in batches."""
+
+    @abstractmethod
+    def scan(
+        self,
+        namespace: str,
+        filter: Optional[dict] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        prefix: Optional[str] = None,
+    ) -> ScanPage:
+        """
+        Enumerates records in id order without a similarity search, optionally only
+        ids starting with `prefix`. The filter is applied after the ids are listed, so
+        narrow large namespaces with a prefix. A page may hold fewer than `limit`
+        records, or none, when the filter rejects some; keep going until the cursor is None.
+        """
+
+    def iter_records(
+        self, namespace: str, filter: Optional[dict] = None, page_size: int = 100, prefix: Optional[str] = None
+    ) -> Iterator[VectorRecord]:
+        """Every record matching `filter` (and `prefix`), fetched a page at a time."""
+        cursor = None
+        while True:
+            page = self.scan(namespace, filter=filter, limit=page_size, cursor=cursor, prefix=prefix)
+            yield from page.records
+            if page.cursor is None or page.cursor == cursor:
+                return
+            cursor = page.cursor
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """{"namespaces": {name: {"vector_count": n}}, "dimension": d, "index_fullness": f}"""
+
+    def close(self):
+        pass
+
+
+class PineconeBackend(VectorBackend):
+    """
+    Pinecone through StorageService's cached handles. The handle getters are passed
+    in as callables and looked up on every call, so the service owns handle caching.
+    """
+
+    def __init__(
+        self,
+        get_store: Callable[[str], Any],
+        get_index: Callable[[str], Any],
+        index_handle: Callable[[], Any],
+        dimension: int = 3072,
+        close: Optional[Callable[[], None]] = None,
+    ):
+        self._get_store = get_store
+        self._get_index = get_index
+        self._index_handle = index_handle
+        self.dimension = dimension
+        self._close = close
+
+    def fetch(self, ids: List[str], namespace: str) -> Dict[str, VectorRecord]:
+        response = self._get_index(namespace).fetch(ids=ids, namespace=namespace)
+        vectors = response.vectors if response else {}
+        return {uid: VectorRecord(uid, vector.metadata) for uid, vector in vectors.items()}
+
+    def query(self, namespace, vector=None, filter=None, top_k=10) -> List[VectorRecord]:
+        kwargs = {"filter": filter} if filter else {}
+        results = self._get_index(namespace).query(
+            vector=vector if vector is not None else [0.0] * self.dimension,
+            namespace=namespace,
+            top_k=top_k,
+            include_metadata=True,
+            **kwargs,
+        )
+        return [
+            VectorRecord(m.get("id"), m.get("metadata", {}), m.get("score") or 0.0)
+            for m in results.get("matches", [])
+        ]
+
+    def upsert_texts(self, namespace, texts, metadatas, ids, store_text=True):
+        store = self._get_store(namespace)
+        if store_text:
+            store.add_texts(texts=texts, metadatas=metadatas, ids=ids)
+            return
+        vectors = store.embeddings.embed_documents(list(texts))
+        self._get_index(namespace).upsert(
+            vectors=[
+                {"id": uid, "values": values, "metadata": metadata}
+                for uid, values, metadata in zip(ids, vectors, metadatas)
+            ],
+            namespace=namespace,
+        )
+
+    def update_metadata(self, namespace, updates):
+        index = self._get_index(namespace)
+        for uid, metadata in updates.items():
+            index.update(id=uid, set_metadata=metadata, namespace=namespace)
+
+    def delete(self, namespace, ids=None, filter=None):
+        index = self._get_index(namespace)
+        if ids is not None:
+            return index.delete(ids=ids, namespace=namespace)
+        return index.delete(filter=filter, namespace=namespace)
+
+    def list_ids(self, namespace: str) -> Iterator[List[str]]:
+        yield from self._index_handle().list(namespace=namespace)
+
+    def scan(self, namespace, filter=None, limit=100, cursor=None, prefix=None) -> ScanPage:
+        """One list_paginated page of ids, fetched in a single call and filtered client-side."""
+        kwargs = {"prefix": prefix} if prefix else {}
+        listed = self._get_index(namespace).list_paginated(
+            namespace=namespace, limit=limit, pagination_token=cursor, **kwargs
+        )
+        ids = [vector.id for vector in (listed.vectors or [])]
+        records = self.fetch(ids, namespace) if ids else {}
+        pagination = getattr(listed, "pagination", None)
+        return ScanPage(
+            [records[uid] for uid in ids if uid in records and matches_filter(records[uid].metadata, filter)],
+            getattr(pagination, "next", None) if pagination else None,
+        )
+
+    def stats(self) -> dict:
+        stats = self._index_handle().describe_index_stats()
+        return {
+            "namespaces": {
+                name: {"vector_count": ns.get("vector_count", 0)}
+                for name, ns in (stats.get("namespaces") or {}).items()
+            },
+            "dimension": stats.get("dimension", 0),
+            "index_fullness": stats.get("index_fullness", 0.0),
+        }
+
+    def close(self):
+        if self._close is not None:
+            self._close()
+
+
+_COMPARATORS = {
+    "$eq": lambda value, target: value == target,
+    "$ne": lambda value, target: value != target,
+    "$gt": lambda value, target: value is not None and value > target,
+    "$gte": lambda value, target: value is not None and value >= target,
+    "$lt": lambda value, target: value is not None and value < target,
+    "$lte": lambda value, target: value is not None and value <= target,
+    "$in": lambda value, target: value in target,
+    "$nin": lambda value, target: value not in target,
+}
+
+
+def matches_filter(metadata: dict, filter: Optional[dict]) -> bool:
+    """Evaluates a Pinecone-style metadata filter against one record."""
+    if not filter:
+        return True
+    for key, condition in filter.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, sub) for sub in condition):
+                return False
+            continue
+        if key == "$or":
+            if not any(matches_filter(metadata, sub) for sub in condition):
+                return False
+            continue
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        value = metadata.get(key)
+        for op, target in condition.items():
+            if op == "$exists":
+                if (key in metadata) != bool(target):
+                    return False
+                continue
+            try:
+                if not _COMPARATORS[op](value, target):
+                    return False
+            except TypeError:
+                return False
+    return True
+
+
+class LocalVectorBackend(VectorBackend):
+    """
+    Embedded single-node backend: records live in SQLite, and each namespace's
+    vectors are held as one normalised float32 NumPy matrix for cosine top-k.
+    The matrix is rebuilt lazily after writes. Filters are evaluated in Python
+    before ranking, so this suits libraries of up to a few hundred thousand records.
+    Metadata gains a "text" key, as LangChain's Pinecone store adds, unless store_text is off.
+    """
+
+    def __init__(self, path: str, embeddings: Any):
+        self.path = path
+        self.embeddings = embeddings
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS vectors (
+                namespace TEXT NOT NULL,
+                id TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (namespace, id)
+            )"""
+        )
+        self._matrices: Dict[str, tuple] = {}
+
+    def _namespace_matrix(self, namespace: str) -> tuple:
+        """(ids, metadatas, unit-normalised matrix) for a namespace. Caller holds the lock."""
+        cached = self._matrices.get(namespace)
+        if cached is not None:
+            return cached
+        rows = self._conn.execute(
+            "SELECT id, metadata, vector FROM vectors WHERE namespace = ? ORDER BY rowid", (namespace,)
+        ).fetchall()
+        ids = [row[0] for row in rows]
+        metadatas = [json.loads(row[1]) for row in rows]
+        if rows:
+            matrix = np.vstack([np.frombuffer(row[2], dtype=np.float32) for row in rows])
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.where(norms == 0, 1, norms)
+        else:
+            matrix = np.empty((0, 0), dtype=np.float32)
+        cached = self._matrices[namespace] = (ids, metadatas, matrix)
+        return cached
+
+    def fetch(self, ids: List[str], namespace: str) -> Dict[str, VectorRecord]:
+        if not ids:
+            return {}
+        placeholders = ",".join("?" * len(ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, metadata FROM vectors WHERE namespace = ? AND id IN ({placeholders})",
+                (namespace, *ids),
+            ).fetchall()
+        return {uid: VectorRecord(uid, json.loads(metadata)) for uid, metadata in rows}
+
+    def query(self, namespace, vector=None, filter=None, top_k=10) -> List[VectorRecord]:
+        with self._lock:
+            ids, metadatas, matrix = self._namespace_matrix(namespace)
+        candidates = [i for i, metadata in enumerate(metadatas) if matches_filter(metadata, filter)]
+        if vector is None or not candidates:
+            return [VectorRecord(ids[i], dict(metadatas[i])) for i in candidates[:top_k]]
+
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        scores = matrix[candidates] @ (query / norm if norm else query)
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        return [
+            VectorRecord(ids[candidates[i]], dict(metadatas[candidates[i]]), float(scores[i])) for i in order
+        ]
+
+    def upsert_texts(self, namespace, texts, metadatas, ids, store_text=True):
+        vectors = self.embeddings.embed_documents(list(texts))
+        rows = [
+            (
+                namespace,
+                uid,
+                json.dumps({**metadata, "text": text} if store_text else metadata),
+                np.asarray(vec, dtype=np.float32).tobytes(),
+            )
+            for uid, text, metadata, vec in zip(ids, texts, metadatas, vectors)
+        ]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO vectors VALUES (?, ?, ?, ?)", rows)
+            self._matrices.pop(namespace, None)
+
+    def update_metadata(self, namespace, updates):
+        if not updates:
+            return
+        placeholders = ",".join("?" * len(updates))
+        with self._lock:
+            current = self._conn.execute(
+                f"SELECT id, metadata FROM vectors WHERE namespace = ? AND id IN ({placeholders})",
+                (namespace, *updates),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE vectors SET metadata = ? WHERE namespace = ? AND id = ?",
+                [(json.dumps({**json.loads(metadata), **updates[uid]}), namespace, uid) for uid, metadata in current],
+            )
+            self._matrices.pop(namespace, None)
+
+    def delete(self, namespace, ids=None, filter=None):
+        with self._lock:
+            if ids is None:
+                ids = [
+                    uid for uid, metadata in self._conn.execute(
+                        "SELECT id, metadata FROM vectors WHERE namespace = ?", (namespace,)
+                    )
+                    if matches_filter(json.loads(metadata), filter)
+                ]
+            self._conn.executemany(
+                "DELETE FROM vectors WHERE namespace = ? AND id = ?", [(namespace, uid) for uid in ids]
+            )
+            self._matrices.pop(namespace, None)
+
+    def scan(self, namespace, filter=None, limit=100, cursor=None, prefix=None) -> ScanPage:
+        """Keyset pagination on id, so the cursor stays valid while records are added or removed."""
+        prefix = prefix or ""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, metadata FROM vectors WHERE namespace = ? AND id > ? AND substr(id, 1, ?) = ?"
+                " ORDER BY id LIMIT ?",
+                (namespace, cursor or "", len(prefix), prefix, limit),
+            ).fetchall()
+        records = [VectorRecord(uid, json.loads(metadata)) for uid, metadata in rows]
+        return ScanPage(
+            [record for record in records if matches_filter(record.metadata, filter)],
+            rows[-1][0] if len(rows) == limit else None,
+        )
+
+    def list_ids(self, namespace: str, batch_size: int = 100) -> Iterator[List[str]]:
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute(
+                "SELECT id FROM vectors WHERE namespace = ? ORDER BY id", (namespace,)
+            )]
+        for i in range(0, len(ids), batch_size):
+            yield ids[i : i + batch_size]
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = self._conn.execute(
+                "SELECT namespace, COUNT(*) FROM vectors GROUP BY namespace"
+            ).fetchall()
+            sample = self._conn.execute("SELECT vector FROM vectors LIMIT 1").fetchone()
+        return {
+            "namespaces": {namespace: {"vector_count": count} for namespace, count in counts},
+            "dimension": len(sample[0]) // 4 if sample else 0,
+            "index_fullness": 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._matrices.clear()
+            self._conn.close()
@@ -7,6 +7,8 @@ from src.schema import (
     RawJobMatchList,
     AnalysedJobMatchListWithMeta,
     PipelineSettings,
+    ScraperRunMetrics,
+    DeadlineReport,
 )
 
 
@@ -21,6 +23,8 @@ class AgentState(TypedDict):
         writer_data: The final, audited job matches with fit analysis and metadata.
         active_profile_id: The unique database ID for the current candidate session.
         pipeline_settings: Configuration for scrapers, weights, and LLM providers.
+        scraper_metrics: Per-provider calls, latency, volume and errors from the last research run.
+        deadline_report: What the run's deadline cut short, set by run_job_matcher.
     """
 
     messages: Annotated[Sequence[BaseMessage], add]
@@ -29,3 +33,5 @@ class AgentState(TypedDict):
     writer_data: Optional[AnalysedJobMatchListWithMeta]
     active_profile_id: str
     pipeline_settings: PipelineSettings
+    scraper_metrics: Optional[ScraperRunMetrics]
+    deadline_report: Optional[DeadlineReport]
@@ -20,6 +20,7 @@ from src.utils.func import (
     get_weight_map,
 )
 from src.schema import AnalysedJobMatchWithMeta, RawJobMatch, AgentWeights
+from src.services.resilience import get_circuit_breakers
 
 
 def display_profile(profile):
@@ -504,9 +505,32 @@ def scraping_settings_tab(storage: LocalStorage):
         format_func=depth_labels.get,
         value=current_params.max_jobs,
     )
+    new_params["incremental_search"] = st.toggle(
+        "Only fetch jobs posted since my last search",
+        value=current_params.incremental_search,
+    )
+    render_source_health()
     save_settings(new_params, "scraper_settings", storage)
 
 
+def render_source_health():
+    """Shows which job sources the circuit breakers are currently skipping."""
+    source_health = get_circuit_breakers().states()
+    if not source_health:
+        return
+    st.subheader("Source Health")
+    for provider, health in source_health.items():
+        if health["state"] == "closed":
+            st.caption(f":material/check_circle: {provider.title()} is healthy")
+        elif health["state"] == "open":
+            st.warning(
+                f"{provider.title()} is skipped for another {health['retry_in_s']:.0f}s "
+                f"after {health['consecutive_failures']} consecutive failures."
+            )
+        else:
+            st.info(f"{provider.title()} is being probed after a cool-down.")
+
+
 def vector_storage_setting_tab(storage: LocalStorage):
     st.subheader("Vector Store Management")
     st.warning("Pruning the database is permanent. Use with caution.")
@@ -562,6 +586,10 @@ def vector_storage_setting_tab(storage: LocalStorage):
                     msg_user = storage.scrub_id_contaminated_urls(storage.NS_USER_DATA)
                     st.success(f"Global: {msg} | User Data: {msg_user}")
 
+            if st.button("Re-key Legacy Analyses", use_container_width=True, type="secondary"):
+                with st.spinner("Moving old analyses to prefixed ids..."):
+                    st.success(storage.migrate_legacy_analysis_ids())
+
 
 @st.fragment
 def render_api_settings(storage: LocalStorage):
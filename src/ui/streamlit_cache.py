@@ -9,7 +9,9 @@ import pandas as pd
 from main import run_job_matcher
 from src.utils.model_functions import get_all_gemini_models
 from src.services.document_service import DocumentService
+from src.services.document_store import get_document_store
 from src.services.storage_service import StorageService
+from src.services.vector_backends import LocalVectorBackend
 from src.ui.altair_handler import create_salary_chart
 
 
@@ -46,9 +48,20 @@ def generate_docx(state, last_updated: float = 0.0):
 
 @st.cache_resource(show_spinner=False)
 def get_storage_service(_embeddings, last_updated: float = 0.0):
-    """Use cache_resource for the Service Instance."""
+    """
+    Use cache_resource for the Service Instance. VECTOR_BACKEND = "local" skips Pinecone.
+    Setting DOCUMENT_STORE_PATH moves job and analysis payloads out of vector metadata;
+    it is opt-in because every node sharing the index must see the same file.
+    """
+    document_path = st.secrets.get("DOCUMENT_STORE_PATH", "")
+    documents = get_document_store(document_path) if document_path else None
+    if st.secrets.get("VECTOR_BACKEND", "pinecone") == "local":
+        backend = LocalVectorBackend(
+            st.secrets.get("LOCAL_VECTOR_PATH", ".cache/vectors.sqlite3"), _embeddings
+        )
+        return StorageService(index_name="local", embeddings=_embeddings, backend=backend, documents=documents)
     return StorageService(
-        index_name=st.secrets["PINECONE_NAME"], embeddings=_embeddings
+        index_name=st.secrets["PINECONE_NAME"], embeddings=_embeddings, documents=documents
     )
 
 
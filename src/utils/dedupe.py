@@ -0,0 +1,168 @@
+"""Near-duplicate detection for job postings reached through different providers."""
+import hashlib
+import re
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+from rapidfuzz import fuzz
+
+from src.schema import RawJobMatch
+
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_TAG_RE = re.compile(r"<[^>]+>")
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_for_matching(text: str) -> str:
+    """Lower-cases, strips HTML and punctuation so provider formatting does not matter."""
+    if not text:
+        return ""
+    text = _TAG_RE.sub(" ", str(text).lower())
+    return _NON_WORD_RE.sub(" ", text).strip()
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """Word n-gram shingles; short texts fall back to single words."""
+    words = text.split()
+    if len(words) < size:
+        return set(words)
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """Fixed-seed MinHash so signatures are stable across runs and processes."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 7):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, tokens: Set[str]) -> np.ndarray:
+        if not tokens:
+            return np.full(self.num_perm, _MERSENNE_PRIME, dtype=np.uint64)
+        hashes = np.fromiter(
+            (
+                int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=4).digest(), "big")
+                for t in tokens
+            ),
+            dtype=np.uint64,
+            count=len(tokens),
+        ) % _MERSENNE_PRIME
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+
+class NearDuplicateIndex:
+    """
+    Incremental MinHash/LSH index over title + company + location + description.
+    LSH bucketing keeps lookups close to constant time per job; candidates are then
+    verified on estimated Jaccard plus fuzzy title and company agreement.
+    The first job seen in a cluster stays canonical and collects the others' URLs.
+    Once canonicals are released downstream, later merges into them are tracked as
+    revisions so the caller can write them again.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        num_perm: int = 64,
+        bands: int = 16,
+        title_ratio: int = 85,
+        company_ratio: int = 80,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands.")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.title_ratio = title_ratio
+        self.company_ratio = company_ratio
+        self._hasher = MinHasher(num_perm)
+        self._buckets: Dict[tuple, List[int]] = {}
+        self._by_url: Dict[str, int] = {}
+        self.canonical: List[RawJobMatch] = []
+        self._signatures: List[np.ndarray] = []
+        self._keys: List[tuple] = []
+        self._released = 0
+        self._revised: Dict[int, None] = {}
+
+    def add(self, job: RawJobMatch) -> bool:
+        """Returns True when the job is new, False when it was folded into an existing one."""
+        if job.job_url in self._by_url:
+            return False
+
+        title = normalize_for_matching(job.title)
+        company = normalize_for_matching(job.company)
+        text = " ".join(
+            [title, company, normalize_for_matching(job.location), normalize_for_matching(job.description)]
+        )
+        signature = self._hasher.signature(shingles(text))
+        band_keys = [
+            (b, signature[b * self.rows : (b + 1) * self.rows].tobytes()) for b in range(self.bands)
+        ]
+
+        match = self._find_match(signature, band_keys, title, company)
+        if match is not None:
+            self._merge(self.canonical[match], job)
+            self._by_url[job.job_url] = match
+            if match < self._released:
+                self._revised[match] = None
+            return False
+
+        position = len(self.canonical)
+        self.canonical.append(job)
+        self._signatures.append(signature)
+        self._keys.append((title, company))
+        self._by_url[job.job_url] = position
+        for key in band_keys:
+            self._buckets.setdefault(key, []).append(position)
+        return True
+
+    def release(self):
+        """Marks every canonical so far as handed downstream."""
+        self._released = len(self.canonical)
+
+    def take_revised(self) -> List[RawJobMatch]:
+        """Released canonicals that absorbed a duplicate since the last call, in first-seen order."""
+        revised = [self.canonical[pos] for pos in sorted(self._revised)]
+        self._revised.clear()
+        return revised
+
+    def _find_match(self, signature, band_keys, title: str, company: str) -> Optional[int]:
+        candidates = {pos for key in band_keys for pos in self._buckets.get(key, [])}
+        for pos in sorted(candidates):
+            similarity = float(np.mean(self._signatures[pos] == signature))
+            if similarity < self.threshold:
+                continue
+            seen_title, seen_company = self._keys[pos]
+            if fuzz.token_sort_ratio(title, seen_title) < self.title_ratio:
+                continue
+            if fuzz.token_set_ratio(company, seen_company) < self.company_ratio:
+                continue
+            return pos
+        return None
+
+    @staticmethod
+    def _merge(canonical: RawJobMatch, duplicate: RawJobMatch):
+        """Keeps the duplicate's apply link and backfills anything the canonical lacks."""
+        known = {canonical.job_url, *canonical.alternate_urls}
+        for url in [duplicate.job_url, *duplicate.alternate_urls]:
+            if url and url not in known:
+                canonical.alternate_urls.append(url)
+                known.add(url)
+        if canonical.salary_min is None and duplicate.salary_min is not None:
+            canonical.salary_min = duplicate.salary_min
+        if canonical.salary_max is None and duplicate.salary_max is not None:
+            canonical.salary_max = duplicate.salary_max
+        if len(duplicate.description or "") > len(canonical.description or ""):
+            canonical.description = duplicate.description
+
+
+def collapse_near_duplicates(jobs: List[RawJobMatch], threshold: float = 0.6) -> List[RawJobMatch]:
+    """Collapses exact and near-duplicate postings into one canonical job each."""
+    index = NearDuplicateIndex(threshold=threshold)
+    for job in jobs:
+        if job.job_url:
+            index.add(job)
+    return index.canonical
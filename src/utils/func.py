@@ -27,6 +27,14 @@ class ProviderError(Exception):
     pass
 
 
+class BudgetExhaustedError(Exception):
+    pass
+
+
+class ProviderUnavailableError(Exception):
+    pass
+
+
 def validate_configuration(setting, error_message):
     if not setting:
         st.error(f"{error_message}")
@@ -1,3 +1,5 @@
+from typing import Optional
+
 import streamlit as st
 from google import genai
 from anthropic import Anthropic
@@ -5,6 +7,7 @@ from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmb
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 
+from src.services.embedding_cache import CachedEmbeddings, get_embedding_cache
 from src.utils.func import ProviderError
 
 
@@ -187,6 +190,16 @@ def get_llm_model(api_settings, model_id: str, provider: str):
     raise ProviderError(f"Provider '{provider}' is not configured or supported.")
 
 
-def get_gemini_embedding_model(model_id: str, api_key: str):
-    """Returns the embedding engine used by the StorageService."""
-    return GoogleGenerativeAIEmbeddings(model=model_id, api_key=api_key)
+def get_gemini_embedding_model(
+    model_id: str, api_key: str, cache_path: Optional[str] = None, cache_max_mb: int = 256
+):
+    """
+    Returns the embedding engine used by the StorageService. With a cache_path,
+    unchanged text is served from the on-disk embedding cache instead of Gemini.
+    """
+    embeddings = GoogleGenerativeAIEmbeddings(model=model_id, api_key=api_key)
+    if not cache_path:
+        return embeddings
+    return CachedEmbeddings(
+        embeddings, model_id, get_embedding_cache(cache_path, cache_max_mb * 1024 * 1024)
+    )
@@ -1,5 +1,21 @@
+from datetime import datetime, timezone
+from typing import Optional
+
 from src.schema import SearchStep, LocationData
 
+GOOGLE_DATE_CHIPS = [(1, "today"), (3, "3days"), (7, "week"), (30, "month")]
+LINKEDIN_FEEDS = [(1 / 24, "active-jb-1h"), (1, "active-jb-24h"), (7, "active-jb-7d")]
+PROVIDER_LIMIT_CAPS = {"theirstack": 5}
+
+def days_since(watermark: Optional[datetime]) -> Optional[float]:
+    """Age of a watermark in days, or None when there is nothing to be incremental from."""
+    if watermark is None:
+        return None
+    if watermark.tzinfo is None:
+        watermark = watermark.replace(tzinfo=timezone.utc)
+    return max(0.0, (datetime.now(timezone.utc) - watermark).total_seconds() / 86400)
+
+
 class JobQueryCompiler:
     @staticmethod
     def to_linkedin(step: SearchStep) -> str:
@@ -18,6 +34,27 @@ class JobQueryCompiler:
         titles = " OR ".join(step.title_stems)
         skills = " ".join(step.must_have_skills)
         return f"({titles}) {skills}"
+
+    @staticmethod
+    def google_date_chip(since: Optional[datetime]) -> Optional[str]:
+        """Smallest SerpAPI date_posted bucket that still covers the watermark."""
+        age = days_since(since)
+        if age is None:
+            return None
+        for max_days, chip in GOOGLE_DATE_CHIPS:
+            if age <= max_days:
+                return f"date_posted:{chip}"
+        return None
+
+    @staticmethod
+    def linkedin_feed(since: Optional[datetime]) -> str:
+        """Shortest 'active jobs' feed that still covers the watermark; 7 days is the full window."""
+        age = days_since(since)
+        if age is not None:
+            for max_days, feed in LINKEDIN_FEEDS:
+                if age <= max_days:
+                    return feed
+        return LINKEDIN_FEEDS[-1][1]
     
 
     @staticmethod
@@ -54,11 +91,22 @@ class JobQueryCompiler:
         }
     
     @staticmethod
-    def generate_theirstack_query(step: SearchStep, location: LocationData, limit: int) -> dict:
-        return {
+    def generate_theirstack_query(
+        step: SearchStep,
+        location: LocationData,
+        limit: int,
+        since: Optional[datetime] = None,
+        full_window_days: int = 14,
+    ) -> dict:
+        query = {
             "job_title_or": [title.lower() for title in step.title_stems], 
             "job_country_code_or": [location.country_code.upper() or "GB"],
-            "posted_at_max_age_days": 14,
-            "limit": min(limit, 5),
+            "limit": min(limit, PROVIDER_LIMIT_CAPS["theirstack"]),
             "job_location_pattern_or": [location.city]
-        }
\ No newline at end of file
+        }
+        age = days_since(since)
+        if age is not None and age < full_window_days:
+            query["posted_at_gte"] = since.date().isoformat()
+        else:
+            query["posted_at_max_age_days"] = full_window_days
+        return query
\ No newline at end of file
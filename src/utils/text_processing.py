@@ -1,4 +1,5 @@
 """Generic String Manipulation"""
+import hashlib
 import re
 from typing import List
 from rapidfuzz import fuzz
@@ -14,6 +15,11 @@ def clean_text_for_embedding(text: str) -> str:
     return text.strip()
 
 
+def description_hash(text: str) -> str:
+    """Fingerprint of the text a job is embedded from, stored to tell unchanged postings apart."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
 def sanitize_query(q: str) -> str:
     """Cleans up Boolean queries for API compatibility (Google/LinkedIn)."""
     q = q.upper().strip()
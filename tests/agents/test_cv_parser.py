@@ -23,7 +23,7 @@ async def test_cv_parser_node_fetches_existing(
         }
     }
 
-    mock_storage_service.fetch_candidate_profile.return_value = mock_candidate_profile
+    mock_storage_service.fetch_candidate_profile_async.return_value = mock_candidate_profile
 
     result = await cv_parser_node(mock_state, config)
 
@@ -48,7 +48,7 @@ async def test_cv_parser_node_parses_new(
         "structured_response": mock_candidate_profile
     })
     
-    mock_storage_service.save_candidate_profile.return_value = "new_prof_id"
+    mock_storage_service.save_candidate_profile_async.return_value = "new_prof_id"
 
     config = {
         "configurable": {
@@ -64,7 +64,7 @@ async def test_cv_parser_node_parses_new(
     assert result["active_profile_id"] == "new_prof_id"
     
     mock_agent.ainvoke.assert_called_once()
-    mock_storage_service.save_candidate_profile.assert_called_once()
+    mock_storage_service.save_candidate_profile_async.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -1,8 +1,10 @@
+import asyncio
+
 import pytest
 from unittest.mock import MagicMock, AsyncMock
 
 from src.agents.researcher import researcher_node
-from src.schema import SearchQueryPlan, RawJobMatchList
+from src.schema import SearchQueryPlan, RawJobMatch, RawJobMatchList
 
 @pytest.mark.asyncio
 async def test_researcher_node_success(
@@ -15,8 +17,12 @@ async def test_researcher_node_success(
     mock_settings,
     mock_location_data
 ):
+    async def stream_jobs(*args, **kwargs):
+        yield RawJobMatchList(jobs=[mock_raw_job])
+
     mock_scraper = MagicMock()
-    mock_scraper.run_research = AsyncMock(return_value=RawJobMatchList(jobs=[mock_raw_job]))
+    mock_scraper.run_research_stream = stream_jobs
+    mock_scraper.revised_jobs = []
 
     mock_config["configurable"] = {
         "storage_service": mock_storage_service,
@@ -29,7 +35,7 @@ async def test_researcher_node_success(
     }
     mock_state["active_profile_id"] = "test"
     mock_agent.ainvoke = AsyncMock(return_value={"structured_response": mock_search_query_plan})
-    mock_storage_service.sync_global_library.return_value = [mock_raw_job]
+    mock_storage_service.sync_global_library_async.return_value = [mock_raw_job]
 
     result = await researcher_node(mock_state, mock_config)
 
@@ -65,4 +71,141 @@ async def test_researcher_node_no_queries_found(
     result = await researcher_node(mock_state, mock_config)
 
     assert "research_data" in result
-    assert len(result["research_data"].jobs) == 0
\ No newline at end of file
+    assert len(result["research_data"].jobs) == 0
+
+
+@pytest.mark.asyncio
+async def test_researcher_node_resumes_from_saved_search_watermark(
+    mock_agent,
+    mock_state,
+    mock_config,
+    mock_search_query_plan,
+    mock_storage_service,
+    mock_settings,
+    mock_location_data,
+    isolated_saved_searches,
+):
+    seen_since = []
+
+    async def stream_jobs(queries, location, since=None, **kwargs):
+        seen_since.append(since)
+        return
+        yield
+
+    mock_scraper = MagicMock()
+    mock_scraper.run_research_stream = stream_jobs
+    mock_scraper.revised_jobs = []
+    mock_scraper.covered_all_sources.return_value = True
+
+    mock_config["configurable"] = {
+        "storage_service": mock_storage_service,
+        "job_scraper": mock_scraper,
+        "researcher_agent": mock_agent,
+        "pipeline_settings": mock_settings,
+        "location": mock_location_data,
+        "role": "Wizard"
+    }
+    mock_state["active_profile_id"] = "test"
+    mock_agent.ainvoke = AsyncMock(return_value={"structured_response": mock_search_query_plan})
+
+    await researcher_node(mock_state, mock_config)
+    await researcher_node(mock_state, mock_config)
+
+    stored = isolated_saved_searches.get_or_create("test", "Wizard", mock_location_data)
+    assert seen_since[0] is None
+    assert seen_since[1] is not None
+    assert stored.last_run_at >= seen_since[1]
+
+
+@pytest.mark.asyncio
+async def test_researcher_node_keeps_watermark_when_a_provider_failed(
+    mock_agent,
+    mock_state,
+    mock_config,
+    mock_search_query_plan,
+    mock_storage_service,
+    mock_settings,
+    mock_location_data,
+    isolated_saved_searches,
+):
+    async def stream_jobs(*args, **kwargs):
+        return
+        yield
+
+    mock_scraper = MagicMock()
+    mock_scraper.run_research_stream = stream_jobs
+    mock_scraper.revised_jobs = []
+    mock_scraper.covered_all_sources.return_value = False
+
+    mock_config["configurable"] = {
+        "storage_service": mock_storage_service,
+        "job_scraper": mock_scraper,
+        "researcher_agent": mock_agent,
+        "pipeline_settings": mock_settings,
+        "location": mock_location_data,
+        "role": "Wizard"
+    }
+    mock_state["active_profile_id"] = "test"
+    mock_agent.ainvoke = AsyncMock(return_value={"structured_response": mock_search_query_plan})
+
+    await researcher_node(mock_state, mock_config)
+
+    assert isolated_saved_searches.get_or_create("test", "Wizard", mock_location_data).last_run_at is None
+
+
+@pytest.mark.asyncio
+async def test_researcher_node_resyncs_jobs_that_absorb_a_late_duplicate(
+    mock_agent,
+    mock_state,
+    mock_config,
+    mock_search_query_plan,
+    mock_storage_service,
+    mock_settings,
+    mock_location_data,
+    scraper_service,
+):
+    def posting(url):
+        return RawJobMatch(
+            title="Data Engineer", company_name="Acme", location="London", job_url=url,
+            description="Build batch and streaming pipelines on AWS with Airflow and dbt.",
+        )
+
+    async def fast(*args):
+        return [posting("https://reed.co.uk/1")]
+
+    async def slow(*args):
+        await asyncio.sleep(0.05)
+        return [posting("https://linkedin.com/1")]
+
+    events, batches = [], []
+
+    async def sync(batch, rewrite=False, **kwargs):
+        batches.append(batch)
+        events.append(("start", rewrite, [list(job.alternate_urls) for job in batch.jobs]))
+        await asyncio.sleep(0.1)
+        events.append(("end", rewrite))
+        return [job.model_copy(deep=True) for job in batch.jobs]
+
+    scraper_service._build_tasks = lambda queries, location: [(None, fast()), (None, slow())]
+    mock_storage_service.sync_global_library_async = AsyncMock(side_effect=sync)
+    mock_config["configurable"] = {
+        "storage_service": mock_storage_service,
+        "job_scraper": scraper_service,
+        "researcher_agent": mock_agent,
+        "pipeline_settings": mock_settings,
+        "location": mock_location_data,
+        "role": "Wizard"
+    }
+    mock_state["active_profile_id"] = "test"
+    mock_agent.ainvoke = AsyncMock(return_value={"structured_response": mock_search_query_plan})
+
+    result = await researcher_node(mock_state, mock_config)
+
+    assert events == [
+        ("start", False, [[]]),
+        ("end", False),
+        ("start", True, [["https://linkedin.com/1"]]),
+        ("end", True),
+    ]
+    assert batches[0].jobs[0].alternate_urls == []
+    assert [job.alternate_urls for job in result["research_data"].jobs] == [["https://linkedin.com/1"]]
@@ -1,7 +1,9 @@
+import asyncio
 import pytest
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 from src.agents.writer import writer_node
 from src.schema import AnalysedJobMatchList
+from src.services.deadline import RunDeadline
 
 @pytest.mark.asyncio
 @pytest.mark.asyncio
@@ -14,7 +16,7 @@ async def test_writer_node_cache_hit_only(
 ):
     mock_config["configurable"]["storage_service"] = mock_storage_service
     
-    mock_storage_service.check_analysis_cache.return_value = ([mock_analysed_job], [])
+    mock_storage_service.check_analysis_cache_async.return_value = ([mock_analysed_job], [])
 
     result = await writer_node(mock_state, mock_config)
 
@@ -44,7 +46,7 @@ async def test_writer_node_cache_miss_triggers_llm(
         "active_profile_id": "prof_123",
     }
 
-    mock_storage_service.check_analysis_cache.return_value = ([], [mock_raw_job])
+    mock_storage_service.check_analysis_cache_async.return_value = ([], [mock_raw_job])
     mock_agent.ainvoke = AsyncMock(
         return_value={
             "structured_response": AnalysedJobMatchList(jobs=[mock_analysed_job])
@@ -55,4 +57,42 @@ async def test_writer_node_cache_miss_triggers_llm(
 
     assert "writer_data" in result
     mock_agent.ainvoke.assert_called_once()
-    mock_storage_service.save_job_analyses.assert_called_once()
\ No newline at end of file
+    mock_storage_service.save_job_analyses_async.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_writer_node_keeps_finished_chunks_when_deadline_passes(
+    mock_state,
+    mock_config,
+    mock_raw_job,
+    mock_analysed_job,
+    mock_storage_service,
+    mock_settings,
+):
+    jobs = [mock_raw_job.model_copy(update={"job_url": f"https://job/{i}"}) for i in range(10)]
+    calls = 0
+
+    async def analyse(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            await asyncio.sleep(5)
+        return {"structured_response": AnalysedJobMatchList(jobs=[mock_analysed_job])}
+
+    agent = MagicMock()
+    agent.ainvoke = analyse
+    mock_settings.deadline_reserve_seconds = 0
+    deadline = RunDeadline(0.1)
+    mock_config["configurable"] = {
+        "storage_service": mock_storage_service,
+        "writer_agent": agent,
+        "pipeline_settings": mock_settings,
+        "deadline": deadline,
+    }
+    mock_storage_service.check_analysis_cache_async.return_value = ([], jobs)
+
+    result = await writer_node(mock_state, mock_config)
+
+    assert len(result["writer_data"]["jobs"]) == 1
+    assert sorted(d.item for d in deadline.dropped) == sorted(j.job_url for j in jobs[5:])
+    mock_storage_service.save_job_analyses_async.assert_called_once()
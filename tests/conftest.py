@@ -17,6 +17,9 @@ from src.schema import (
     LocationData
 )
 from src.services.job_scraper import JobScraperService
+from src.services.query_allocator import YieldHistory
+from src.services.saved_searches import SavedSearchStore
+from src.services.scraper_metrics import ScraperMetricsStore
 
 @pytest.fixture(autouse=True)
 def mock_streamlit(monkeypatch):
@@ -35,6 +38,35 @@ def mock_streamlit(monkeypatch):
     monkeypatch.setattr("streamlit.secrets", mock_secrets)
     return mock_session, mock_secrets
 
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers(monkeypatch):
+    """Breakers are process-wide; give every test a healthy set of providers."""
+    monkeypatch.setattr("src.services.resilience._registry", None)
+
+@pytest.fixture(autouse=True)
+def isolated_saved_searches(tmp_path, monkeypatch):
+    """Keeps search watermarks out of the working tree and independent between tests."""
+    store = SavedSearchStore(str(tmp_path / "saved_searches.sqlite3"))
+    monkeypatch.setattr("src.agents.researcher.get_saved_search_store", lambda path: store)
+    yield store
+    store.close()
+
+@pytest.fixture(autouse=True)
+def isolated_yield_history(tmp_path, monkeypatch):
+    """Provider yield history is persistent; keep it per-test and out of the working tree."""
+    history = YieldHistory(str(tmp_path / "provider_yield.sqlite3"))
+    monkeypatch.setattr("src.services.job_scraper.get_yield_history", lambda path: history)
+    yield history
+    history.close()
+
+@pytest.fixture(autouse=True)
+def isolated_metrics_store(tmp_path, monkeypatch):
+    """Run metrics are persisted; keep them per-test and out of the working tree."""
+    store = ScraperMetricsStore(str(tmp_path / "scraper_metrics.sqlite3"))
+    monkeypatch.setattr("src.services.job_scraper.get_metrics_store", lambda path, retention_days: store)
+    yield store
+    store.close()
+
 @pytest.fixture
 def mock_settings():
     settings = PipelineSettings()
@@ -156,6 +188,11 @@ def mock_storage_service():
     service.check_analysis_cache = MagicMock()
     service.save_job_analyses = MagicMock()
     service.sync_global_library = MagicMock()
+    service.sync_global_library_async = AsyncMock()
+    service.save_candidate_profile_async = AsyncMock()
+    service.fetch_candidate_profile_async = AsyncMock(return_value=MagicMock())
+    service.check_analysis_cache_async = AsyncMock()
+    service.save_job_analyses_async = AsyncMock()
     service.find_all_candidate_profiles = MagicMock()
     service.find_all_jobs_for_user = MagicMock()
     
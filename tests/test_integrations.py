@@ -67,7 +67,10 @@ async def test_full_graph_execution(
     real_storage._get_store = MagicMock(return_value=mock_store)
     
     real_scraper = JobScraperService(mock_settings)
-    real_scraper.run_research = AsyncMock(return_value=RawJobMatchList(jobs=[mock_raw_job]))
+    async def stream_jobs(*args, **kwargs):
+        yield RawJobMatchList(jobs=[mock_raw_job])
+
+    real_scraper.run_research_stream = stream_jobs
 
     mock_agent.ainvoke.side_effect = [
         {"structured_response": mock_candidate_profile}, 
@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.services.deadline import RunDeadline
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_unbounded_deadline_never_expires():
+    deadline = RunDeadline()
+
+    assert deadline.remaining() is None
+    assert not deadline.expired()
+    assert deadline.http_timeout(httpx.Timeout(30.0)) == httpx.Timeout(30.0)
+
+
+def test_remaining_counts_down_and_honours_reserve():
+    clock = FakeClock()
+    deadline = RunDeadline(10.0, clock=clock)
+    clock.now = 4.0
+
+    assert deadline.remaining() == 6.0
+    assert deadline.remaining(reserve=5.0) == 1.0
+    assert deadline.expired(reserve=6.0)
+
+
+def test_http_timeout_is_capped_by_remaining_budget():
+    clock = FakeClock()
+    deadline = RunDeadline(10.0, clock=clock)
+    clock.now = 8.0
+
+    timeout = deadline.http_timeout(httpx.Timeout(30.0, connect=1.0))
+
+    assert timeout.read == 2.0
+    assert timeout.connect == 1.0
+
+
+@pytest.mark.asyncio
+async def test_gather_cancels_late_tasks_and_reports_their_items():
+    deadline = RunDeadline(0.05)
+    cancelled = asyncio.Event()
+
+    async def fast():
+        return "done"
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    fast_task, slow_task = asyncio.create_task(fast()), asyncio.create_task(slow())
+    results = await deadline.gather({fast_task: ["a"], slow_task: ["b", "c"]}, "writer")
+
+    assert results == {fast_task: "done"}
+    assert cancelled.is_set()
+    assert [(d.stage, d.item) for d in deadline.report().dropped] == [("writer", "b"), ("writer", "c")]
+    assert deadline.report().expired
+
+
+@pytest.mark.asyncio
+async def test_within_returns_default_after_deadline():
+    deadline = RunDeadline(0.01)
+
+    result = await deadline.within(asyncio.sleep(5, result="late"), "researcher", "strategy", default="fallback")
+
+    assert result == "fallback"
+    assert deadline.dropped[0].item == "strategy"
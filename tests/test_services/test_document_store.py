@@ -0,0 +1,33 @@
+import pytest
+
+from src.services.document_store import DocumentStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DocumentStore(str(tmp_path / "documents.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_fields_round_trip_and_can_be_read_alone(store):
+    store.put_many("jobs", {
+        "a": {"description": "Long text " * 200, "qualifications": '["Python"]'},
+        "b": {"description": "Other", "benefits": ["Remote"]},
+    })
+
+    assert store.get_many("jobs", ["a", "b", "missing"]) == {
+        "a": {"description": "Long text " * 200, "qualifications": '["Python"]'},
+        "b": {"description": "Other", "benefits": ["Remote"]},
+    }
+    assert store.get_many("jobs", ["a", "b"], fields=["qualifications"]) == {"a": {"qualifications": '["Python"]'}}
+    assert store.get_many("analyses", ["a"]) == {}
+
+
+def test_rewrites_replace_old_fields_and_retain_drops_orphans(store):
+    store.put_many("jobs", {"a": {"description": "old", "benefits": "[]"}, "b": {"description": "b"}})
+    store.put_many("jobs", {"a": {"description": "new"}})
+
+    assert store.get_many("jobs", ["a"]) == {"a": {"description": "new"}}
+    assert store.retain("jobs", {"a"}) == 1
+    assert list(store.get_many("jobs", ["a", "b"])) == ["a"]
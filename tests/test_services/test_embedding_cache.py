@@ -0,0 +1,59 @@
+import pytest
+
+from src.services.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+class CountingEmbeddings:
+    def __init__(self):
+        self.documents = []
+        self.queries = []
+
+    def embed_documents(self, texts):
+        self.documents.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return [float(len(text)), -1.0]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite3"))
+    yield cache
+    cache.close()
+
+
+def test_only_unseen_text_reaches_the_model(cache):
+    inner = CountingEmbeddings()
+    embeddings = CachedEmbeddings(inner, "gemini-embedding-001", cache)
+
+    first = embeddings.embed_documents(["python role", "java role"])
+    second = embeddings.embed_documents(["java role", "rust role", "python role"])
+
+    assert inner.documents == [["python role", "java role"], ["rust role"]]
+    assert second == [first[1], [9.0, 1.0], first[0]]
+
+
+def test_queries_models_and_restarts_are_keyed_separately(cache, tmp_path):
+    inner = CountingEmbeddings()
+    CachedEmbeddings(inner, "model-a", cache).embed_documents(["same text"])
+
+    assert CachedEmbeddings(inner, "model-a", cache).embed_query("same text") == [9.0, -1.0]
+    CachedEmbeddings(inner, "model-b", cache).embed_documents(["same text"])
+    assert len(inner.documents) == 2 and inner.queries == ["same text"]
+
+    reopened = EmbeddingCache(str(tmp_path / "embeddings.sqlite3"))
+    CachedEmbeddings(inner, "model-a", reopened).embed_documents(["same text"])
+    reopened.close()
+    assert len(inner.documents) == 2
+
+
+def test_eviction_keeps_the_cache_under_its_byte_budget(cache):
+    cache.max_bytes = 3 * 8
+    for i in range(5):
+        cache.put_many("m", {f"k{i}": [1.0, 2.0]})
+    cache.get_many(["k2"])
+    cache.put_many("m", {"k5": [1.0, 2.0]})
+
+    assert set(cache.get_many([f"k{i}" for i in range(6)])) == {"k2", "k4", "k5"}
@@ -0,0 +1,104 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from src.schema import HedgePolicy
+from src.services.hedging import Hedger, LatencyWindow
+
+POLICY = HedgePolicy(min_samples=3, min_delay_seconds=0.0)
+
+
+def warmed_hedger(provider="indeed", latency=0.01):
+    hedger = Hedger()
+    for _ in range(5):
+        hedger.window(provider).observe(latency)
+    return hedger
+
+
+def slot(granted):
+    @asynccontextmanager
+    async def try_slot():
+        yield granted
+
+    return try_slot
+
+
+def test_latency_window_quantile():
+    window = LatencyWindow()
+    for ms in range(1, 101):
+        window.observe(ms / 1000)
+
+    assert window.quantile(0.9) == pytest.approx(0.09)
+    assert window.quantile(0.5) == pytest.approx(0.05)
+
+
+def test_no_hedge_until_enough_samples():
+    hedger = Hedger()
+    hedger.window("indeed").observe(1.0)
+
+    assert hedger.hedge_delay("indeed", POLICY) is None
+    assert hedger.hedge_delay("indeed", None) is None
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_beaten_by_hedge_and_cancelled():
+    hedger = warmed_hedger()
+    calls = []
+    primary_cancelled = asyncio.Event()
+
+    async def call():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                primary_cancelled.set()
+                raise
+        return f"answer {len(calls)}"
+
+    result, outcome = await hedger.race("indeed", POLICY, call, slot(True))
+    await asyncio.sleep(0)
+
+    assert result == "answer 2"
+    assert outcome.fired and outcome.won
+    assert primary_cancelled.is_set()
+    assert hedger.stats()["indeed"]["won"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_is_suppressed_without_rate_capacity():
+    hedger = warmed_hedger()
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    result, outcome = await hedger.race("indeed", POLICY, call, slot(False))
+
+    assert result == "primary"
+    assert calls == 1
+    assert outcome.suppressed and not outcome.fired
+
+
+@pytest.mark.asyncio
+async def test_hedge_answer_is_used_when_primary_fails():
+    hedger = warmed_hedger()
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(0.05)
+            raise ConnectionError("primary dropped")
+        await asyncio.sleep(0.1)
+        return "hedge"
+
+    result, outcome = await hedger.race("indeed", POLICY, call, slot(True))
+
+    assert result == "hedge"
+    assert outcome.won
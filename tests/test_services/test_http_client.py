@@ -0,0 +1,49 @@
+import asyncio
+
+import httpx
+import pytest
+import respx
+
+from src.services.http_client import PooledHttpClient
+
+
+@pytest.fixture
+def pool():
+    client = PooledHttpClient()
+    yield client
+    client.close()
+
+
+@respx.mock
+def test_pool_reuses_clients_across_event_loops(pool):
+    """Each Streamlit run owns a fresh loop; the per-host client must survive them."""
+    respx.get("https://www.reed.co.uk/api/1.0/search").mock(
+        return_value=httpx.Response(200, json={"results": []})
+    )
+
+    first = asyncio.run(pool.get("https://www.reed.co.uk/api/1.0/search"))
+    client = pool._clients["www.reed.co.uk"]
+    second = asyncio.run(pool.get("https://www.reed.co.uk/api/1.0/search"))
+
+    assert first.status_code == second.status_code == 200
+    assert pool._clients["www.reed.co.uk"] is client
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_pool_keeps_one_client_per_host(pool):
+    respx.get("https://serpapi.com/search").mock(return_value=httpx.Response(200, json={}))
+    respx.post("https://api.theirstack.com/v1/jobs/search").mock(
+        return_value=httpx.Response(200, json={"data": []})
+    )
+
+    await pool.get("https://serpapi.com/search")
+    await pool.post("https://api.theirstack.com/v1/jobs/search", json={})
+
+    assert set(pool._clients) == {"serpapi.com", "api.theirstack.com"}
+
+
+def test_close_is_idempotent(pool):
+    pool.close()
+    pool.close()
+    assert pool._loop is None
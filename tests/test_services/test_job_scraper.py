@@ -1,8 +1,17 @@
+import asyncio
 import pytest
 import respx
 import httpx
 import re
-from src.schema import RawJobMatch, RawJobMatchList, WorkSetting
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from src.schema import RawJobMatch, RawJobMatchList, WorkSetting, HedgePolicy, ProviderRateLimit
+from src.services.deadline import RunDeadline
+from src.services.hedging import Hedger
+from src.services.job_scraper import JobScraperService, validate_job_rows
+from src.services.query_allocator import Allocation
+from src.services.rate_scheduler import RateScheduler
+from src.utils.query_compiler import JobQueryCompiler
 
 
 def test_get_best_apply_link_priority(scraper_service):
@@ -12,6 +21,7 @@ def test_get_best_apply_link_priority(scraper_service):
     ]
     assert scraper_service._get_best_apply_link(options) == "https://linkedin.com"
 
+
 def test_get_best_apply_link_fallback(scraper_service):
     options = [{"title": "UnknownSite", "link": "https://random.com"}]
     assert scraper_service._get_best_apply_link(options) == "https://random.com"
@@ -29,6 +39,7 @@ def test_map_google_to_schema_logic(scraper_service):
     assert result.salary_string == "£100k"
     assert result.company == "Tesla"
 
+
 def test_map_linkedin_to_schema_work_setting(scraper_service):
     raw_linkedin_job = {
         "title": "Remote Python Developer",
@@ -60,6 +71,7 @@ async def test_run_research_google_success(scraper_service, mock_search_query_pl
     assert len(result.jobs) == 1
     assert result.jobs[0].title == "DevOps"
 
+
 @pytest.mark.asyncio
 @respx.mock
 async def test_run_research_no_scrapers_enabled(scraper_service):
@@ -77,4 +89,316 @@ def test_process_and_deduplicate(scraper_service):
     input_data = [job1, job2]
     
     result = scraper_service._process_and_deduplicate(input_data)
-    assert len(result.jobs) == 1
\ No newline at end of file
+    assert len(result.jobs) == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_scrape_indeed_listing_failure_returns_empty(scraper_service, mock_search_query_plan, mock_location_data):
+    scraper_service.retry_policy.max_retries = 0
+    respx.get("https://api.hasdata.com/scrape/indeed/listing").mock(
+        return_value=httpx.Response(500)
+    )
+
+    result = await scraper_service._scrape_indeed(
+        scraper_service.http, mock_search_query_plan.steps[0], mock_location_data
+    )
+
+    assert result == []
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_scrape_indeed_hydrates_details_concurrently(mock_settings, mock_search_query_plan, mock_location_data):
+    scraper_service = JobScraperService(mock_settings, scheduler=RateScheduler())
+    listing = {"jobs": [
+        {"url": f"https://uk.indeed.com/job/{i}", "title": f"Job {i}", "company": "Acme"}
+        for i in range(3)
+    ]}
+    respx.get("https://api.hasdata.com/scrape/indeed/listing").mock(
+        return_value=httpx.Response(200, json=listing)
+    )
+    in_flight, peak = 0, 0
+    all_arrived = asyncio.Event()
+
+    async def slow_detail(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        if peak == 3:
+            all_arrived.set()
+        try:
+            await asyncio.wait_for(all_arrived.wait(), timeout=0.5)
+        except asyncio.TimeoutError:
+            pass
+        in_flight -= 1
+        return httpx.Response(200, json={"description": "Full text"})
+
+    detail = respx.get("https://api.hasdata.com/scrape/indeed/job").mock(side_effect=slow_detail)
+    scraper_service.scheduler.configure(
+        {"indeed": ProviderRateLimit(requests_per_second=1000, burst=1000, max_in_flight=3)}, scraper_service.rate_tier
+    )
+
+    result = await scraper_service._scrape_indeed(
+        scraper_service.http, mock_search_query_plan.steps[0], mock_location_data
+    )
+
+    assert detail.call_count == 3
+    assert peak == 3
+    assert sorted(j.title for j in result) == ["Job 0", "Job 1", "Job 2"]
+    assert all(j.description == "Full text" for j in result)
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_scrape_reed_skips_details_fresh_in_library(mock_settings, mock_search_query_plan, mock_location_data, mock_raw_job):
+    library = MagicMock()
+    library.find_fresh_global_jobs_async = AsyncMock(return_value={"https://reed.co.uk/1": mock_raw_job})
+    scraper = JobScraperService(mock_settings, library=library)
+
+    respx.get("https://www.reed.co.uk/api/1.0/search").mock(
+        return_value=httpx.Response(200, json={"results": [
+            {"jobId": 1, "jobUrl": "https://reed.co.uk/1"},
+            {"jobId": 2, "jobUrl": "https://reed.co.uk/2"},
+        ]})
+    )
+    cached_detail = respx.get("https://www.reed.co.uk/api/1.0/jobs/1")
+    fresh_detail = respx.get("https://www.reed.co.uk/api/1.0/jobs/2").mock(
+        return_value=httpx.Response(200, json={
+            "jobTitle": "Data Engineer", "employerName": "Acme",
+            "locationName": "London", "jobDescription": "Pipelines",
+        })
+    )
+
+    result = await scraper._scrape_reed(scraper.http, mock_search_query_plan.steps[0], mock_location_data)
+
+    assert not cached_detail.called
+    assert fresh_detail.call_count == 1
+    assert {j.job_url for j in result} == {mock_raw_job.job_url, "https://reed.co.uk/2"}
+
+
+@pytest.mark.asyncio
+async def test_run_research_stream_yields_each_provider_without_repeats(scraper_service, mock_search_query_plan, mock_location_data):
+    def job(url):
+        return RawJobMatch(title=f"Role at {url}", job_url=url, company_name=url, location="L")
+
+    async def fast(*args):
+        return [job("https://a.com"), job("https://b.com")]
+
+    async def slow(*args):
+        await asyncio.sleep(0.05)
+        return [job("https://b.com"), job("https://c.com")]
+
+    scraper_service._build_tasks = lambda queries, location: [(None, slow()), (None, fast())]
+
+    batches = [
+        [j.job_url for j in batch.jobs]
+        async for batch in scraper_service.run_research_stream(mock_search_query_plan.steps, mock_location_data)
+    ]
+
+    assert batches == [["https://a.com", "https://b.com"], ["https://c.com"]]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_request_retries_transient_errors_honouring_retry_after(scraper_service):
+    route = respx.get("https://serpapi.com/search").mock(side_effect=[
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(503),
+        httpx.Response(200, json={"jobs_results": []}),
+    ])
+    scraper_service.retry_policy.base_delay = 0
+
+    response = await scraper_service._request("google", scraper_service.http, "GET", "https://serpapi.com/search")
+
+    assert response.status_code == 200
+    assert route.call_count == 3
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_open_circuit_skips_provider_for_the_run(scraper_service, mock_search_query_plan, mock_location_data):
+    route = respx.get(re.compile(r"https://serpapi\.com/search.*")).mock(return_value=httpx.Response(503))
+    scraper_service.api_cfg.use_google = True
+    scraper_service.api_cfg.use_reed = False
+    scraper_service.retry_policy.max_retries = 0
+    scraper_service.scrap_cfg.breaker_failure_threshold = 1
+
+    await scraper_service.run_research(mock_search_query_plan.steps, mock_location_data)
+    await scraper_service.run_research(mock_search_query_plan.steps, mock_location_data)
+
+    assert route.call_count == 1
+    assert scraper_service.skipped_sources == {"google"}
+    assert scraper_service.provider_health()["google"]["state"] == "open"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_google_pages_until_results_stop_being_new(scraper_service, mock_search_query_plan, mock_location_data):
+    def page(urls, token):
+        return httpx.Response(200, json={
+            "jobs_results": [
+                {"title": f"Job {u}", "company_name": "Co", "apply_options": [{"link": u}]} for u in urls
+            ],
+            "serpapi_pagination": {"next_page_token": token},
+        })
+
+    route = respx.get(re.compile(r"https://serpapi\.com/search.*")).mock(side_effect=[
+        page(["u1", "u2"], "t1"),
+        page(["u1", "u3"], "t2"),
+        page(["u1", "u2"], "t3"),
+        page(["u9"], None),
+    ])
+    scraper_service.scrap_cfg.max_pages = 5
+    scraper_service.scrap_cfg.min_page_yield = 0.5
+
+    result = await scraper_service._scrape_google(scraper_service.http, mock_search_query_plan.steps[0], mock_location_data)
+
+    assert route.call_count == 3
+    assert "next_page_token=t1" in str(route.calls[1].request.url)
+    assert len(result) == 6
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_allocation_limit_caps_what_each_provider_fetches(scraper_service, mock_search_query_plan, mock_location_data):
+    step = mock_search_query_plan.steps[0]
+    google = respx.get(re.compile(r"https://serpapi\.com/search.*")).mock(side_effect=[
+        httpx.Response(200, json={
+            "jobs_results": [
+                {"title": f"Job {u}", "company_name": "Co", "apply_options": [{"link": u}]} for u in urls
+            ],
+            "serpapi_pagination": {"next_page_token": "next"},
+        })
+        for urls in (["u1", "u2"], ["u3", "u4"], ["u5", "u6"])
+    ])
+    linkedin = respx.get(re.compile(r"https://linkedin-job-search-api\.p\.rapidapi\.com/.*")).mock(
+        return_value=httpx.Response(200, json=[])
+    )
+    reed = respx.get(re.compile(r"https://www\.reed\.co\.uk/api/1\.0/search.*")).mock(
+        return_value=httpx.Response(200, json={"results": [
+            {"jobId": i, "jobUrl": f"https://reed.co.uk/{i}"} for i in range(1, 6)
+        ]})
+    )
+    reed_details = respx.get(re.compile(r"https://www\.reed\.co\.uk/api/1\.0/jobs/.*")).mock(
+        return_value=httpx.Response(200, json={})
+    )
+    scraper_service.scrap_cfg.max_pages = 5
+
+    google_jobs = await scraper_service._scrape(Allocation("google", step, 3), mock_location_data)
+    await scraper_service._scrape(Allocation("linkedin", step, 3), mock_location_data)
+    await scraper_service._scrape(Allocation("reed", step, 3), mock_location_data)
+
+    assert google.call_count == 2 and len(google_jobs) == 3
+    assert linkedin.calls[0].request.url.params["limit"] == "3"
+    assert {call.request.url.params["resultsToTake"] for call in reed.calls} == {"3"}
+    assert reed.call_count == len(JobQueryCompiler.generate_reed_queries(step))
+    assert reed_details.call_count == 3
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_reed_skips_details_for_listings_older_than_watermark(scraper_service, mock_search_query_plan, mock_location_data):
+    respx.get(re.compile(r"https://www\.reed\.co\.uk/api/1\.0/search.*")).mock(
+        return_value=httpx.Response(200, json={"results": [
+            {"jobId": 1, "jobUrl": "https://reed/1", "date": "01/01/2026"},
+            {"jobId": 2, "jobUrl": "https://reed/2", "date": "20/01/2026"},
+        ]})
+    )
+    old_detail = respx.get("https://www.reed.co.uk/api/1.0/jobs/1").mock(return_value=httpx.Response(200, json={}))
+    new_detail = respx.get("https://www.reed.co.uk/api/1.0/jobs/2").mock(
+        return_value=httpx.Response(200, json={"jobTitle": "New Role", "employerName": "Co", "locationName": "London", "jobDescription": "x"})
+    )
+    scraper_service.since = datetime(2026, 1, 10, tzinfo=timezone.utc)
+
+    await scraper_service._scrape_reed(scraper_service.http, mock_search_query_plan.steps[0], mock_location_data)
+
+    assert not old_detail.called
+    assert new_detail.called
+
+
+def test_validate_job_rows_drops_only_invalid_rows():
+    rows = [
+        {"title": "Good", "company_name": "Co", "location": "L", "job_url": "https://good"},
+        {"title": None, "company_name": "Co", "location": "L", "job_url": "https://bad"},
+        {"title": "Also Good", "company_name": "Co", "location": "L", "job_url": "https://also"},
+    ]
+
+    jobs = validate_job_rows(rows)
+
+    assert [j.job_url for j in jobs] == ["https://good", "https://also"]
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_large_theirstack_page_is_mapped_off_the_loop(scraper_service, mock_search_query_plan, mock_location_data, monkeypatch):
+    offloaded = []
+    real_to_thread = asyncio.to_thread
+
+    async def spy(func, *args):
+        offloaded.append(len(args[0]))
+        return await real_to_thread(func, *args)
+
+    monkeypatch.setattr("src.services.job_scraper.asyncio.to_thread", spy)
+    respx.post("https://api.theirstack.com/v1/jobs/search").mock(return_value=httpx.Response(200, json={"data": [
+        {"job_title": f"Job {i}", "company": "Co", "url": f"https://ts/{i}", "description": "d"} for i in range(5)
+    ]}))
+    scraper_service.api_cfg.theirstack_key = "key"
+    scraper_service.scrap_cfg.mapping_offload_threshold = 5
+
+    result = await scraper_service._scrape_theirstack(scraper_service.http, mock_search_query_plan.steps[0], mock_location_data)
+
+    assert offloaded == [5]
+    assert len(result) == 5
+
+
+@pytest.mark.asyncio
+async def test_run_research_stream_cancels_providers_still_running_at_deadline(scraper_service, mock_search_query_plan, mock_location_data):
+    step = mock_search_query_plan.steps[0]
+
+    async def fast(*args):
+        return [RawJobMatch(title="Quick", job_url="https://quick", company_name="Co", location="L")]
+
+    async def hung(*args):
+        await asyncio.sleep(5)
+        return []
+
+    scraper_service._build_tasks = lambda queries, location: [
+        (Allocation("google", step, 10), fast()),
+        (Allocation("reed", step, 10), hung()),
+    ]
+    deadline = RunDeadline(0.05)
+
+    result = await scraper_service.run_research(mock_search_query_plan.steps, mock_location_data, deadline=deadline)
+
+    assert [j.job_url for j in result.jobs] == ["https://quick"]
+    assert [d.item.split(":")[0] for d in deadline.dropped] == ["reed"]
+    assert not scraper_service.covered_all_sources()
+
+
+@pytest.mark.asyncio
+async def test_hedged_get_is_reported_in_run_metrics(scraper_service):
+    class SlowThenFastClient:
+        timeout = None
+
+        def __init__(self):
+            self.calls = 0
+
+        async def request(self, method, url, **kwargs):
+            self.calls += 1
+            if self.calls == 1:
+                await asyncio.sleep(5)
+            return httpx.Response(200, json={}, request=httpx.Request(method, url))
+
+    scraper_service.hedger = Hedger()
+    for _ in range(20):
+        scraper_service.hedger.window("indeed").observe(0.01)
+    scraper_service.scrap_cfg.hedge_policies = {"indeed": HedgePolicy(min_delay_seconds=0.0)}
+    client = SlowThenFastClient()
+
+    response = await scraper_service._request("indeed", client, "GET", "https://api.hasdata.com/scrape/indeed/job")
+
+    assert response.status_code == 200
+    assert client.calls == 2
+    stats = scraper_service.metrics.provider("indeed")
+    assert (stats.hedges_fired, stats.hedges_won) == (1, 1)
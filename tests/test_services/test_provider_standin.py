@@ -0,0 +1,75 @@
+import json
+
+import httpx
+import pytest
+
+from src.services.http_client import PooledHttpClient
+from src.services.job_scraper import JobScraperService
+from src.services.provider_standin import (
+    ProviderStandInTransport,
+    RecordingTransport,
+    ReplayTransport,
+    StandInBehaviour,
+)
+from src.schema import ProviderRateLimit
+from src.services.rate_scheduler import RateScheduler
+
+INSTANT = StandInBehaviour(latency_ms=0, jitter_ms=0, total_results=20, overlap=0.5)
+
+
+@pytest.fixture
+def all_providers(mock_settings):
+    api = mock_settings.api_settings
+    api.serpapi_key = api.rapidapi_key = api.reed_key = api.indeed_key = api.theirstack_key = "secret-key"
+    api.use_google = api.use_linkedin = api.use_reed = api.use_indeed = api.use_theirstack = True
+    unthrottled = ProviderRateLimit(requests_per_second=1000, burst=1000, max_in_flight=50)
+    mock_settings.scraper_settings.rate_limits = {
+        provider: unthrottled for provider in ["google", "linkedin", "reed", "indeed", "theirstack"]
+    }
+    return mock_settings
+
+
+@pytest.mark.asyncio
+async def test_scraper_runs_offline_against_standin(all_providers, mock_search_query_plan, mock_location_data):
+    standin = ProviderStandInTransport(default=INSTANT)
+    pool = PooledHttpClient(transport=standin)
+    scraper = JobScraperService(all_providers, http_client=pool, scheduler=RateScheduler())
+    try:
+        jobs, metrics = await scraper.run_research_with_metrics(mock_search_query_plan.steps, mock_location_data)
+    finally:
+        pool.close()
+
+    assert set(metrics.providers) == {"google", "linkedin", "reed", "indeed", "theirstack"}
+    assert set(standin.stats) == set(metrics.providers)
+    assert any(job.alternate_urls for job in jobs.jobs)
+
+
+@pytest.mark.asyncio
+async def test_standin_rate_limits_with_retry_after():
+    standin = ProviderStandInTransport(default=StandInBehaviour(latency_ms=0, jitter_ms=0, rate_limit_rps=1, retry_after_s=2))
+    async with httpx.AsyncClient(transport=standin) as client:
+        first = await client.get("https://www.reed.co.uk/api/1.0/search", params={"keywords": "python"})
+        second = await client.get("https://www.reed.co.uk/api/1.0/search", params={"keywords": "python"})
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert second.headers["Retry-After"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_recorded_responses_replay_without_credentials(tmp_path):
+    fixtures = tmp_path / "fixtures"
+    recorder = RecordingTransport(str(fixtures), inner=ProviderStandInTransport(default=INSTANT))
+    params = {"engine": "google_jobs", "q": "(Data Engineer) Python", "api_key": "secret-key"}
+    async with httpx.AsyncClient(transport=recorder) as client:
+        recorded = await client.get("https://serpapi.com/search", params=params)
+
+    replay = ReplayTransport(str(fixtures))
+    async with httpx.AsyncClient(transport=replay) as client:
+        replayed = await client.get("https://serpapi.com/search", params={**params, "api_key": "other-key"})
+        missing = await client.get("https://serpapi.com/search", params={"q": "never recorded"})
+
+    saved = [json.loads(p.read_text()) for p in fixtures.iterdir()]
+    assert replayed.json() == recorded.json()
+    assert missing.status_code == 404
+    assert len(saved) == 1 and "secret-key" not in json.dumps(saved)
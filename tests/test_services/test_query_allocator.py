@@ -0,0 +1,100 @@
+import re
+
+import httpx
+import pytest
+import respx
+
+from src.schema import ProviderCost, SearchStep
+from src.services.query_allocator import CreditLedger, QueryAllocator, YieldHistory, query_shape
+
+
+@pytest.fixture
+def history(tmp_path):
+    return YieldHistory(str(tmp_path / "yield.sqlite3"))
+
+
+@pytest.fixture
+def steps():
+    return [
+        SearchStep(title_stems=["Data Engineer"], must_have_skills=["Python"], reasoning="core"),
+        SearchStep(title_stems=["Analytics Engineer"], must_have_skills=["dbt"], reasoning="adjacent"),
+    ]
+
+
+COSTS = {
+    "google": ProviderCost(per_call=1.0),
+    "reed": ProviderCost(),
+    "theirstack": ProviderCost(per_job=1.0),
+}
+
+
+def test_no_budget_runs_every_pair(history, steps):
+    allocator = QueryAllocator(COSTS, history, CreditLedger(None), max_jobs=10)
+
+    planned, dropped = allocator.allocate([("google", steps[0]), ("theirstack", steps[1])])
+
+    assert [(a.provider, a.limit) for a in planned] == [("google", 10), ("theirstack", 10)]
+    assert dropped == []
+
+
+def test_budget_favours_pairs_that_recently_returned_new_jobs(history, steps):
+    history.record("google", query_shape(steps[0]), 1)
+    history.record("google", query_shape(steps[1]), 8)
+    allocator = QueryAllocator(COSTS, history, CreditLedger(1), max_jobs=10)
+
+    planned, dropped = allocator.allocate([("google", steps[0]), ("google", steps[1]), ("reed", steps[0])])
+
+    assert [(a.provider, a.step.reasoning) for a in planned] == [("google", "adjacent"), ("reed", "core")]
+    assert [a.step.reasoning for a in dropped] == ["core"]
+
+
+def test_similar_query_shapes_share_history(history, steps):
+    history.record("google", query_shape(steps[0]), 9)
+    similar = SearchStep(title_stems=["Senior Data Engineer"], must_have_skills=["Python"], reasoning="lead")
+
+    assert history.expected_new_jobs("google", query_shape(similar)) == pytest.approx(9)
+    assert history.expected_new_jobs("google", query_shape(steps[1])) is None
+
+
+def test_per_job_providers_are_trimmed_to_the_remaining_budget(history, steps):
+    ledger = CreditLedger(4)
+    allocator = QueryAllocator(COSTS, history, ledger, max_jobs=10)
+
+    planned, _ = allocator.allocate([("theirstack", steps[0])])
+
+    assert planned[0].limit == 4
+    assert ledger.remaining == 0
+
+
+def test_per_job_pricing_uses_the_provider_request_cap(history, steps):
+    ledger = CreditLedger(12)
+    allocator = QueryAllocator(COSTS, history, ledger, max_jobs=10, limit_caps={"theirstack": 5})
+
+    planned, dropped = allocator.allocate([("theirstack", steps[0]), ("theirstack", steps[1])])
+
+    assert [(a.limit, a.credits) for a in planned] == [(5, 5.0), (5, 5.0)]
+    assert dropped == []
+    assert ledger.remaining == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_scraper_spends_budget_and_records_yield(scraper_service, isolated_yield_history, mock_location_data, steps):
+    route = respx.get(re.compile(r"https://serpapi\.com/search.*")).mock(
+        return_value=httpx.Response(200, json={"jobs_results": [
+            {"title": "Data Engineer", "company_name": "Co", "apply_options": [{"link": "https://g/1"}]}
+        ]})
+    )
+    scraper_service.api_cfg.use_google = True
+    scraper_service.api_cfg.use_reed = False
+    scraper_service.scrap_cfg.credit_budget = 1
+
+    await scraper_service.run_research(steps, mock_location_data)
+
+    assert route.call_count == 1
+    assert len(scraper_service.dropped_allocations) == 1
+    assert not scraper_service.covered_all_sources()
+    recorded = [
+        isolated_yield_history.expected_new_jobs("google", query_shape(step)) for step in steps
+    ]
+    assert sorted(recorded, key=lambda v: v is None) == [1, None]
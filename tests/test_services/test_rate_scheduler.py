@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from src.schema import ProviderRateLimit, ScraperSettings
+from src.services.job_scraper import JobScraperService
+from src.services.rate_scheduler import DEFAULT_TIER, RateScheduler, TokenBucket
+from src.utils.func import BudgetExhaustedError
+
+
+def test_token_bucket_allows_burst_then_asks_to_wait():
+    bucket = TokenBucket(rate=2.0, burst=2)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.5, abs=0.05)
+
+
+@pytest.mark.asyncio
+async def test_slot_caps_in_flight_requests():
+    scheduler = RateScheduler(
+        {"reed": ProviderRateLimit(requests_per_second=1000, burst=1000, max_in_flight=2)}
+    )
+    active, peak = 0, 0
+
+    async def call():
+        nonlocal active, peak
+        async with scheduler.slot("reed"):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*[call() for _ in range(6)])
+
+    assert peak == 2
+    assert scheduler.wait_stats()["reed"]["requests"] == 6
+
+
+@pytest.mark.asyncio
+async def test_slot_raises_once_daily_budget_is_spent():
+    scheduler = RateScheduler({"theirstack": ProviderRateLimit(daily_budget=1)})
+
+    async with scheduler.slot("theirstack"):
+        pass
+
+    with pytest.raises(BudgetExhaustedError):
+        async with scheduler.slot("theirstack"):
+            pass
+
+
+def test_free_tier_overrides_linkedin_limits():
+    settings = ScraperSettings()
+
+    limits = settings.resolve_rate_limits(free_tier=True)
+
+    assert limits["linkedin"].max_in_flight == 1
+    assert limits["reed"] == settings.rate_limits["reed"]
+
+
+@pytest.mark.asyncio
+async def test_try_slot_declines_instead_of_queueing():
+    scheduler = RateScheduler(
+        {"indeed": ProviderRateLimit(requests_per_second=1000, burst=1000, max_in_flight=1)}
+    )
+
+    async with scheduler.slot("indeed"):
+        async with scheduler.try_slot("indeed") as granted:
+            assert granted is False
+
+    async with scheduler.try_slot("indeed") as granted:
+        assert granted is True
+
+
+
+def test_lanes_are_kept_per_provider_and_tier(mock_settings):
+    scheduler = RateScheduler()
+    mock_settings.api_settings.free_tier = True
+    free = JobScraperService(mock_settings, scheduler=scheduler)
+    mock_settings.api_settings.free_tier = False
+    paid = JobScraperService(mock_settings, scheduler=scheduler)
+    limits = mock_settings.scraper_settings
+
+    assert scheduler._lane("linkedin", free.rate_tier).limits == limits.free_tier_rate_limits["linkedin"]
+    assert scheduler._lane("linkedin", paid.rate_tier).limits == limits.rate_limits["linkedin"]
+
+
+@pytest.mark.asyncio
+async def test_reconfiguring_a_tier_updates_its_existing_lane():
+    scheduler = RateScheduler({"reed": ProviderRateLimit(requests_per_second=1000, burst=1000, max_in_flight=1)})
+    scheduler.configure({"reed": ProviderRateLimit(max_in_flight=1)}, "free")
+    entered = asyncio.Event()
+
+    async def queued():
+        async with scheduler.slot("reed"):
+            entered.set()
+
+    async with scheduler.slot("reed"):
+        waiter = asyncio.create_task(queued())
+        await asyncio.sleep(0.01)
+        assert not entered.is_set()
+
+        scheduler.configure({"reed": ProviderRateLimit(requests_per_second=500, burst=50, max_in_flight=2)})
+        await asyncio.wait_for(entered.wait(), timeout=1)
+
+    await waiter
+    lane = scheduler._lane("reed", DEFAULT_TIER)
+    assert (lane.bucket.rate, lane.bucket.burst, lane.in_flight.limit) == (500, 50, 2)
+    assert scheduler._lane("reed", "free").in_flight.limit == 1
@@ -0,0 +1,35 @@
+from unittest.mock import patch
+
+import httpx
+
+from src.services.resilience import CircuitBreaker, RetryPolicy, retry_after_seconds
+
+
+def test_breaker_opens_then_lets_one_probe_through_after_cooldown():
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=10)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    with patch("src.services.resilience.monotonic", return_value=breaker._opened_at + 11):
+        assert breaker.allow()
+        assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.snapshot()["state"] == "closed"
+
+
+def test_backoff_gives_up_after_max_retries_or_long_retry_after():
+    policy = RetryPolicy(max_retries=2, base_delay=1, max_delay=4, max_retry_after=30)
+
+    assert 0 <= policy.backoff(1) <= 2
+    assert policy.backoff(0, retry_after=5) == 5
+    assert policy.backoff(0, retry_after=60) is None
+    assert policy.backoff(2) is None
+
+
+def test_retry_after_accepts_http_dates():
+    response = httpx.Response(429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+
+    assert retry_after_seconds(response) == 0.0
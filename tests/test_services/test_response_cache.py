@@ -0,0 +1,82 @@
+import re
+
+import httpx
+import pytest
+import respx
+
+from src.services.job_scraper import JobScraperService
+from src.services.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    response_cache = ResponseCache(str(tmp_path / "responses.sqlite3"))
+    yield response_cache
+    response_cache.close()
+
+
+def test_make_key_normalizes_query_text():
+    a = ResponseCache.make_key("google", "get", "https://serpapi.com/search", {"q": "Data  Engineer", "gl": "uk"})
+    b = ResponseCache.make_key("google", "GET", "https://serpapi.com/search", {"gl": "UK", "q": "data engineer"})
+
+    assert a == b
+
+
+def test_make_key_keeps_opaque_params_verbatim():
+    def key(token):
+        return ResponseCache.make_key(
+            "google", "GET", "https://serpapi.com/search", {"params": {"q": "Data Engineer", "next_page_token": token}}
+        )
+
+    assert key("eyJmYyI6IkVvQUQ") != key("eyjmyyi6ikvvqud")
+
+
+def test_put_evicts_least_recently_used(cache):
+    cache.max_bytes = 80
+    cache.put("google:a", "google", {"jobs": "a" * 20})
+    cache.put("google:b", "google", {"jobs": "b" * 20})
+    cache.get("google:a")
+    cache.put("google:c", "google", {"jobs": "c" * 20})
+
+    assert cache.get("google:a") is not None
+    assert cache.get("google:b") is None
+    assert cache.get("google:c") is not None
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_identical_searches_share_one_call_across_users(mock_settings, cache, mock_search_query_plan, mock_location_data):
+    route = respx.get(re.compile(r"https://serpapi\.com/search.*")).mock(
+        return_value=httpx.Response(200, json={"jobs_results": [
+            {"title": "DevOps", "company_name": "CloudCo", "apply_options": [{"link": "url1"}]}
+        ]})
+    )
+    mock_settings.api_settings.use_google = True
+    mock_settings.api_settings.use_reed = False
+    first_user = JobScraperService(mock_settings.model_copy(deep=True), response_cache=cache)
+    mock_settings.api_settings.serpapi_key = "someone-elses-key"
+    second_user = JobScraperService(mock_settings.model_copy(deep=True), response_cache=cache)
+
+    first = await first_user.run_research(mock_search_query_plan.steps, mock_location_data)
+    second = await second_user.run_research(mock_search_query_plan.steps, mock_location_data)
+
+    assert route.call_count == 1
+    assert first.jobs[0].title == second.jobs[0].title == "DevOps"
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_stale_entry_is_revalidated_with_etag(mock_settings, cache, mock_search_query_plan, mock_location_data):
+    route = respx.post("https://api.theirstack.com/v1/jobs/search").mock(side_effect=[
+        httpx.Response(200, json={"data": []}, headers={"ETag": '"v1"'}),
+        httpx.Response(304),
+    ])
+    mock_settings.api_settings.theirstack_key = "key"
+    mock_settings.scraper_settings.response_cache_ttl_seconds["theirstack"] = 0
+    scraper = JobScraperService(mock_settings, response_cache=cache)
+
+    await scraper._scrape_theirstack(scraper.http, mock_search_query_plan.steps[0], mock_location_data)
+    result = await scraper._scrape_theirstack(scraper.http, mock_search_query_plan.steps[0], mock_location_data)
+
+    assert result == []
+    assert route.calls[1].request.headers["If-None-Match"] == '"v1"'
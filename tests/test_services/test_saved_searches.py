@@ -0,0 +1,26 @@
+from datetime import datetime, timezone
+
+from src.services.saved_searches import SavedSearchStore
+
+
+def test_new_search_has_no_watermark(tmp_path, mock_location_data):
+    store = SavedSearchStore(str(tmp_path / "searches.sqlite3"))
+
+    search = store.get_or_create("profile-1", "Data Engineer", mock_location_data)
+
+    assert search.last_run_at is None
+
+
+def test_watermark_round_trips_and_ignores_role_formatting(tmp_path, mock_location_data):
+    store = SavedSearchStore(str(tmp_path / "searches.sqlite3"))
+    started = datetime(2026, 1, 5, 9, 30, tzinfo=timezone.utc)
+
+    search = store.get_or_create("profile-1", "Data Engineer", mock_location_data)
+    store.mark_run(search, started)
+    again = store.get_or_create("profile-1", "  data   engineer ", mock_location_data)
+    other_role = store.get_or_create("profile-1", "Analyst", mock_location_data)
+
+    assert again.last_run_at == started
+    assert again.location == mock_location_data
+    assert other_role.last_run_at is None
+    assert [s.role for s in store.list_for_profile("profile-1")] == ["Data Engineer"]
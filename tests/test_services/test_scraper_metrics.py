@@ -0,0 +1,59 @@
+import re
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+import respx
+
+from src.services.scraper_metrics import ScraperMetricsRecorder, ScraperMetricsStore, latency_bucket
+
+
+def test_latency_buckets_are_upper_bounds():
+    assert latency_bucket(0.05) == "100"
+    assert latency_bucket(0.3) == "500"
+    assert latency_bucket(30) == "+Inf"
+
+
+def test_store_keeps_history_per_provider_and_prunes_old_runs(tmp_path):
+    store = ScraperMetricsStore(str(tmp_path / "metrics.sqlite3"), retention_days=30)
+    old = ScraperMetricsRecorder()
+    old.metrics.started_at = datetime.now(timezone.utc) - timedelta(days=45)
+    old.observe_call("reed", 0.2)
+    store.save(old.finish())
+
+    recent = ScraperMetricsRecorder()
+    recent.observe_call("reed", 0.4, httpx.Response(503, content=b"busy"))
+    store.save(recent.finish())
+
+    history = store.history("reed")
+    assert [h["run_id"] for h in history] == [recent.metrics.run_id]
+    assert history[0]["metrics"].errors == {"HTTP 503": 1}
+    assert history[0]["metrics"].bytes_downloaded == 4
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_run_reports_per_provider_metrics(scraper_service, isolated_metrics_store, mock_search_query_plan, mock_location_data):
+    respx.get(re.compile(r"https://www\.reed\.co\.uk/api/1\.0/search.*")).mock(
+        return_value=httpx.Response(200, json={"results": [
+            {"jobId": 1, "jobUrl": "https://reed/1"},
+            {"jobId": 2, "jobUrl": "https://reed/2"},
+        ]})
+    )
+    respx.get("https://www.reed.co.uk/api/1.0/jobs/1").mock(
+        return_value=httpx.Response(200, json={"jobTitle": "Role", "employerName": "Co", "locationName": "London", "jobDescription": "x"})
+    )
+    respx.get("https://www.reed.co.uk/api/1.0/jobs/2").mock(return_value=httpx.Response(404))
+    scraper_service.retry_policy.max_retries = 0
+
+    jobs, metrics = await scraper_service.run_research_with_metrics(mock_search_query_plan.steps, mock_location_data)
+
+    reed = metrics.providers["reed"]
+    assert len(jobs.jobs) == 1
+    assert reed.calls == 3
+    assert reed.detail_fetches == 2
+    assert reed.listings_returned == reed.listings_after_dedupe == 1
+    assert reed.errors == {"HTTP 404": 1}
+    assert reed.bytes_downloaded > 0
+    assert sum(reed.latency_histogram.values()) == 3
+    assert isolated_metrics_store.history("reed")[0]["run_id"] == metrics.run_id
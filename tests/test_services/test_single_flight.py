@@ -0,0 +1,100 @@
+import asyncio
+import re
+import threading
+import time
+
+import httpx
+import pytest
+import respx
+
+from src.services.job_scraper import JobScraperService
+from src.services.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"ok": True}
+
+    results = await asyncio.gather(*(flight.do("k", call) for _ in range(5)))
+
+    assert calls == 1
+    assert all(r == {"ok": True} for r in results)
+    assert flight.stats() == {"leaders": 1, "coalesced": 4, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_followers_take_over_when_leader_is_cancelled():
+    flight = SingleFlight()
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    leader = asyncio.create_task(flight.do("k", call))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("k", call))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == 2
+
+
+def test_calls_are_shared_across_event_loops():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        started.set()
+        await asyncio.to_thread(release.wait)
+        return "payload"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(asyncio.run(flight.do("k", call))))
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=lambda: results.append(asyncio.run(flight.do("k", call))))
+    follower.start()
+    while flight.stats()["coalesced"] == 0:
+        time.sleep(0.01)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert results == ["payload", "payload"]
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_concurrent_identical_searches_hit_provider_once(mock_settings, mock_search_query_plan, mock_location_data):
+    async def slow_listing(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"jobs_results": [
+            {"title": "DevOps", "company_name": "CloudCo", "apply_options": [{"link": "url1"}]}
+        ]})
+
+    route = respx.get(re.compile(r"https://serpapi\.com/search.*")).mock(side_effect=slow_listing)
+    mock_settings.api_settings.use_google = True
+    mock_settings.api_settings.use_reed = False
+    flight = SingleFlight()
+    sessions = [JobScraperService(mock_settings.model_copy(deep=True), single_flight=flight) for _ in range(3)]
+
+    results = await asyncio.gather(
+        *(s.run_research(mock_search_query_plan.steps, mock_location_data) for s in sessions)
+    )
+
+    assert route.call_count == 1
+    assert all(r.jobs[0].title == "DevOps" for r in results)
@@ -1,10 +1,17 @@
-import pytest
+import asyncio
 import json
-from unittest.mock import MagicMock, patch
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services.document_store import DocumentStore
 from src.services.storage_service import StorageService
 from src.schema import RawJobMatch, RawJobMatchList, generate_safe_id
 
+
 @pytest.fixture
 def mock_embeddings():
     """Mock embeddings that return 3072-dimension vectors."""
@@ -12,6 +19,7 @@ def mock_embeddings():
     mock.embed_query.return_value = [0.0] * 3072
     return mock
 
+
 @pytest.fixture
 def storage_service(mock_pinecone, mock_embeddings):
     """Instantiates the StorageService with a mocked Pinecone index."""
@@ -23,6 +31,7 @@ def storage_service(mock_pinecone, mock_embeddings):
         mock_get_store.return_value = mock_store
         yield service, index
 
+
 def test_save_candidate_profile_serialization(mock_pinecone, mock_candidate_profile):
     """
     SOP: Test that the REAL service logic correctly serializes Pydantic lists 
@@ -47,6 +56,7 @@ def test_save_candidate_profile_serialization(mock_pinecone, mock_candidate_prof
     assert isinstance(metadata["key_skills"], str)
     assert "Python" in metadata["key_skills"]
 
+
 def test_sync_global_library_expiration_logic(mock_pinecone, mock_raw_job):
     """
     SOP: Test that the REAL service logic correctly identifies an expired 
@@ -75,6 +85,7 @@ def test_sync_global_library_expiration_logic(mock_pinecone, mock_raw_job):
     
     assert mock_store.add_texts.called
 
+
 def test_find_raw_job_by_url_schema_conversion(mock_pinecone, mock_raw_job):
     """
     Test that the REAL service correctly converts Pinecone 
@@ -103,10 +114,11 @@ def test_find_raw_job_by_url_schema_conversion(mock_pinecone, mock_raw_job):
     assert isinstance(result, RawJobMatch)
     assert result.job_url == mock_raw_job.job_url
 
-def test_find_all_jobs_for_user_filtering(mock_pinecone):
+
+def test_find_all_jobs_for_user_filtering(mock_pinecone, mock_analysed_job):
     """
-    Test that the REAL service correctly applies the Pinecone
-    metadata filter for a specific user_id and uses the correct namespace.
+    Test that the REAL service lists only the user's id prefix, so other users'
+    analyses are never fetched and nothing falls back to a top_k query.
     """
     _, index = mock_pinecone
     mock_emb = MagicMock()
@@ -115,13 +127,163 @@ def test_find_all_jobs_for_user_filtering(mock_pinecone):
     mock_store = MagicMock()
     mock_store.get_pinecone_index.return_value = index
     service._get_store = MagicMock(return_value=mock_store)
+
+    def analysis(user_id, url):
+        job = mock_analysed_job.model_copy(update={"job_url": url})
+        return {"user_id": user_id, "document_type": "job_analysis", "analysis_json": job.model_dump_json()}
+
+    mine = service._analysis_id("profile_user_999_20260101_000000", "https://a")
+    theirs = service._analysis_id("profile_someone_else_20260101_000000", "https://b")
+    records = {mine: analysis("user_999", "https://a"), theirs: analysis("someone_else", "https://b")}
+    fetched = []
+
+    def list_paginated(namespace, limit, pagination_token=None, prefix=""):
+        ids = sorted(uid for uid in records if uid.startswith(prefix))
+        return MagicMock(vectors=[MagicMock(id=uid) for uid in ids], pagination=None)
+
+    def fetch(ids, namespace):
+        fetched.extend(ids)
+        return MagicMock(vectors={uid: MagicMock(metadata=records[uid]) for uid in ids})
+
+    index.list_paginated.side_effect = list_paginated
+    index.fetch.side_effect = fetch
     
-    index.query.return_value = {"matches": []}
-    
-    service.find_all_jobs_for_user("user_999")
-    
-    assert index.query.called
-    _, kwargs = index.query.call_args
+    jobs = service.find_all_jobs_for_user("user_999")
     
-    assert kwargs["filter"]["user_id"]["$eq"] == "user_999"
-    assert kwargs["namespace"] == service.NS_USER_DATA
\ No newline at end of file
+    assert [j.job_url for j in jobs] == ["https://a"]
+    assert fetched == [mine]
+    index.query.assert_not_called()
+    _, kwargs = index.list_paginated.call_args
+    assert kwargs["namespace"] == service.NS_USER_DATA
+    assert kwargs["prefix"] == "analysis_profile_user_999_"
+
+
+def test_find_fresh_global_jobs_skips_expired(storage_service, mock_raw_job):
+    service, index = storage_service
+    fresh_url, stale_url = mock_raw_job.job_url, "https://example.com/stale"
+
+    fresh_meta = service._prepare_job_meta(mock_raw_job)
+    stale_meta = {**fresh_meta, "last_synced_at": (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()}
+    index.fetch.return_value = MagicMock(vectors={
+        generate_safe_id(fresh_url): MagicMock(metadata=fresh_meta),
+        generate_safe_id(stale_url): MagicMock(metadata=stale_meta),
+    })
+
+    result = service.find_fresh_global_jobs([fresh_url, stale_url], ttl_days=7)
+
+    assert list(result) == [fresh_url]
+    assert result[fresh_url].title == mock_raw_job.title
+
+
+def test_store_and_index_handles_are_built_once_per_namespace(mock_embeddings, mock_pinecone_client):
+    with patch("src.services.storage_service.PineconeVectorStore") as store_cls:
+        service = StorageService(index_name="test-index", embeddings=mock_embeddings)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            stores = list(pool.map(lambda _: service._get_store(service.NS_GLOBAL_JOBS), range(32)))
+        service._get_index(service.NS_GLOBAL_JOBS)
+        service._get_index(service.NS_GLOBAL_JOBS)
+        service._get_store(service.NS_USER_DATA)
+
+    assert all(store is stores[0] for store in stores)
+    assert store_cls.call_count == 2
+    assert store_cls.return_value.get_pinecone_index.call_count == 1
+    mock_pinecone_client.Index.assert_called_once_with("test-index")
+
+
+def test_close_releases_cached_handles(mock_embeddings, mock_pinecone_client):
+    with patch("src.services.storage_service.PineconeVectorStore"):
+        service = StorageService(index_name="test-index", embeddings=mock_embeddings)
+        service._get_store(service.NS_GLOBAL_JOBS)
+        service.close()
+        service._get_store(service.NS_GLOBAL_JOBS)
+
+    mock_pinecone_client.Index.return_value.close.assert_called_once()
+    assert mock_pinecone_client.Index.call_count == 2
+
+
+def test_sync_global_library_refreshes_unchanged_jobs_without_reembedding(storage_service, mock_raw_job):
+    service, index = storage_service
+    old_date = (datetime.now(timezone.utc) - timedelta(days=10)).isoformat()
+    unchanged = {**service._prepare_job_meta(mock_raw_job), "last_synced_at": old_date}
+    edited = mock_raw_job.model_copy(update={"job_url": "https://example.com/edited", "description": "New text"})
+    edited_meta = {**service._prepare_job_meta(mock_raw_job), "last_synced_at": old_date}
+    index.fetch.return_value = MagicMock(vectors={
+        mock_raw_job.id: MagicMock(metadata=unchanged),
+        edited.id: MagicMock(metadata=edited_meta),
+    })
+
+    result = service.sync_global_library(RawJobMatchList(jobs=[mock_raw_job, edited]), ttl_days=7)
+
+    store = service._get_store.return_value
+    _, kwargs = store.add_texts.call_args
+    assert kwargs["ids"] == [edited.id]
+    index.update.assert_called_once()
+    _, update = index.update.call_args
+    assert update["id"] == mock_raw_job.id
+    assert set(update["set_metadata"]) == {"analysed_at", "last_synced_at"}
+    assert update["set_metadata"]["last_synced_at"] > old_date
+    assert len(result) == 2
+
+
+def test_pinecone_upserts_skip_payload_fields_with_a_document_store(storage_service, mock_raw_job, tmp_path):
+    service, index = storage_service
+    service.documents = DocumentStore(str(tmp_path / "documents.sqlite3"))
+    service._get_store.return_value.embeddings.embed_documents.return_value = [[0.1] * 3072]
+    index.fetch.return_value = MagicMock(vectors={})
+
+    service.sync_global_library(RawJobMatchList(jobs=[mock_raw_job]))
+
+    assert not service._get_store.return_value.add_texts.called
+    _, kwargs = index.upsert.call_args
+    metadata = kwargs["vectors"][0]["metadata"]
+    assert "description" not in metadata and "text" not in metadata
+    assert service.documents.get_many(service.NS_GLOBAL_JOBS, [mock_raw_job.id])[mock_raw_job.id]["description"]
+    service.documents.close()
+
+
+@pytest.mark.asyncio
+async def test_async_methods_run_off_the_loop_within_the_concurrency_bound(mock_embeddings, mock_candidate_profile):
+    service = StorageService(index_name="test-index", embeddings=mock_embeddings, max_concurrency=2)
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0, "threads": set()}
+
+    def slow_fetch(ids, namespace):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            state["threads"].add(threading.current_thread().name)
+        threading.Event().wait(0.05)
+        with lock:
+            state["active"] -= 1
+        return {ids[0]: MagicMock(id=ids[0], metadata=mock_candidate_profile.model_dump())}
+
+    service.backend = MagicMock(fetch=slow_fetch)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    heartbeat = asyncio.create_task(ticker())
+    profiles = await asyncio.gather(*(service.fetch_candidate_profile_async(f"p{i}") for i in range(6)))
+    heartbeat.cancel()
+    service.close()
+
+    assert all(p.full_name == mock_candidate_profile.full_name for p in profiles)
+    assert state["peak"] == 2
+    assert all(name.startswith("storage") for name in state["threads"])
+    assert ticks >= 10
+    assert StorageService.fetch_candidate_profile_async.__name__ == "fetch_candidate_profile_async"
+
+
+@pytest.mark.asyncio
+async def test_sync_global_library_works_inside_a_running_event_loop(storage_service, mock_raw_job):
+    service, index = storage_service
+    index.fetch.return_value = MagicMock(vectors={})
+
+    result = service.sync_global_library(RawJobMatchList(jobs=[mock_raw_job]))
+
+    assert [job.job_url for job in result] == [mock_raw_job.job_url]
+    assert service._get_store.return_value.add_texts.called
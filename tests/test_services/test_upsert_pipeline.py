@@ -0,0 +1,94 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.schema import LibrarySyncSettings
+from src.services.resilience import RetryPolicy
+from src.services.upsert_pipeline import AdaptiveWindow, UpsertItem, is_throttled, plan_batches, run_upserts
+
+
+def items(count, text="x" * 400):
+    return [UpsertItem(id=str(i), text=text, metadata={"job_url": f"https://jobs/{i}"}) for i in range(count)]
+
+
+class Throttled(Exception):
+    status = 429
+
+
+def test_plan_batches_respects_item_byte_and_token_caps():
+    settings = LibrarySyncSettings(max_batch_items=10, max_batch_tokens=1_000, max_batch_bytes=10**9, vector_bytes=0)
+    assert [len(b) for b in plan_batches(items(25), settings)] == [10, 10, 5]
+
+    by_tokens = plan_batches(items(25), settings.model_copy(update={"max_batch_items": 100}))
+    assert [len(b) for b in by_tokens] == [10, 10, 5]
+
+    by_bytes = plan_batches(items(5), settings.model_copy(update={"vector_bytes": 40_000, "max_batch_bytes": 100_000}))
+    assert [len(b) for b in by_bytes] == [2, 2, 1]
+
+    oversized = plan_batches(items(2, text="y" * 10_000), settings)
+    assert [len(b) for b in oversized] == [1, 1]
+
+
+def test_is_throttled_recognises_both_providers():
+    assert is_throttled(Throttled())
+    assert is_throttled(RuntimeError("429 RESOURCE_EXHAUSTED: quota exceeded"))
+    assert not is_throttled(ValueError("bad metadata"))
+
+
+@pytest.mark.asyncio
+async def test_run_upserts_backs_off_on_throttle_and_retries():
+    window = AdaptiveWindow(initial=4, maximum=8)
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0, "throttled": 0, "written": []}
+
+    def upsert(batch):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        try:
+            threading.Event().wait(0.01)
+            with lock:
+                if state["throttled"] < 2:
+                    state["throttled"] += 1
+                    raise Throttled()
+                state["written"].extend(item.id for item in batch)
+        finally:
+            with lock:
+                state["active"] -= 1
+
+    batches = [items(3)[i:i + 1] for i in range(3)] * 4
+    written = await run_upserts(batches, upsert, window, RetryPolicy(max_retries=3, base_delay=0.0))
+
+    assert written == 12
+    assert len(state["written"]) == 12
+    assert state["peak"] <= 4
+    assert window.throttles == 2
+
+
+@pytest.mark.asyncio
+async def test_run_upserts_raises_non_throttle_errors_and_cancels_the_rest():
+    window = AdaptiveWindow(initial=1, maximum=1)
+    calls = []
+
+    def upsert(batch):
+        calls.append(batch[0].id)
+        raise ValueError("metadata too large")
+
+    with pytest.raises(ValueError):
+        await run_upserts([[item] for item in items(5)], upsert, window, RetryPolicy(max_retries=3))
+    await asyncio.sleep(0.05)
+
+    assert calls == ["0"]
+    assert window.limiter._active == 0
+
+
+def test_adaptive_window_is_additive_up_and_multiplicative_down():
+    window = AdaptiveWindow(initial=2, maximum=4)
+    for _ in range(2):
+        window.on_success()
+    assert window.size == 3
+    window.on_throttle()
+    assert window.size == 1
+    window.on_throttle()
+    assert window.size == 1
@@ -0,0 +1,196 @@
+import pytest
+
+from src.services.document_store import DocumentStore
+from src.services.storage_service import StorageService
+from src.services.vector_backends import LocalVectorBackend, matches_filter
+from src.schema import RawJobMatchList, generate_safe_id
+
+VOCAB = ["python", "java", "cloud", "finance"]
+
+
+class KeywordEmbeddings:
+    """Counts vocabulary words, so cosine similarity is predictable."""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        words = text.lower().split()
+        return [float(words.count(term)) for term in VOCAB]
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = LocalVectorBackend(str(tmp_path / "vectors.sqlite3"), KeywordEmbeddings())
+    yield backend
+    backend.close()
+
+
+def test_matches_filter_supports_pinecone_operators():
+    meta = {"user_id": "u1", "analysed_at": 100, "document_type": "job_analysis"}
+
+    assert matches_filter(meta, {"user_id": {"$eq": "u1"}, "analysed_at": {"$lt": 200}})
+    assert matches_filter(meta, {"$or": [{"user_id": "u2"}, {"document_type": {"$in": ["job_analysis"]}}]})
+    assert not matches_filter(meta, {"analysed_at": {"$gte": 101}})
+    assert not matches_filter(meta, {"profile_id": {"$exists": True}})
+
+
+def test_query_ranks_by_cosine_within_filter(backend):
+    backend.upsert_texts(
+        "jobs",
+        texts=["python python cloud", "java finance", "python finance"],
+        metadatas=[{"kind": "a"}, {"kind": "a"}, {"kind": "b"}],
+        ids=["1", "2", "3"],
+    )
+
+    ranked = backend.query("jobs", vector=KeywordEmbeddings().embed_query("python"), top_k=3)
+    filtered = backend.query("jobs", vector=KeywordEmbeddings().embed_query("python"), filter={"kind": "a"}, top_k=3)
+
+    assert [r.id for r in ranked][:2] == ["1", "3"]
+    assert [r.id for r in filtered] == ["1", "2"]
+    assert ranked[0].metadata["text"] == "python python cloud"
+
+
+def test_writes_delete_list_and_stats(backend, tmp_path):
+    backend.upsert_texts("jobs", ["python", "java"], [{"age": 1}, {"age": 9}], ["1", "2"])
+    backend.upsert_texts("profiles", ["cloud"], [{}], ["p"])
+
+    backend.delete("jobs", filter={"age": {"$gt": 5}})
+
+    assert list(backend.fetch(["1", "2"], "jobs")) == ["1"]
+    assert list(backend.list_ids("jobs")) == [["1"]]
+    assert backend.stats()["namespaces"] == {"jobs": {"vector_count": 1}, "profiles": {"vector_count": 1}}
+    assert backend.stats()["dimension"] == len(VOCAB)
+
+    reopened = LocalVectorBackend(str(tmp_path / "vectors.sqlite3"), KeywordEmbeddings())
+    assert reopened.query("jobs")[0].id == "1"
+    reopened.close()
+
+
+def test_storage_service_runs_on_local_backend(backend, mock_raw_job, mock_candidate_profile):
+    service = StorageService(index_name="local", embeddings=KeywordEmbeddings(), backend=backend)
+
+    synced = service.sync_global_library(RawJobMatchList(jobs=[mock_raw_job]))
+    fresh = service.find_fresh_global_jobs([mock_raw_job.job_url])
+    profile_id = service.save_candidate_profile("user_1", mock_candidate_profile)
+
+    assert [j.job_url for j in synced] == [mock_raw_job.job_url]
+    assert fresh[mock_raw_job.job_url].title == mock_raw_job.title
+    assert service.fetch_candidate_profile(profile_id).full_name == mock_candidate_profile.full_name
+    assert service.find_all_candidate_profiles("user_1")[0]["profile_id"] == profile_id
+    assert service.get_index_metrics()["global_count"] == 1
+
+
+def test_scan_pages_past_any_top_k_cap_with_stable_cursors(backend):
+    ids = [f"{i:04d}" for i in range(250)]
+    backend.upsert_texts("jobs", ["python"] * 250, [{"even": i % 2 == 0} for i in range(250)], ids)
+
+    first = backend.scan("jobs", limit=100)
+    backend.upsert_texts("jobs", ["java"], [{"even": True}], ["0000a"])
+    second = backend.scan("jobs", limit=100, cursor=first.cursor)
+    evens = list(backend.iter_records("jobs", filter={"even": True}, page_size=40))
+
+    assert [r.id for r in first.records] == ids[:100]
+    assert second.records[0].id == "0100"
+    assert len(evens) == 126
+
+
+def test_update_metadata_merges_fields_and_keeps_the_vector(backend):
+    backend.upsert_texts("jobs", ["python developer"], [{"title": "Dev", "last_synced_at": "old"}], ["a"])
+    before = backend.query("jobs", vector=[1.0, 0.0, 0.0, 0.0], top_k=1)[0].score
+
+    backend.update_metadata("jobs", {"a": {"last_synced_at": "new"}, "missing": {"last_synced_at": "new"}})
+
+    record = backend.fetch(["a", "missing"], "jobs")
+    assert list(record) == ["a"]
+    assert record["a"].metadata["title"] == "Dev" and record["a"].metadata["last_synced_at"] == "new"
+    assert backend.query("jobs", vector=[1.0, 0.0, 0.0, 0.0], top_k=1)[0].score == before
+
+
+def test_document_store_keeps_payloads_out_of_vector_metadata(backend, tmp_path, mock_raw_job, mock_analysed_job):
+    documents = DocumentStore(str(tmp_path / "documents.sqlite3"))
+    service = StorageService(index_name="local", embeddings=KeywordEmbeddings(), backend=backend, documents=documents)
+
+    service.sync_global_library(RawJobMatchList(jobs=[mock_raw_job]))
+    service.save_job_analyses([mock_analysed_job], "user_1", "profile_user_1_20260101_000000")
+
+    stored = backend.fetch([mock_raw_job.id], service.NS_GLOBAL_JOBS)[mock_raw_job.id].metadata
+    assert not {"description", "qualifications", "text"} & set(stored)
+    assert stored["title"] == mock_raw_job.title
+    assert not any("analysis_json" in r.metadata for r in backend.iter_records(service.NS_USER_DATA))
+
+    assert service.get_all_global_jobs()[0].description == mock_raw_job.description
+    assert service.find_raw_job_by_url(mock_raw_job.job_url).benefits == mock_raw_job.benefits
+    assert service.find_all_jobs_for_user("user_1")[0].job_url == mock_analysed_job.job_url
+    _, jobs = service.get_market_data()
+    assert "Python" in jobs[0]["qualifications"] and "description" not in jobs[0]
+    documents.close()
+
+
+def test_records_missing_their_payload_are_cache_misses(backend, tmp_path, mock_raw_job, mock_analysed_job):
+    writer = StorageService(
+        index_name="local", embeddings=KeywordEmbeddings(), backend=backend,
+        documents=DocumentStore(str(tmp_path / "node_a.sqlite3")),
+    )
+    reader = StorageService(
+        index_name="local", embeddings=KeywordEmbeddings(), backend=backend,
+        documents=DocumentStore(str(tmp_path / "node_b.sqlite3")),
+    )
+    writer.sync_global_library(RawJobMatchList(jobs=[mock_raw_job]))
+    writer.save_job_analyses([mock_analysed_job], "user_1", "profile_user_1_20260101_000000")
+
+    assert reader.find_fresh_global_jobs([mock_raw_job.job_url]) == {}
+    hits, misses = reader.check_analysis_cache([mock_raw_job], "profile_user_1_20260101_000000")
+    assert hits == [] and misses == [mock_raw_job]
+
+    reader.sync_global_library(RawJobMatchList(jobs=[mock_raw_job]))
+    restored = reader.find_fresh_global_jobs([mock_raw_job.job_url])
+    assert restored[mock_raw_job.job_url].description == mock_raw_job.description
+    writer.documents.close()
+    reader.documents.close()
+
+
+def test_scan_with_prefix_only_reads_matching_ids(backend):
+    ids = ["profile_u1_1", "profile_u1_2", "profile_u12_1", "profile_u2_1", "zzz"]
+    backend.upsert_texts("users", ["python"] * len(ids), [{} for _ in ids], ids)
+
+    page = backend.scan("users", limit=1, prefix="profile_u1_")
+
+    assert [r.id for r in page.records] == ["profile_u1_1"]
+    assert [r.id for r in backend.iter_records("users", prefix="profile_u1_", page_size=1)] == [
+        "profile_u1_1", "profile_u1_2",
+    ]
+
+
+def test_rewrite_replaces_a_fresh_library_record(backend, mock_raw_job):
+    service = StorageService(index_name="local", embeddings=KeywordEmbeddings(), backend=backend)
+    service.sync_global_library(RawJobMatchList(jobs=[mock_raw_job]))
+    merged = mock_raw_job.model_copy(update={"alternate_urls": ["https://example.com/mirror"]})
+
+    service.sync_global_library(RawJobMatchList(jobs=[merged]))
+    assert service.find_fresh_global_jobs([mock_raw_job.job_url])[mock_raw_job.job_url].alternate_urls == []
+
+    service.sync_global_library(RawJobMatchList(jobs=[merged]), rewrite=True)
+    stored = service.find_fresh_global_jobs([mock_raw_job.job_url])[mock_raw_job.job_url]
+    assert stored.alternate_urls == ["https://example.com/mirror"]
+
+
+def test_legacy_analysis_ids_are_rekeyed_to_the_profile_prefix(backend, tmp_path, mock_analysed_job):
+    service = StorageService(
+        index_name="local", embeddings=KeywordEmbeddings(), backend=backend,
+        documents=DocumentStore(str(tmp_path / "documents.sqlite3")),
+    )
+    profile_id = "profile_user_1_20260101_000000"
+    legacy_id = generate_safe_id(f"{profile_id}_{mock_analysed_job.job_url}")
+    backend.upsert_texts(service.NS_USER_DATA, ["python"], [{
+        "document_type": "job_analysis", "user_id": "user_1", "profile_id": profile_id,
+        "job_url": mock_analysed_job.job_url, "analysis_json": mock_analysed_job.model_dump_json(),
+    }], [legacy_id])
+
+    assert service.find_all_jobs_for_user("user_1") == []
+    assert service.migrate_legacy_analysis_ids() == "Re-keyed 1 analyses."
+
+    assert [j.job_url for j in service.find_all_jobs_for_user("user_1")] == [mock_analysed_job.job_url]
+    assert backend.fetch([legacy_id], service.NS_USER_DATA) == {}
+    assert service.migrate_legacy_analysis_ids() == "No legacy analyses found."
+    service.documents.close()
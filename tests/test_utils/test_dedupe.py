@@ -0,0 +1,65 @@
+from src.schema import RawJobMatch
+from src.utils.dedupe import NearDuplicateIndex, collapse_near_duplicates
+
+DESCRIPTION = (
+    "We are hiring a data engineer to build batch and streaming pipelines on AWS. "
+    "You will own our Airflow DAGs, model data in dbt and Snowflake, and mentor two "
+    "junior engineers. Hybrid working from our London office three days a week."
+)
+
+
+def make_job(url, title="Data Engineer", company="Acme Ltd", description=DESCRIPTION, **kwargs):
+    return RawJobMatch(
+        title=title, company_name=company, location="London", job_url=url,
+        description=description, **kwargs,
+    )
+
+
+def test_collapses_same_posting_from_different_providers():
+    google = make_job("https://google.com/jobs/1")
+    reed = make_job(
+        "https://reed.co.uk/jobs/99", company="ACME LTD",
+        description=f"<p>{DESCRIPTION}</p>", salary_min=60000,
+    )
+
+    result = collapse_near_duplicates([google, reed])
+
+    assert len(result) == 1
+    assert result[0].job_url == "https://google.com/jobs/1"
+    assert result[0].alternate_urls == ["https://reed.co.uk/jobs/99"]
+    assert result[0].salary_min == 60000
+
+
+def test_keeps_distinct_roles_at_the_same_company():
+    engineer = make_job("https://a.com/1")
+    analyst = make_job(
+        "https://a.com/2", title="Marketing Analyst",
+        description="Own campaign reporting in Looker and run A/B tests for the growth team.",
+    )
+
+    assert len(collapse_near_duplicates([engineer, analyst])) == 2
+
+
+def test_index_reports_whether_a_job_is_new():
+    index = NearDuplicateIndex()
+
+    assert index.add(make_job("https://a.com/1"))
+    assert not index.add(make_job("https://a.com/1"))
+    assert not index.add(make_job("https://b.com/1"))
+    assert index.canonical[0].alternate_urls == ["https://b.com/1"]
+
+
+def test_index_tracks_merges_into_released_jobs():
+    index = NearDuplicateIndex()
+    index.add(make_job("https://a.com/1"))
+    index.add(make_job("https://b.com/1"))
+
+    assert index.take_revised() == []
+
+    index.release()
+    index.add(make_job("https://c.com/1"))
+
+    revised = index.take_revised()
+    assert [job.job_url for job in revised] == ["https://a.com/1"]
+    assert revised[0].alternate_urls == ["https://b.com/1", "https://c.com/1"]
+    assert index.take_revised() == []
@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta, timezone
+
+from src.utils.query_compiler import JobQueryCompiler
+
+
+def test_theirstack_query_uses_full_window_without_watermark(mock_search_query_plan, mock_location_data):
+    query = JobQueryCompiler.generate_theirstack_query(mock_search_query_plan.steps[0], mock_location_data, 10)
+
+    assert query["posted_at_max_age_days"] == 14
+    assert "posted_at_gte" not in query
+
+
+def test_theirstack_query_asks_only_for_postings_since_watermark(mock_search_query_plan, mock_location_data):
+    since = datetime.now(timezone.utc) - timedelta(days=2)
+
+    query = JobQueryCompiler.generate_theirstack_query(
+        mock_search_query_plan.steps[0], mock_location_data, 10, since=since
+    )
+
+    assert query["posted_at_gte"] == since.date().isoformat()
+    assert "posted_at_max_age_days" not in query
+
+
+def test_old_watermarks_fall_back_to_full_window(mock_search_query_plan, mock_location_data):
+    since = datetime.now(timezone.utc) - timedelta(days=40)
+
+    query = JobQueryCompiler.generate_theirstack_query(
+        mock_search_query_plan.steps[0], mock_location_data, 10, since=since
+    )
+
+    assert query["posted_at_max_age_days"] == 14
+    assert JobQueryCompiler.google_date_chip(since) is None
+    assert JobQueryCompiler.linkedin_feed(since) == "active-jb-7d"
+
+
+def test_recency_buckets_cover_the_watermark():
+    now = datetime.now(timezone.utc)
+
+    assert JobQueryCompiler.google_date_chip(None) is None
+    assert JobQueryCompiler.google_date_chip(now - timedelta(hours=5)) == "date_posted:today"
+    assert JobQueryCompiler.google_date_chip(now - timedelta(days=5)) == "date_posted:week"
+    assert JobQueryCompiler.linkedin_feed(now - timedelta(minutes=20)) == "active-jb-1h"
+    assert JobQueryCompiler.linkedin_feed(now - timedelta(hours=20)) == "active-jb-24h"